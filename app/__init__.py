@@ -2,13 +2,17 @@ import os
 from flask import Flask, redirect, url_for, jsonify
 from config import Config
 from app.extensions import db, login, migrate, csrf
-from app.scheduler import init_scheduler
 from app.cli import init_cli
+from app.utils.log import configure_logging
 from app.services.game_service import GameService
+from app.services.espn_api import ESPNApiService
 
 def create_app(config_class=Config):
     app = Flask(__name__)
     app.config.from_object(config_class)
+    configure_logging(app)
+    ESPNApiService.init_app(app)
+    GameService.init_app(app)
     
     # Initialize Flask extensions
     db.init_app(app)
@@ -16,8 +20,11 @@ def create_app(config_class=Config):
     migrate.init_app(app, db)
     csrf.init_app(app)
     
-    # Initialize scheduler
-    init_scheduler(app)
+    # Game updates normally run in their own process (python -m app.updater);
+    # web workers only read the cache
+    if app.config['IN_PROCESS_UPDATER']:
+        from app.updater import start_in_process
+        start_in_process(app)
     
     # Initialize CLI commands
     init_cli(app)
@@ -35,6 +42,12 @@ def create_app(config_class=Config):
     from app.picks import bp as picks_bp
     app.register_blueprint(picks_bp, url_prefix='/picks')
 
+    @app.before_request
+    def apply_log_settings():
+        """Pick up log levels changed from /admin/log-levels in another process"""
+        from app.services.log_settings import LogSettings
+        LogSettings.apply()
+
     @app.context_processor
     def inject_current_week():
         """Inject current week into all templates."""
@@ -73,10 +86,6 @@ def create_app(config_class=Config):
         from app.models import User
         return User.query.get(int(id))
 
-    # Start background tasks
-    from app.tasks.game_updates import init_game_updates
-    init_game_updates(app)
-    
     return app
 
 from app import models
@@ -3,9 +3,18 @@ from app.admin import bp
 from flask_login import login_required, current_user
 from app.decorators import admin_required
 from app.services.game_service import GameService
+from app.services.render_cache import RenderCache
+from app.services.consensus import Consensus
+from app.services.streaks import Streaks
+from app.services.user_stats import UserStats
+from app.services.http_session import HttpSession
+from app.services.log_settings import LogSettings
+from app.services.ops_stats import OpsStats
+from app.scheduler import PollPlanner
+from app.services.espn_api import ESPNApiService
+from app.utils import log as app_log
 from app.models.user import User
 from app.models.pick import Pick
-from app.models.game import GameCache
 from app import db
 from werkzeug.security import check_password_hash, generate_password_hash
 import os
@@ -13,7 +22,6 @@ import shutil
 from datetime import datetime
 import logging
 from functools import wraps
-import json
 
 logger = logging.getLogger(__name__)
 
@@ -117,15 +125,14 @@ def restore_db():
         # Reconnect and ensure schema is up to date
         with current_app.app_context():
             db.create_all()
-            try:
-                # Force reload of game cache to ensure proper datetime handling
-                for game in GameCache.query.all():
-                    if game.data and isinstance(game.data, str):
-                        game.data = json.loads(game.data)
-                db.session.commit()
-            except Exception as e:
-                logger.error(f"Error updating game cache: {str(e)}")
-                # Continue even if update fails
+            # Payloads are keyed by row version, but ids can repeat across databases
+            GameService.payload_cache.clear()
+            # The restored file may predate the stats tables or have been edited by hand
+            UserStats.rebuild()
+            Streaks.rebuild()
+            db.session.commit()
+            Consensus.rebuild(missing_only=False)
+            RenderCache.clear()
 
         return jsonify({'message': 'Database restored successfully'})
 
@@ -166,14 +173,18 @@ def refresh_games():
     try:
         logger.info("Starting game refresh")
         games = GameService.update_week_games(force=True)
+        stats = GameService.last_update_stats
         message = f'Successfully refreshed {len(games)} games from ESPN API!'
+        if stats:
+            message += f" ({stats['updated'] + stats['created']} changed, {stats['skipped']} unchanged)"
         logger.info(message)
         
         if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
             response = jsonify({
                 'success': True,
                 'message': message,
-                'games': len(games)
+                'games': len(games),
+                'stats': stats
             })
             response.headers['Content-Type'] = 'application/json'
             return response
@@ -228,3 +239,73 @@ def update_picks():
             return response
         flash(error_msg, 'error')
         return redirect(url_for('admin.index'))
+
+@bp.route('/http-stats')
+@login_required
+@admin_required
+def http_stats():
+    """
+    Connection pool, hedging and circuit breaker state for the ESPN client:
+    as last published by the updater, and in this process.
+    """
+    stats = HttpSession.stats()
+    stats['circuit'] = ESPNApiService.breaker.snapshot()
+    return jsonify({'updater': OpsStats.read('updater', 'http'), 'this_process': stats})
+
+@bp.route('/ingest-stats')
+@login_required
+@admin_required
+def ingest_stats():
+    """
+    Game cache update counts and SQLite write-lock hold times: over the
+    stored polls, as last published by the updater, and in this process.
+    """
+    return jsonify({
+        'polls': PollPlanner.write_lock_stats(),
+        'updater': OpsStats.read('updater', 'ingest'),
+        'this_process': GameService.ingest_stats()
+    })
+
+@bp.route('/render-cache')
+@login_required
+@admin_required
+def render_cache_stats():
+    """Size and data version of the shared rendered-page cache."""
+    return jsonify(RenderCache.stats())
+
+@bp.route('/poll-schedule')
+@login_required
+@admin_required
+def poll_schedule():
+    """Next planned game poll and planned vs actual times of recent polls (stored by the updater)."""
+    return jsonify(PollPlanner.snapshot())
+
+@bp.route('/log-levels', methods=['GET', 'POST'])
+@login_required
+@admin_required
+def log_levels():
+    """
+    Show or change log levels per subsystem.
+
+    POST a JSON object of {subsystem: level}, optionally with
+    game_sample_rate (0-1) for the per-game debug lines. Changes apply
+    here at once and in every other process (web workers, the updater)
+    within LOG_SETTINGS_TTL seconds (see LogSettings).
+    """
+    if request.method == 'POST':
+        data = request.get_json() or {}
+        try:
+            sample_rate = data.pop('game_sample_rate', None)
+            applied = LogSettings.save(data, sample_rate)
+        except (TypeError, ValueError) as e:
+            return jsonify({'error': str(e)}), 400
+        for subsystem, level in applied.items():
+            logger.info(f"Log level for {subsystem} set to {level} by {current_user.username}")
+        if sample_rate is not None:
+            logger.info(f"Game sample rate set to {app_log.game_sample_rate()} by {current_user.username}")
+
+    return jsonify({
+        'levels': app_log.levels(),
+        'subsystems': app_log.SUBSYSTEMS,
+        'game_sample_rate': app_log.game_sample_rate()
+    })
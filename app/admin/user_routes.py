@@ -5,7 +5,8 @@ from app.admin.forms import UserForm
 from app.models.user import User
 from app.extensions import db
 from werkzeug.utils import secure_filename
-from app.utils.espn_api import get_current_week
+from app.services.render_cache import RenderCache
+from app.services.week_resolver import WeekResolver
 import os
 from PIL import Image
 
@@ -16,7 +17,7 @@ def users():
         flash('You must be an admin to view this page.', 'danger')
         return redirect(url_for('admin.index'))
     users = User.query.filter(User.is_admin == False).all()
-    current_week = request.args.get('week', get_current_week(), type=int)
+    current_week = request.args.get('week', WeekResolver.current()['week'], type=int)
     return render_template('admin/users.html', users=users, current_week=current_week)
 
 @bp.route('/user/new', methods=['GET', 'POST'])
@@ -46,6 +47,7 @@ def new_user():
             user.avatar_path = f'/static/avatars/{filename}'
         
         db.session.add(user)
+        RenderCache.invalidate()
         db.session.commit()
         flash(f'User {user.username} has been created!', 'success')
         return redirect(url_for('admin.users'))
@@ -89,6 +91,7 @@ def edit_user(user_id):
             
             user.avatar_path = f'/static/avatars/{filename}'
         
+        RenderCache.invalidate()
         db.session.commit()
         flash(f'User {user.username} has been updated!', 'success')
         return redirect(url_for('admin.users'))
@@ -114,6 +117,7 @@ def delete_user(user_id):
             os.remove(avatar_path)
     
     db.session.delete(user)
+    RenderCache.invalidate()
     db.session.commit()
     flash(f'User {user.username} has been deleted!', 'success')
     return redirect(url_for('admin.users'))
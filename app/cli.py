@@ -1,10 +1,19 @@
 from datetime import datetime, timedelta
+from urllib.parse import parse_qsl
 from app.extensions import db
 from app.models.game import GameCache
 import json
+import time
 import click
+from flask import current_app
 from flask.cli import with_appcontext
 from app.services.game_service import GameService
+from app.services.week_resolver import WeekResolver
+from app.services.espn_api import ESPNApiService, loads as espn_loads
+from app.services.scoreboard_archive import ScoreboardArchive
+from app.services.consensus import Consensus
+from app.services.streaks import Streaks
+from app.services.user_stats import UserStats
 
 @click.command('update-games')
 @click.option('--week', type=int, help='Week number to update. If not specified, updates current week.')
@@ -14,6 +23,177 @@ def update_games_command(week, force):
     """Update NFL game data from ESPN"""
     games = GameService.update_week_games(week, force)
     click.echo(f"Updated {len(games)} games for week {week or 'current'}")
+    stats = GameService.last_update_stats
+    if stats:
+        click.echo(f"{stats['created']} created, {stats['updated']} changed, {stats['skipped']} unchanged"
+                   + (f", write lock held {stats['write_lock_ms']}ms" if stats.get('write_lock_ms') is not None else ""))
+
+@click.command('refresh-calendar')
+@with_appcontext
+def refresh_calendar_command():
+    """Fetch and store the NFL season calendar used to resolve the current week"""
+    stored = WeekResolver.refresh_calendar()
+    click.echo(f"Stored {stored} calendar weeks")
+    click.echo(f"Current week: {WeekResolver.current()}")
+
+@click.command('archive-summary')
+@with_appcontext
+def archive_summary_command():
+    """Show what is stored in the scoreboard archive"""
+    rows = ScoreboardArchive.summary()
+    if not rows:
+        click.echo("Scoreboard archive is empty (enable SCOREBOARD_CAPTURE to record responses)")
+    for row in rows:
+        click.echo(f"{row['params_key']}: {row['captures']} captures, {row['first']} - {row['last']}, "
+                   f"{row['compressed_bytes'] / 1024:.1f} KiB")
+
+def _week_query(params_key):
+    """Get (week, season_type, year) from an archived scoreboard key, or None"""
+    params = dict(parse_qsl(params_key))
+    if 'week' not in params:
+        return None
+    return int(params['week']), int(params.get('seasontype', 2)), int(params.get('dates', datetime.now().year))
+
+@click.command('archive-rebuild-cache')
+@with_appcontext
+def archive_rebuild_cache_command():
+    """Rebuild GameCache from the latest archived scoreboard of every week (no network)"""
+    latest = {}
+    for capture in ScoreboardArchive.iter_captures():
+        if _week_query(capture['params_key']):
+            latest[capture['params_key']] = capture
+
+    total = 0
+    for params_key, capture in sorted(latest.items()):
+        games = ESPNApiService.parse_events(espn_loads(capture['body']))
+        GameService.update_game_cache(games)
+        total += len(games)
+        click.echo(f"{params_key}: restored {len(games)} games")
+    click.echo(f"Rebuilt {total} cached games from {len(latest)} archived weeks")
+
+@click.command('archive-bench')
+@click.option('--iterations', type=int, default=3, help='Parse passes over the archive.')
+@click.option('--ingest', is_flag=True, help='Also replay every capture through update_week_games (writes to the DB).')
+@click.option('--grade', is_flag=True, help='Also time a full regrade of every final game (writes to the DB).')
+@with_appcontext
+def archive_bench_command(iterations, ingest, grade):
+    """Benchmark parsing, ingest and grading against archived game-day traffic"""
+    captures = list(ScoreboardArchive.iter_captures())
+    if not captures:
+        click.echo("Scoreboard archive is empty")
+        return
+
+    # Parse: the reference parser (stdlib json + parse_game_data) against
+    # the fast path (loads + parse_events); both must give the same games
+    def parse_reference(body):
+        games = (ESPNApiService.parse_game_data(event) for event in json.loads(body).get('events', []))
+        return [game for game in games if game]
+
+    def parse_fast(body):
+        return ESPNApiService.parse_events(espn_loads(body))
+
+    mismatches = 0
+    for capture in captures:
+        if parse_reference(capture['body']) != parse_fast(capture['body']):
+            mismatches += 1
+            click.echo(f"parse mismatch: {capture['params_key']} at {capture['fetched_at']}")
+
+    timings = {}
+    for name, parse in (('reference', parse_reference), ('fast', parse_fast)):
+        events = 0
+        start = time.perf_counter()
+        for _ in range(iterations):
+            for capture in captures:
+                events += len(parse(capture['body']))
+        timings[name] = time.perf_counter() - start
+        click.echo(f"parse ({name}): {len(captures) * iterations} payloads, {events} events in "
+                   f"{timings[name]:.3f}s ({timings[name] / max(events, 1) * 1e6:.1f} us/event)")
+    click.echo(f"parse: fast path {timings['reference'] / max(timings['fast'], 1e-9):.1f}x, "
+               f"{mismatches} mismatched payloads")
+
+    if ingest:
+        # Ingest: replay captures in order through the real update path
+        weeks = [q for q in (_week_query(c['params_key']) for c in captures) if q]
+        current_app.config['SCOREBOARD_REPLAY'] = True
+        current_app.config['SCOREBOARD_REPLAY_SPEED'] = 0
+        ScoreboardArchive.reset_replay()
+        try:
+            start = time.perf_counter()
+            for week, season_type, year in weeks:
+                GameService.update_week_games(week=week, force=True, season_type=season_type, year=year)
+            elapsed = time.perf_counter() - start
+        finally:
+            current_app.config['SCOREBOARD_REPLAY'] = False
+            ScoreboardArchive.reset_replay()
+        click.echo(f"ingest: {len(weeks)} polls in {elapsed:.3f}s ({elapsed / max(len(weeks), 1) * 1000:.1f} ms/poll)")
+        lock = GameService.ingest_stats()
+        click.echo(f"ingest: write lock p50 {lock['write_lock_ms_p50']}ms, p95 {lock['write_lock_ms_p95']}ms, "
+                   f"max {lock['write_lock_ms_max']}ms")
+
+    if grade:
+        # Grading: full regrade of every final game
+        start = time.perf_counter()
+        updated = GameService.regrade_all_picks()
+        elapsed = time.perf_counter() - start
+        click.echo(f"grading: {updated} picks changed in {elapsed:.3f}s")
+
+@click.command('regrade-picks')
+@click.option('--batch-size', type=int, default=100, help='Games graded and committed per batch.')
+@with_appcontext
+def regrade_picks_command(batch_size):
+    """Regrade picks for every final game, ignoring what has already been graded"""
+    def progress(done, total, changed):
+        click.echo(f"{done}/{total} games, {changed} picks changed")
+
+    start = time.perf_counter()
+    changed = GameService.regrade_all_picks(batch_size=batch_size, progress=progress)
+    click.echo(f"Regraded all games: {changed} picks changed in {time.perf_counter() - start:.1f}s")
+
+@click.command('rebuild-user-stats')
+@with_appcontext
+def rebuild_user_stats_command():
+    """Recompute the user_week_stats table from picks and MNF predictions"""
+    rows = UserStats.rebuild()
+    db.session.commit()
+    click.echo(f"Rebuilt {rows} user week stats rows")
+
+@click.command('rebuild-consensus')
+@click.option('--all', 'rebuild_all', is_flag=True, help='Recount every game, including frozen ones (default: only games without a row).')
+@with_appcontext
+def rebuild_consensus_command(rebuild_all):
+    """Build per-game pick consensus rows, freezing games that have kicked off"""
+    rows = Consensus.rebuild(missing_only=not rebuild_all)
+    click.echo(f"Wrote {rows} game consensus rows")
+
+@click.command('rebuild-streaks')
+@with_appcontext
+def rebuild_streaks_command():
+    """Replay every user's graded picks in kickoff order into user_streak"""
+    users = Streaks.rebuild()
+    db.session.commit()
+    click.echo(f"Rebuilt streaks for {users} users")
+
+def _db_size():
+    """Size of the app database in bytes"""
+    page_count = db.session.execute(db.text('PRAGMA page_count')).scalar()
+    page_size = db.session.execute(db.text('PRAGMA page_size')).scalar()
+    return page_count * page_size
+
+@click.command('prune-game-cache')
+@click.option('--no-vacuum', is_flag=True, help='Skip VACUUM (the file keeps its size until the next one).')
+@with_appcontext
+def prune_game_cache_command(no_vacuum):
+    """Drop stored payloads of fully final weeks, repack legacy ones, and report the DB size"""
+    before = _db_size()
+    counts = GameService.prune_game_payloads()
+    if not no_vacuum:
+        db.session.remove()
+        with db.engine.connect().execution_options(isolation_level='AUTOCOMMIT') as conn:
+            conn.exec_driver_sql('VACUUM')
+    after = _db_size()
+    click.echo(f"Stripped {counts['stripped']} payloads in {counts['final_weeks']} final weeks, "
+               f"repacked {counts['repacked']}")
+    click.echo(f"Database size: {before / 1024:.1f} KiB -> {after / 1024:.1f} KiB")
 
 @click.command('init-sample-games')
 @with_appcontext
@@ -127,5 +307,14 @@ def ensure_admin_command():
 def init_cli(app):
     """Initialize CLI commands."""
     app.cli.add_command(update_games_command)
+    app.cli.add_command(refresh_calendar_command)
+    app.cli.add_command(archive_summary_command)
+    app.cli.add_command(archive_rebuild_cache_command)
+    app.cli.add_command(archive_bench_command)
+    app.cli.add_command(regrade_picks_command)
+    app.cli.add_command(rebuild_user_stats_command)
+    app.cli.add_command(rebuild_consensus_command)
+    app.cli.add_command(rebuild_streaks_command)
+    app.cli.add_command(prune_game_cache_command)
     app.cli.add_command(init_sample_games)
     app.cli.add_command(ensure_admin_command)
@@ -1,4 +1,7 @@
 """NFL team data including abbreviations and logo URLs"""
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Optional
 
 NFL_TEAMS = {
     'ARI': {
@@ -130,3 +133,77 @@ NFL_TEAMS = {
         'logo': '/static/img/teams/was.png'
     }
 }
+
+# Other names ESPN and older data use for a team
+ALTERNATE_NAMES = {
+    'WAS': ('WSH', 'WASHINGTON FOOTBALL TEAM'),
+    'JAX': ('JAC',),
+    'LAR': ('LA',),
+}
+
+# Short city forms used in names like 'NY Giants' and 'LA Rams'
+CITY_SHORT_FORMS = {
+    'LOS ANGELES': 'LA',
+    'NEW YORK': 'NY',
+}
+
+
+def _team_alias_candidates():
+    """Every uppercase alias of every team (abbreviation, full name, nickname, city, variants)"""
+    for abbrev, team in NFL_TEAMS.items():
+        name = team['name'].upper()
+        city, _, nickname = name.rpartition(' ')
+        aliases = {abbrev, name, nickname, city, *ALTERNATE_NAMES.get(abbrev, ())}
+        if city in CITY_SHORT_FORMS:
+            aliases.add(f"{CITY_SHORT_FORMS[city]} {nickname}")
+        for alias in aliases:
+            yield alias, abbrev
+
+
+def _build_alias_index():
+    """Uppercase alias -> team abbreviation, keeping only aliases that name exactly one team"""
+    teams_by_alias = {}
+    for alias, abbrev in _team_alias_candidates():
+        teams_by_alias.setdefault(alias, set()).add(abbrev)
+    # Shared cities ('NEW YORK', 'LOS ANGELES') don't identify a team
+    return MappingProxyType({
+        alias: abbrevs.pop() for alias, abbrevs in teams_by_alias.items() if len(abbrevs) == 1
+    })
+
+
+# Built once at import; read-only
+ALIAS_INDEX = _build_alias_index()
+
+# Team abbreviation -> every alias that resolves to it
+TEAM_ALIASES = MappingProxyType({
+    abbrev: frozenset(alias for alias, team in ALIAS_INDEX.items() if team == abbrev)
+    for abbrev in NFL_TEAMS
+})
+
+
+@lru_cache(maxsize=1024)
+def resolve_team(name: Optional[str]) -> Optional[str]:
+    """
+    Canonical abbreviation ('PHI') for any team name, nickname, city or
+    abbreviation ('Philadelphia Eagles', 'eagles', 'PHI'). Returns None if
+    the name is unknown or ambiguous.
+    """
+    if not name:
+        return None
+    return ALIAS_INDEX.get(str(name).strip().upper())
+
+
+def canonical_abbrev(abbrev: Optional[str]) -> Optional[str]:
+    """Canonical form of a team abbreviation ('WSH' -> 'WAS'); unknown ones are just uppercased"""
+    if not abbrev:
+        return abbrev
+    return resolve_team(abbrev) or abbrev.upper()
+
+
+def same_team(team1: Optional[str], team2: Optional[str]) -> bool:
+    """Check if two team names or abbreviations refer to the same team"""
+    resolved1, resolved2 = resolve_team(team1), resolve_team(team2)
+    if resolved1 or resolved2:
+        return resolved1 == resolved2
+    # Neither is a known NFL team: only an exact (case-insensitive) match counts
+    return bool(team1 and team2) and team1.strip().upper() == team2.strip().upper()
@@ -3,21 +3,41 @@ from app.main import bp
 from app.models.user import User
 from app.models.pick import Pick, MNFPrediction
 from app.models.game import GameCache
-from app.utils.espn_api import get_current_week, get_week_games, get_mnf_games
+from app.utils.espn_api import get_week_games, get_mnf_games
 from collections import defaultdict, Counter
 from flask_login import login_required, current_user
 from datetime import datetime
 from app import db
-from functools import wraps
-from app.data.nfl_teams import NFL_TEAMS
+from functools import wraps, lru_cache
+from app.data.nfl_teams import NFL_TEAMS, resolve_team
 from app.services.espn_api import ESPNApiService
+from app.services.game_records import GameRecords
+from app.services.consensus import Consensus
 from app.services.game_service import GameService
+from app.services.render_cache import RenderCache, cached_page
+from app.services.league_stats import LeagueStats
+from app.services.mnf_scoring import MNFScoring
+from app.services.pick_grader import PickGrader
+from app.services.streaks import Streaks
+from app.services.user_stats import UserStats
+from app.services.week_resolver import WeekResolver
+from app.utils.log import game_debug
+from app.utils.query_budget import query_budget
 import os
 import json
+import logging
 from dateutil import tz
 
-# Debug: Print NFL_TEAMS at module level
-print("NFL_TEAMS dictionary loaded:", sorted(NFL_TEAMS.keys()))
+logger = logging.getLogger(__name__)
+
+@lru_cache(maxsize=None)
+def team_logo_exists(root_path, team_abbrev):
+    """Check a team logo file once per process instead of on every render"""
+    logo_file = os.path.join(root_path, 'static', 'img', 'teams', f"{team_abbrev}.png")
+    if os.path.exists(logo_file):
+        return True
+    logger.error(f"Logo file does not exist: {logo_file}")
+    return False
 
 def admin_required(f):
     @wraps(f)
@@ -28,46 +48,9 @@ def admin_required(f):
     return decorated_function
 
 def get_team_abbrev(team_name):
-    """Convert full team name to abbreviation"""
-    if not team_name:
-        return None
-        
-    team_name = team_name.upper()
-    abbrev_map = {
-        'ARIZONA': 'ari', 'CARDINALS': 'ari', 'ARI': 'ari',
-        'ATLANTA': 'atl', 'FALCONS': 'atl', 'ATL': 'atl',
-        'BALTIMORE': 'bal', 'RAVENS': 'bal', 'BAL': 'bal',
-        'BUFFALO': 'buf', 'BILLS': 'buf', 'BUF': 'buf',
-        'CAROLINA': 'car', 'PANTHERS': 'car', 'CAR': 'car',
-        'CHICAGO': 'chi', 'BEARS': 'chi', 'CHI': 'chi',
-        'CINCINNATI': 'cin', 'BENGALS': 'cin', 'CIN': 'cin',
-        'CLEVELAND': 'cle', 'BROWNS': 'cle', 'CLE': 'cle',
-        'DALLAS': 'dal', 'COWBOYS': 'dal', 'DAL': 'dal',
-        'DENVER': 'den', 'BRONCOS': 'den', 'DEN': 'den',
-        'DETROIT': 'det', 'LIONS': 'det', 'DET': 'det',
-        'GREEN BAY': 'gb', 'PACKERS': 'gb', 'GB': 'gb',
-        'HOUSTON': 'hou', 'TEXANS': 'hou', 'HOU': 'hou',
-        'INDIANAPOLIS': 'ind', 'COLTS': 'ind', 'IND': 'ind',
-        'JACKSONVILLE': 'jax', 'JAGUARS': 'jax', 'JAX': 'jax', 'JAC': 'jax',
-        'KANSAS CITY': 'kc', 'CHIEFS': 'kc', 'KC': 'kc',
-        'LA CHARGERS': 'lac', 'LOS ANGELES CHARGERS': 'lac', 'LAC': 'lac',
-        'LA RAMS': 'lar', 'LOS ANGELES RAMS': 'lar', 'LAR': 'lar',
-        'LAS VEGAS': 'lv', 'RAIDERS': 'lv', 'LV': 'lv',
-        'MIAMI': 'mia', 'DOLPHINS': 'mia', 'MIA': 'mia',
-        'MINNESOTA': 'min', 'VIKINGS': 'min', 'MIN': 'min',
-        'NEW ENGLAND': 'ne', 'PATRIOTS': 'ne', 'NE': 'ne',
-        'NEW ORLEANS': 'no', 'SAINTS': 'no', 'NO': 'no',
-        'NY GIANTS': 'nyg', 'NEW YORK GIANTS': 'nyg', 'NYG': 'nyg',
-        'NY JETS': 'nyj', 'NEW YORK JETS': 'nyj', 'NYJ': 'nyj',
-        'PHILADELPHIA': 'phi', 'EAGLES': 'phi', 'PHI': 'phi',
-        'PITTSBURGH': 'pit', 'STEELERS': 'pit', 'PIT': 'pit',
-        'SEATTLE': 'sea', 'SEAHAWKS': 'sea', 'SEA': 'sea',
-        'SAN FRANCISCO': 'sf', '49ERS': 'sf', 'SF': 'sf',
-        'TAMPA BAY': 'tb', 'BUCCANEERS': 'tb', 'TB': 'tb',
-        'TENNESSEE': 'ten', 'TITANS': 'ten', 'TEN': 'ten',
-        'WASHINGTON': 'was', 'COMMANDERS': 'was', 'WAS': 'was', 'WSH': 'was'
-    }
-    return abbrev_map.get(team_name)
+    """Convert a team name or abbreviation to the lowercase abbreviation used for logos"""
+    team = resolve_team(team_name)
+    return team.lower() if team else None
 
 @bp.context_processor
 def inject_year():
@@ -76,81 +59,69 @@ def inject_year():
 @bp.route('/')
 @bp.route('/standings', defaults={'week': None})
 @bp.route('/standings/<int:week>')
+@cached_page
+@query_budget(25)
 def standings(week=None):
-    current_week = get_current_week()
+    current_week = WeekResolver.current()['week']
     selected_week = week if week is not None else current_week
 
     # Get all users except admin
     users = User.query.filter_by(is_admin=False).all()
     
     # Get all games for the week
-    games = GameCache.query.filter_by(week=selected_week).all()
+    games = GameRecords.for_week(selected_week)
     total_games = len(games)
-    current_app.logger.info(f"Found {total_games} games for week {selected_week}")
+    logger.debug("Found %s games for week %s", total_games, selected_week)
     
     # Debug game information
-    for game in games:
-        current_app.logger.info(f"Game {game.game_id}: {game.away_team}@{game.home_team}")
-        current_app.logger.info(f"  Status: {game.status}, Start Time: {game.start_time}")
-        current_app.logger.info(f"  Score: {game.away_score}-{game.home_score}")
-        current_app.logger.info(f"  Is MNF: {game.is_mnf}")
+    if logger.isEnabledFor(logging.DEBUG):
+        for game in games:
+            game_debug(logger, game.game_id, "Game %s: %s@%s", game.game_id, game.away_team, game.home_team)
+            game_debug(logger, game.game_id, "  Status: %s, Start Time: %s", game.status_text, game.kickoff)
+            game_debug(logger, game.game_id, "  Score: %s-%s", game.away_score, game.home_score)
+            game_debug(logger, game.game_id, "  Is MNF: %s", game.is_mnf)
     
-    # Get all picks for the week
-    picks = Pick.query.filter_by(week=selected_week).all()
-    current_app.logger.info(f"Found {len(picks)} total picks for week {selected_week}")
+    # Get all picks for the week, per user
+    week_picks = LeagueStats.week_picks(selected_week)
+    logger.debug("Found picks from %s users for week %s", len(week_picks), selected_week)
     
     # Get MNF predictions for the week
     mnf_predictions = MNFPrediction.query.filter_by(week=selected_week).all()
-    current_app.logger.info(f"Found {len(mnf_predictions)} MNF predictions for week {selected_week}")
+    logger.debug("Found %s MNF predictions for week %s", len(mnf_predictions), selected_week)
     for pred in mnf_predictions:
-        current_app.logger.info(f"MNF Prediction - User: {pred.user_id}, Points: {pred.total_points}, Actual: {pred.actual_total}")
+        logger.debug("MNF Prediction - User: %s, Points: %s, Actual: %s", pred.user_id, pred.total_points, pred.actual_total)
     
     mnf_data = {}
     actual_mnf_total = None
     
     # Get MNF game and calculate actual total
-    mnf_game = GameCache.query.filter_by(week=selected_week, is_mnf=True).first()
+    mnf_game = next((game for game in games if game.is_mnf), None)
     if mnf_game:
-        current_app.logger.info(f"Found MNF game for week {selected_week}: {mnf_game.game_id}")
-        current_app.logger.info(f"Status: {mnf_game.status}, Is Final: {mnf_game.is_final()}")
-        current_app.logger.info(f"Score: {mnf_game.home_team} {mnf_game.home_score} - {mnf_game.away_team} {mnf_game.away_score}")
-        current_app.logger.info(f"Is MNF flag: {mnf_game.is_mnf}")
-        current_app.logger.info(f"Start Time: {mnf_game.start_time}")
+        logger.debug("Found MNF game for week %s: %s", selected_week, mnf_game.game_id)
+        logger.debug("Status: %s, Is Final: %s", mnf_game.status_text, mnf_game.is_final)
+        logger.debug("Score: %s %s - %s %s", mnf_game.home_team, mnf_game.home_score, mnf_game.away_team, mnf_game.away_score)
+        logger.debug("Is MNF flag: %s", mnf_game.is_mnf)
+        logger.debug("Start Time: %s", mnf_game.kickoff)
         
         # Get current total points regardless of game status
-        current_total = mnf_game.get_total_points()
-        current_app.logger.info(f"Current total points: {current_total}")
+        current_total = mnf_game.total_points
+        logger.debug("Current total points: %s", current_total)
         
-        if mnf_game.is_final():
+        # Predictions are scored by MNFScoring when the game goes final
+        if mnf_game.is_final:
             actual_mnf_total = current_total
-            current_app.logger.info(f"Game is final, total points: {actual_mnf_total}")
-            
-            # Update all predictions with actual total if not already set
-            for pred in mnf_predictions:
-                if pred.actual_total is None and actual_mnf_total is not None:
-                    current_app.logger.info(f"Updating prediction for user {pred.user_id}: {pred.total_points} vs actual {actual_mnf_total}")
-                    pred.calculate_difference(actual_mnf_total)
-                    db.session.add(pred)
-                    current_app.logger.info(f"Updated prediction - Points off: {pred.points_off}, Is over: {pred.is_over}")
-            
-            # Commit all prediction updates at once
-            try:
-                db.session.commit()
-                current_app.logger.info("Successfully updated all MNF predictions")
-            except Exception as e:
-                current_app.logger.error(f"Error updating MNF predictions: {str(e)}")
-                db.session.rollback()
+            logger.debug("Game is final, total points: %s", actual_mnf_total)
         
         # Collect MNF prediction data for display
         for pred in mnf_predictions:
             mnf_data[pred.user_id] = {
                 'prediction': pred.total_points,
-                'actual': actual_mnf_total if mnf_game.is_final() else None,
-                'points_off': pred.points_off if mnf_game.is_final() else None,
-                'is_over': pred.is_over if mnf_game.is_final() else None,
-                'game_final': mnf_game.is_final()
+                'actual': actual_mnf_total if mnf_game.is_final else None,
+                'points_off': pred.points_off if mnf_game.is_final else None,
+                'is_over': pred.is_over if mnf_game.is_final else None,
+                'game_final': mnf_game.is_final
             }
-            current_app.logger.info(f"MNF data for user {pred.user_id}: {mnf_data[pred.user_id]}")
+            logger.debug("MNF data for user %s: %s", pred.user_id, mnf_data[pred.user_id])
     else:
         current_app.logger.warning(f"No MNF game found for week {selected_week}")
         
@@ -164,223 +135,43 @@ def standings(week=None):
                 'game_final': False
             }
     
-    # Define team abbreviation mapping
-    TEAM_ABBREV = {
-        'ARIZONA': 'ari', 'CARDINALS': 'ari', 'ARI': 'ari',
-        'ATLANTA': 'atl', 'FALCONS': 'atl', 'ATL': 'atl',
-        'BALTIMORE': 'bal', 'RAVENS': 'bal', 'BAL': 'bal',
-        'BUFFALO': 'buf', 'BILLS': 'buf', 'BUF': 'buf',
-        'CAROLINA': 'car', 'PANTHERS': 'car', 'CAR': 'car',
-        'CHICAGO': 'chi', 'BEARS': 'chi', 'CHI': 'chi',
-        'CINCINNATI': 'cin', 'BENGALS': 'cin', 'CIN': 'cin',
-        'CLEVELAND': 'cle', 'BROWNS': 'cle', 'CLE': 'cle',
-        'DALLAS': 'dal', 'COWBOYS': 'dal', 'DAL': 'dal',
-        'DENVER': 'den', 'BRONCOS': 'den', 'DEN': 'den',
-        'DETROIT': 'det', 'LIONS': 'det', 'DET': 'det',
-        'GREEN BAY': 'gb', 'PACKERS': 'gb', 'GB': 'gb',
-        'HOUSTON': 'hou', 'TEXANS': 'hou', 'HOU': 'hou',
-        'INDIANAPOLIS': 'ind', 'COLTS': 'ind', 'IND': 'ind',
-        'JACKSONVILLE': 'jax', 'JAGUARS': 'jax', 'JAX': 'jax', 'JAC': 'jax',
-        'KANSAS CITY': 'kc', 'CHIEFS': 'kc', 'KC': 'kc',
-        'LA CHARGERS': 'lac', 'LOS ANGELES CHARGERS': 'lac', 'LAC': 'lac',
-        'LA RAMS': 'lar', 'LOS ANGELES RAMS': 'lar', 'LAR': 'lar',
-        'LAS VEGAS': 'lv', 'RAIDERS': 'lv', 'LV': 'lv',
-        'MIAMI': 'mia', 'DOLPHINS': 'mia', 'MIA': 'mia',
-        'MINNESOTA': 'min', 'VIKINGS': 'min', 'MIN': 'min',
-        'NEW ENGLAND': 'ne', 'PATRIOTS': 'ne', 'NE': 'ne',
-        'NEW ORLEANS': 'no', 'SAINTS': 'no', 'NO': 'no',
-        'NY GIANTS': 'nyg', 'NEW YORK GIANTS': 'nyg', 'NYG': 'nyg',
-        'NY JETS': 'nyj', 'NEW YORK JETS': 'nyj', 'NYJ': 'nyj',
-        'PHILADELPHIA': 'phi', 'EAGLES': 'phi', 'PHI': 'phi',
-        'PITTSBURGH': 'pit', 'STEELERS': 'pit', 'PIT': 'pit',
-        'SEATTLE': 'sea', 'SEAHAWKS': 'sea', 'SEA': 'sea',
-        'SAN FRANCISCO': 'sf', '49ERS': 'sf', 'SF': 'sf',
-        'TAMPA BAY': 'tb', 'BUCCANEERS': 'tb', 'TB': 'tb',
-        'TENNESSEE': 'ten', 'TITANS': 'ten', 'TEN': 'ten',
-        'WASHINGTON': 'was', 'COMMANDERS': 'was', 'WAS': 'was', 'WSH': 'was'
-    }
-    
     # Calculate weekly records and prepare user data
     standings_data = []
     season_standings = []
     
-    def calculate_team_stats(user_id):
-        """Calculate success rate for each team picked by the user"""
-        team_stats = defaultdict(lambda: {'correct': 0, 'total': 0})
-        
-        # Get all picks for the user
-        picks = Pick.query.filter_by(user_id=user_id).all()
-        
-        for pick in picks:
-            if pick.is_correct is not None:  # Only count decided games
-                team = pick.team_picked.strip().upper()
-                team_stats[team]['total'] += 1
-                if pick.is_correct:
-                    team_stats[team]['correct'] += 1
-        
-        # Calculate success rates
-        team_success_rates = {}
-        for team, stats in team_stats.items():
-            if stats['total'] >= 3:  # Only include teams picked at least 3 times
-                success_rate = (stats['correct'] / stats['total']) * 100
-                team_success_rates[team] = {
-                    'success_rate': success_rate,
-                    'correct': stats['correct'],
-                    'total': stats['total']
-                }
-        
-        return team_success_rates
-
-    def calculate_streaks(user_id):
-        """Calculate streak information including current streak"""
-        picks = Pick.query.filter_by(user_id=user_id).order_by(Pick.week.asc()).all()
-        
-        current_streak = 0
-        longest_win_streak = 0
-        longest_loss_streak = 0
-        current_streak_type = None
-        
-        # Track the current streak separately
-        current_streak_count = 0
-        current_streak_is_win = None
-        last_pick = None
-        
-        for pick in picks:
-            if pick.is_correct is None:
-                continue
-                
-            # Update historical longest streaks
-            if current_streak_type is None:
-                current_streak_type = pick.is_correct
-                current_streak = 1
-            elif pick.is_correct == current_streak_type:
-                current_streak += 1
-            else:
-                if current_streak_type:  # Was a win streak
-                    longest_win_streak = max(longest_win_streak, current_streak)
-                else:  # Was a loss streak
-                    longest_loss_streak = max(longest_loss_streak, current_streak)
-                current_streak_type = pick.is_correct
-                current_streak = 1
-            
-            # Update current streak
-            if last_pick is None or pick.is_correct == current_streak_is_win:
-                current_streak_count += 1
-                current_streak_is_win = pick.is_correct
-            else:
-                current_streak_count = 1
-                current_streak_is_win = pick.is_correct
-            
-            last_pick = pick
-        
-        # Check final historical streak
-        if current_streak_type is not None:
-            if current_streak_type:
-                longest_win_streak = max(longest_win_streak, current_streak)
-            else:
-                longest_loss_streak = max(longest_loss_streak, current_streak)
-        
-        return {
-            'longest_win_streak': longest_win_streak,
-            'longest_loss_streak': longest_loss_streak,
-            'current_streak': current_streak_count,
-            'current_streak_type': 'win' if current_streak_is_win else 'loss' if current_streak_is_win is not None else None
-        }
+    # Records and trends come from the materialized user_week_stats table
+    week_stats = UserStats.week_records(selected_week)
+    season_records = UserStats.season_records()
+    weekly_trends = UserStats.weekly_wins(current_week)
+    empty_record = {'wins': 0, 'losses': 0, 'total': 0, 'total_possible': 0}
 
-    def calculate_upsets(user_id):
-        """Calculate upset picks (correctly picking against the majority)"""
-        picks = Pick.query.filter_by(user_id=user_id).all()
-        upset_picks = []
-        total_correct_upsets = 0
-        
-        for pick in picks:
-            if pick.is_correct:
-                # Get all picks for this game
-                game_picks = Pick.query.filter_by(game_id=pick.game_id).all()
-                if not game_picks:
-                    continue
-                
-                # Get the game details
-                game = GameCache.query.filter_by(game_id=pick.game_id).first()
-                if not game:
-                    continue
-
-                # Count picks for each team
-                team_counts = {}
-                for p in game_picks:
-                    team = p.team_picked.upper()
-                    team_counts[team] = team_counts.get(team, 0) + 1
-                
-                # Find the majority picked team
-                majority_team = max(team_counts.items(), key=lambda x: x[1])[0]
-                total_picks = sum(team_counts.values())
-                
-                # If user picked against majority (and won)
-                user_pick = pick.team_picked.upper()
-                if user_pick != majority_team:
-                    majority_percentage = (team_counts[majority_team] / total_picks) * 100
-                    # Only count as upset if at least 65% picked the other team
-                    if majority_percentage >= 65:
-                        total_correct_upsets += 1
-                        
-                        # Get proper team names and determine opponent
-                        picked_team_abbrev = get_team_abbrev(pick.team_picked.upper())
-                        
-                        # Determine the actual opponent (the team they played against, not picked)
-                        if game.home_team.upper() == pick.team_picked.upper():
-                            opponent_abbrev = get_team_abbrev(game.away_team.upper())
-                        else:
-                            opponent_abbrev = get_team_abbrev(game.home_team.upper())
-                        
-                        if picked_team_abbrev and opponent_abbrev:
-                            upset_picks.append({
-                                'week': pick.week,
-                                'team': picked_team_abbrev.upper(),
-                                'team_logo': f"/static/img/teams/{picked_team_abbrev.lower()}.png",
-                                'opponent': opponent_abbrev.upper(),
-                                'opponent_logo': f"/static/img/teams/{opponent_abbrev.lower()}.png",
-                                'majority_pct': majority_percentage
-                            })
-        
-        # Sort by how heavily favored the other team was
-        upset_picks.sort(key=lambda x: x['majority_pct'], reverse=True)
-        
-        return {
-            'total_upsets': total_correct_upsets,
-            'upset_picks': upset_picks[:3]  # Top 3 biggest upsets
-        }
+    # Streaks, upsets and team success rates for the whole league at once
+    streaks = Streaks.for_users()
+    upsets = LeagueStats.upsets()
+    team_success_rates = LeagueStats.team_success_rates()
 
     for user in users:
-        weekly_record = user.get_weekly_record(selected_week)
-        season_record = user.get_season_record()
-        
-        # Get weekly trend data
-        weekly_trend = []
-        for w in range(1, current_week + 1):
-            week_record = user.get_weekly_record(w)
-            weekly_trend.append(week_record['wins'])
+        weekly_record = week_stats[user.id].to_record() if user.id in week_stats else empty_record
+        season_record = season_records.get(user.id, empty_record)
+        weekly_trend = weekly_trends.get(user.id, [0] * current_week)
         
         # Get user's picks for display
         user_picks = []
         user_picks_count = 0
         for game in games:
-            pick = next((p for p in picks if p.user_id == user.id and p.game_id == game.game_id), None)
+            pick = week_picks.get(user.id, {}).get(game.game_id)
             if pick:
                 team_picked = pick.team_picked.strip().upper()
-                current_app.logger.info(f"Processing pick for {user.username} - Raw team: {team_picked}")
+                logger.debug("Processing pick for %s - Raw team: %s", user.username, team_picked)
                 
                 # Get the team abbreviation from our mapping
                 team_abbrev = get_team_abbrev(team_picked)
                 if team_abbrev:
                     logo_path = f"/static/img/teams/{team_abbrev}.png"
-                    current_app.logger.info(f"Found team abbreviation: {team_abbrev}, Logo path: {logo_path}")
+                    logger.debug("Found team abbreviation: %s, Logo path: %s", team_abbrev, logo_path)
                     
-                    # Check if the logo file exists
-                    logo_file = current_app.root_path + "/static/img/teams/" + team_abbrev + ".png"
-                    if os.path.exists(logo_file):
-                        current_app.logger.info(f"Logo file exists: {logo_file}")
-                    else:
-                        current_app.logger.error(f"Logo file does not exist: {logo_file}")
+                    # Check if the logo file exists (once per team per process)
+                    team_logo_exists(current_app.root_path, team_abbrev)
                     
                     pick_data = {
                         'team': team_picked,
@@ -392,7 +183,7 @@ def standings(week=None):
                 else:
                     current_app.logger.error(f"Unknown team abbreviation: {team_picked}")
         
-        current_app.logger.info(f"Found {user_picks_count} picks for user {user.username}")
+        logger.debug("Found %s picks for user %s", user_picks_count, user.username)
         
         # Calculate weekly percentage
         total_picks = weekly_record['total']
@@ -403,13 +194,13 @@ def standings(week=None):
         season_percentage = (season_record['wins'] / total_season_picks * 100) if total_season_picks > 0 else 0
         
         # Calculate streaks and upsets
-        streak_info = calculate_streaks(user.id)
-        upset_info = calculate_upsets(user.id)
-        team_stats = calculate_team_stats(user.id)
+        streak_info = streaks.get(user.id) or LeagueStats.empty_streak()
+        upset_info = upsets.get(user.id) or LeagueStats.empty_upsets()
+        team_stats = team_success_rates.get(user.id, {})
         
         # Get MNF prediction data
         mnf_pred = mnf_data.get(user.id, {})
-        current_app.logger.info(f"MNF data for user {user.username}: {mnf_pred}")
+        logger.debug("MNF data for user %s: %s", user.username, mnf_pred)
         
         user_data = {
             'username': user.username,
@@ -430,7 +221,7 @@ def standings(week=None):
             'upset_info': upset_info,
             'team_stats': team_stats
         }
-        current_app.logger.info(f"User data for {user.username}: {user_data}")
+        logger.debug("User data for %s: %s", user.username, user_data)
         standings_data.append(user_data)
     
     # Sort standings by:
@@ -457,6 +248,7 @@ def standings(week=None):
                          total_games=total_games)
 
 @bp.route('/head_to_head')
+@cached_page
 def head_to_head():
     """Compare picks between two users"""
     user1_id = request.args.get('user1', type=int)
@@ -489,14 +281,14 @@ def head_to_head():
     
     # Weekly breakdown
     weekly_breakdown = []
-    current_week = get_current_week()
+    current_week = WeekResolver.current()['week']
     
     for week in range(1, current_week + 1):
         week_games = []
         different_picks = 0
         
         # Get all games for the week
-        games = GameCache.query.filter_by(week=week).all()
+        games = GameRecords.for_week(week)
         
         for game in games:
             pick1 = user1_picks_dict.get((week, game.game_id))
@@ -508,11 +300,7 @@ def head_to_head():
             stats['total_games'] += 1
             
             # Get winner if game is finished
-            winner = None
-            if game.home_score is not None and game.away_score is not None:
-                # Use stored team abbreviations instead of converting full names
-                winner_team = game.home_team_abbrev if game.home_score > game.away_score else game.away_team_abbrev
-                winner = winner_team.lower() if winner_team else None
+            winner = game.winner.lower() if game.winner else None
             
             # Get and validate picks - ensure abbreviations are lowercase
             user1_abbrev = get_team_abbrev(pick1.team_picked) if pick1 and pick1.team_picked else None
@@ -607,6 +395,7 @@ def submit_picks():
                         total_points=mnf_points
                     )
                     db.session.add(mnf_pred)
+                    MNFScoring.score_if_final(week)
                     current_app.logger.info(f"Added MNF prediction: {mnf_points} points")
                 else:
                     current_app.logger.warning(f"Invalid MNF points value: {mnf_points}")
@@ -614,6 +403,11 @@ def submit_picks():
                 current_app.logger.error(f"Error processing MNF points: {str(e)}")
                 pass  # Invalid points value
         
+        # The week's picks were recreated ungraded; grade those of final games now
+        PickGrader.grade_submitted(user_id, [game.game_id for game in games])
+        UserStats.refresh([week], [user_id])
+        Consensus.refresh(game.game_id for game in games)
+        RenderCache.invalidate()
         db.session.commit()
         return jsonify({'message': 'Picks saved successfully'}), 200
         
@@ -621,6 +415,15 @@ def submit_picks():
         db.session.rollback()
         return jsonify({'error': str(e)}), 500
 
+@bp.route('/api/consensus/<int:week>')
+@login_required
+def consensus(week):
+    """League pick distribution per game for a week (frozen at each game's kickoff)"""
+    return jsonify({
+        'week': week,
+        'games': [row.to_dict() for row in Consensus.for_week(week)]
+    })
+
 @bp.route('/force_update/<int:week>')
 @login_required
 def force_update(week):
@@ -649,6 +452,8 @@ def force_update(week):
                         if pred.actual_total is None:
                             pred.calculate_difference(actual_total)
                             db.session.add(pred)
+                    UserStats.refresh([week])
+                    RenderCache.invalidate()
                     db.session.commit()
         
         return jsonify({
@@ -776,7 +581,7 @@ def force_mnf(week):
                 
                 for game in all_games:
                     try:
-                        game_data = json.loads(game.data)
+                        game_data = GameService.game_payload(game) or {}
                         current_app.logger.info(f"Checking game {game.game_id}")
                         
                         game_date = datetime.fromisoformat(game_data.get('date', '').replace('Z', '+00:00'))
@@ -835,7 +640,7 @@ def force_mnf(week):
             
         # Force the game to be final if it has scores and status indicates completion
         if mnf_game.home_score is not None and mnf_game.away_score is not None:
-            game_data = json.loads(mnf_game.data)
+            game_data = GameService.game_payload(mnf_game) or {}
             status = game_data.get('status', '')
             if status in ['STATUS_FINAL', 'STATUS_FINAL_OVERTIME'] or 'final' in status.lower():
                 current_app.logger.info(f"Setting game {mnf_game.game_id} status to final...")
@@ -865,6 +670,8 @@ def force_mnf(week):
                         continue
                 
                 try:
+                    UserStats.refresh([week])
+                    RenderCache.invalidate()
                     db.session.commit()
                     current_app.logger.info("Successfully updated all predictions")
                 except Exception as e:
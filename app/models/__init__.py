@@ -1,5 +1,7 @@
 from app.models.user import User
 from app.models.pick import Pick, MNFPrediction
-from app.models.game import GameCache, Season
+from app.models.stats import UserWeekStats, GameConsensus, UserStreak
+from app.models.ops import ProcessSnapshot, PollRun, LogSetting
+from app.models.game import GameCache, GameStatus, Season, ScoreboardValidator, SeasonWeek, ApiSnapshot
 
-__all__ = ['User', 'Pick', 'MNFPrediction', 'GameCache', 'Season']
+__all__ = ['User', 'Pick', 'MNFPrediction', 'UserWeekStats', 'GameConsensus', 'UserStreak', 'ProcessSnapshot', 'PollRun', 'LogSetting', 'GameCache', 'GameStatus', 'Season', 'ScoreboardValidator', 'SeasonWeek', 'ApiSnapshot']
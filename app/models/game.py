@@ -1,6 +1,77 @@
-from datetime import datetime
+from datetime import datetime, timezone
+from enum import IntEnum
+import hashlib
+import json
+import zlib
 from app.extensions import db
 
+IN_PROGRESS_STATUSES = frozenset([
+    'in progress',
+    'halftime',
+    '1st quarter',
+    '2nd quarter',
+    '3rd quarter',
+    '4th quarter',
+    'overtime',
+    'end period'
+])
+
+# ESPN statuses that don't say whether the game has started; the state is kept
+HOLD_STATUSES = frozenset(['delayed', 'suspended'])
+
+
+class GameStatus(IntEnum):
+    """
+    Game state: SCHEDULED -> IN_PROGRESS -> FINAL / POSTPONED / CANCELED.
+
+    Stored in GameCache.state at ingest; everything from FINAL up counts as
+    over (see GameCache.is_final).
+    """
+    SCHEDULED = 0
+    IN_PROGRESS = 1
+    FINAL = 2
+    POSTPONED = 3
+    CANCELED = 4
+
+    @property
+    def is_over(self):
+        return self >= GameStatus.FINAL
+
+    @staticmethod
+    def from_status(status, previous=None):
+        """State for an ESPN status string at ingest, never guessed from the kickoff time."""
+        if (status or '').lower() in HOLD_STATUSES:
+            return GameStatus(previous) if previous is not None else GameStatus.SCHEDULED
+        return GameStatus.classify(status)
+
+    @staticmethod
+    def classify(status, start_time=None, home_score=None, away_score=None, now=None):
+        """Map a stored status string (and kickoff/scores as a fallback) to a GameStatus."""
+        if not status:
+            return GameStatus.SCHEDULED
+        status_lower = status.lower()
+        if status_lower == 'postponed':
+            return GameStatus.POSTPONED
+        if status_lower == 'canceled':
+            return GameStatus.CANCELED
+        if status_lower == 'post' or 'final' in status_lower:
+            return GameStatus.FINAL
+        if status_lower in IN_PROGRESS_STATUSES or 'quarter' in status_lower or 'overtime' in status_lower:
+            return GameStatus.IN_PROGRESS
+        # No final status, but kicked off in the past with scores in: treat as over
+        if start_time and (now or datetime.utcnow()) > start_time:
+            if home_score is not None and away_score is not None:
+                return GameStatus.FINAL
+        return GameStatus.SCHEDULED
+
+
+# GameCache columns the stored payload is rebuilt from (see GameCache.payload)
+PAYLOAD_COLUMNS = (
+    'game_id', 'week', 'season_type', 'year', 'start_time', 'status', 'winning_team',
+    'home_team', 'away_team', 'home_team_abbrev', 'away_team_abbrev', 'home_score', 'away_score',
+    'venue_name', 'venue_city', 'venue_state', 'is_mnf'
+)
+
 class GameCache(db.Model):
     """Model for caching ESPN API game data."""
     id = db.Column(db.Integer, primary_key=True)
@@ -8,7 +79,8 @@ class GameCache(db.Model):
     season_type = db.Column(db.Integer, nullable=False, default=2)  # 1=preseason, 2=regular season, 3=postseason
     year = db.Column(db.Integer, nullable=False)
     game_id = db.Column(db.String(64), nullable=False, unique=True)
-    data = db.Column(db.Text, nullable=False)
+    data = db.Column(db.Text, nullable=False)  # legacy full JSON; '' once packed into data_z
+    data_z = db.Column(db.LargeBinary)  # compressed payload fields with no column, see pack_payload()
     last_updated = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
     status = db.Column(db.String(20), default='scheduled')
     winning_team = db.Column(db.String(64))
@@ -25,9 +97,84 @@ class GameCache(db.Model):
     venue_state = db.Column(db.String(2))
     spread = db.Column(db.Float)
     over_under = db.Column(db.Float)
+    fingerprint = db.Column(db.String(16))  # see make_fingerprint()
+    state = db.Column(db.SmallInteger)  # GameStatus, set at ingest (NULL for rows stored before)
+    graded_at = db.Column(db.DateTime)  # when picks were last graded
+    graded_home_score = db.Column(db.Integer)  # score the picks were graded against
+    graded_away_score = db.Column(db.Integer)
     created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
     
+    @staticmethod
+    def make_fingerprint(status, home_score, away_score, winning_team, kickoff, is_mnf):
+        """Compact hash of the fields that drive display and grading."""
+        raw = f"{status}|{home_score}|{away_score}|{winning_team}|{kickoff}|{bool(is_mnf)}"
+        return hashlib.blake2b(raw.encode(), digest_size=8).hexdigest()
+
+    @staticmethod
+    def columns_payload(columns) -> dict:
+        """The parsed-game dict as far as it can be rebuilt from column values."""
+        start_time = columns['start_time']
+        return {
+            'game_id': columns['game_id'],
+            'week': columns['week'],
+            'season_type': columns['season_type'],
+            'year': columns['year'],
+            'date': start_time.replace(tzinfo=timezone.utc).isoformat() if start_time else None,
+            'status': columns['status'],
+            'winning_team': columns['winning_team'],
+            'home_team': {
+                'display_name': columns['home_team'],
+                'abbreviation': columns['home_team_abbrev'],
+                'score': columns['home_score']
+            },
+            'away_team': {
+                'display_name': columns['away_team'],
+                'abbreviation': columns['away_team_abbrev'],
+                'score': columns['away_score']
+            },
+            'venue': {
+                'name': columns['venue_name'],
+                'city': columns['venue_city'],
+                'state': columns['venue_state']
+            },
+            'is_mnf': bool(columns['is_mnf'])
+        }
+
+    @staticmethod
+    def pack_payload(game_data: dict, columns) -> bytes:
+        """
+        Compress the parts of a parsed game that the columns don't already hold.
+
+        Top-level values, and keys of nested dicts such as home_team, are
+        kept only where they differ from columns_payload(), so GameCache.payload
+        gives back exactly `game_data`.
+        """
+        base = GameCache.columns_payload(columns)
+        extras = {}
+        for key, value in game_data.items():
+            if isinstance(value, dict) and isinstance(base.get(key), dict):
+                nested = {k: v for k, v in value.items() if base[key].get(k, object()) != v}
+                if nested:
+                    extras[key] = nested
+            elif key not in base or base[key] != value:
+                extras[key] = value
+        return zlib.compress(json.dumps(extras, separators=(',', ':')).encode(), 9)
+
+    @property
+    def payload(self) -> dict:
+        """Parsed game data: columns plus data_z, or the legacy JSON in data (columns only once pruned)."""
+        if self.data_z is None and self.data:
+            return json.loads(self.data)
+        payload = GameCache.columns_payload({name: getattr(self, name) for name in PAYLOAD_COLUMNS})
+        extras = json.loads(zlib.decompress(self.data_z)) if self.data_z else {}  # None once pruned
+        for key, value in extras.items():
+            if isinstance(value, dict) and isinstance(payload.get(key), dict):
+                payload[key].update(value)
+            else:
+                payload[key] = value
+        return payload
+
     def update_result(self, status, winning_team=None, home_score=None, away_score=None):
         """Update game result with new data."""
         self.status = status
@@ -41,24 +188,13 @@ class GameCache(db.Model):
 
     def is_final(self):
         """Check if game is final."""
-        if not self.status:
-            return False
-        status_lower = self.status.lower()
-        
-        # First check exact status matches
-        if status_lower in {'final', 'final ot', 'status_final', 'post', 'postponed', 'canceled'}:
-            return True
-        
-        # Then check if contains 'final'    
-        if 'final' in status_lower:
-            return True
-            
-        # Finally check if game has started and completed
-        if self.start_time and datetime.utcnow() > self.start_time:
-            if self.home_score is not None and self.away_score is not None:
-                return not self.is_in_progress()
-                
-        return False
+        return self.game_status().is_over
+
+    def game_status(self):
+        """State of the game as a GameStatus (inferred from the status text if never ingested)."""
+        if self.state is not None:
+            return GameStatus(self.state)
+        return GameStatus.classify(self.status, self.start_time, self.home_score, self.away_score)
 
     def get_winner(self):
         """Get the winning team based on score."""
@@ -78,27 +214,23 @@ class GameCache(db.Model):
                 
         return None
 
+    def mark_graded(self, graded_at=None):
+        """Record that picks have been graded against the current score."""
+        self.graded_at = graded_at or datetime.utcnow()
+        self.graded_home_score = self.home_score
+        self.graded_away_score = self.away_score
+
+    def needs_grading(self):
+        """Check if game is final and its picks haven't been graded against this score."""
+        if not self.is_final():
+            return False
+        return (self.graded_at is None or
+                self.graded_home_score != self.home_score or
+                self.graded_away_score != self.away_score)
+
     def is_in_progress(self):
         """Check if game is in progress."""
-        if not self.status:
-            return False
-            
-        in_progress_statuses = {
-            'in progress',
-            'halftime',
-            '1st quarter',
-            '2nd quarter',
-            '3rd quarter',
-            '4th quarter',
-            'overtime'
-        }
-        
-        status_lower = self.status.lower()
-        return (
-            status_lower in in_progress_statuses or
-            'quarter' in status_lower or
-            'overtime' in status_lower
-        )
+        return self.game_status() == GameStatus.IN_PROGRESS
 
     def get_total_points(self):
         """Get total points scored in the game."""
@@ -132,3 +264,54 @@ class Season(db.Model):
 
     def __repr__(self):
         return f'<Season {self.year} Week:{self.current_week}>'
+
+class ScoreboardValidator(db.Model):
+    """Model for storing ESPN scoreboard response validators per query."""
+    id = db.Column(db.Integer, primary_key=True)
+    query_key = db.Column(db.String(64), nullable=False, unique=True)
+    etag = db.Column(db.String(256))
+    last_modified = db.Column(db.String(64))
+    body_hash = db.Column(db.String(40))
+    updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def to_dict(self):
+        return {
+            'etag': self.etag,
+            'last_modified': self.last_modified,
+            'body_hash': self.body_hash
+        }
+
+    def __repr__(self):
+        return f'<ScoreboardValidator {self.query_key}>'
+
+class SeasonWeek(db.Model):
+    """Model for the locally stored NFL season calendar (one row per week)."""
+    __table_args__ = (db.UniqueConstraint('year', 'season_type', 'week', name='uq_season_week'),)
+    id = db.Column(db.Integer, primary_key=True)
+    year = db.Column(db.Integer, nullable=False)
+    season_type = db.Column(db.Integer, nullable=False, default=2)  # 1=preseason, 2=regular season, 3=postseason
+    week = db.Column(db.Integer, nullable=False)
+    label = db.Column(db.String(64))
+    start_date = db.Column(db.DateTime, nullable=False, index=True)  # UTC
+    end_date = db.Column(db.DateTime, nullable=False, index=True)  # UTC
+    fetched_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+    def to_week_info(self):
+        return {
+            'week': self.week,
+            'season_type': self.season_type,
+            'year': self.year
+        }
+
+    def __repr__(self):
+        return f'<SeasonWeek {self.year} Type:{self.season_type} Week:{self.week}>'
+
+class ApiSnapshot(db.Model):
+    """Model for the last successful result of an ESPN API call (outage fallback)."""
+    id = db.Column(db.Integer, primary_key=True)
+    key = db.Column(db.String(64), nullable=False, unique=True)
+    payload = db.Column(db.Text, nullable=False)
+    fetched_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f'<ApiSnapshot {self.key} {self.fetched_at}>'
@@ -0,0 +1,72 @@
+from datetime import datetime
+import json
+from app.extensions import db
+
+class ProcessSnapshot(db.Model):
+    """Diagnostics last published by a process (e.g. the updater), see app.services.ops_stats."""
+    __tablename__ = 'process_snapshot'
+    __table_args__ = (db.UniqueConstraint('source', 'name', name='uq_process_snapshot'),)
+    id = db.Column(db.Integer, primary_key=True)
+    source = db.Column(db.String(32), nullable=False)  # publishing process, e.g. 'updater'
+    name = db.Column(db.String(32), nullable=False)  # section, e.g. 'http', 'ingest'
+    pid = db.Column(db.Integer)
+    payload = db.Column(db.Text, nullable=False)  # JSON
+    published_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+
+    def to_dict(self):
+        return {
+            'source': self.source,
+            'pid': self.pid,
+            'published_at': self.published_at.isoformat() if self.published_at else None,
+            'stats': json.loads(self.payload)
+        }
+
+    def __repr__(self):
+        return f'<ProcessSnapshot {self.source}:{self.name} {self.published_at}>'
+
+class PollRun(db.Model):
+    """One ESPN poll by the updater: planned vs actual start, and the plan for the next poll."""
+    __tablename__ = 'poll_run'
+    id = db.Column(db.Integer, primary_key=True)
+    planned_at = db.Column(db.DateTime)  # UTC; NULL when the poll was not planned
+    started_at = db.Column(db.DateTime, nullable=False, index=True)  # UTC
+    finished_at = db.Column(db.DateTime, nullable=False)
+    lag_seconds = db.Column(db.Float)  # started - planned
+    next_delay_seconds = db.Column(db.Float)
+    next_reason = db.Column(db.String(128))
+    error = db.Column(db.Text)
+    # Game cache update made by the poll (NULL when it didn't write, e.g. scoreboard unchanged)
+    games_created = db.Column(db.Integer)
+    games_updated = db.Column(db.Integer)
+    games_skipped = db.Column(db.Integer)
+    events = db.Column(db.Integer)
+    write_lock_ms = db.Column(db.Float)  # how long the SQLite write lock was held
+
+    def to_dict(self):
+        return {
+            'planned': self.planned_at.isoformat() if self.planned_at else None,
+            'actual': self.started_at.isoformat(),
+            'finished': self.finished_at.isoformat(),
+            'lag_seconds': self.lag_seconds,
+            'duration_ms': round((self.finished_at - self.started_at).total_seconds() * 1000, 1),
+            'error': self.error,
+            'created': self.games_created,
+            'updated': self.games_updated,
+            'skipped': self.games_skipped,
+            'events': self.events,
+            'write_lock_ms': self.write_lock_ms
+        }
+
+    def __repr__(self):
+        return f'<PollRun {self.started_at} lag:{self.lag_seconds}>'
+
+class LogSetting(db.Model):
+    """A runtime log setting shared by every process: a subsystem level or game_sample_rate (see app.services.log_settings)."""
+    __tablename__ = 'log_setting'
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(32), nullable=False, unique=True)
+    value = db.Column(db.String(16), nullable=False)
+    updated_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def __repr__(self):
+        return f'<LogSetting {self.name}={self.value}>'
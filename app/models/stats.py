@@ -0,0 +1,120 @@
+from datetime import datetime
+from app.extensions import db
+
+class UserWeekStats(db.Model):
+    """Materialized pick record per user and week, kept current by app.services.user_stats."""
+    __tablename__ = 'user_week_stats'
+    __table_args__ = (db.UniqueConstraint('user_id', 'week', name='uq_user_week_stats'),)
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False, index=True)
+    week = db.Column(db.Integer, nullable=False, index=True)
+    wins = db.Column(db.Integer, nullable=False, default=0)
+    losses = db.Column(db.Integer, nullable=False, default=0)
+    decided = db.Column(db.Integer, nullable=False, default=0)  # picks graded either way
+    possible = db.Column(db.Integer, nullable=False, default=0)  # picks made
+    mnf_prediction = db.Column(db.Integer)
+    mnf_points_off = db.Column(db.Integer)
+    mnf_is_over = db.Column(db.Boolean)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def to_record(self):
+        """Same shape as User.get_weekly_record"""
+        return {
+            'wins': self.wins,
+            'losses': self.losses,
+            'total': self.decided,
+            'total_possible': self.possible
+        }
+
+    def __repr__(self):
+        return f'<UserWeekStats User:{self.user_id} Week:{self.week} {self.wins}-{self.losses}>'
+
+class GameConsensus(db.Model):
+    """League pick distribution for one game, kept by app.services.consensus and frozen at kickoff."""
+    __tablename__ = 'game_consensus'
+    id = db.Column(db.Integer, primary_key=True)
+    game_id = db.Column(db.String(64), nullable=False, unique=True)
+    week = db.Column(db.Integer, nullable=False, index=True)
+    home_team = db.Column(db.String(10))  # canonical team keys (see resolve_team)
+    away_team = db.Column(db.String(10))
+    home_picks = db.Column(db.Integer, nullable=False, default=0)
+    away_picks = db.Column(db.Integer, nullable=False, default=0)
+    total_picks = db.Column(db.Integer, nullable=False, default=0)  # includes picks naming neither team
+    majority_team = db.Column(db.String(10))  # None when tied or unpicked
+    majority_pct = db.Column(db.Float)
+    frozen_at = db.Column(db.DateTime)  # set at kickoff; later pick changes are ignored
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def to_dict(self):
+        return {
+            'game_id': self.game_id,
+            'week': self.week,
+            'home_team': self.home_team,
+            'away_team': self.away_team,
+            'home_picks': self.home_picks,
+            'away_picks': self.away_picks,
+            'total_picks': self.total_picks,
+            'home_pct': round(self.home_picks / self.total_picks * 100, 1) if self.total_picks else None,
+            'away_pct': round(self.away_picks / self.total_picks * 100, 1) if self.total_picks else None,
+            'majority_team': self.majority_team,
+            'majority_pct': round(self.majority_pct, 1) if self.majority_pct is not None else None,
+            'frozen': self.frozen_at is not None
+        }
+
+    def __repr__(self):
+        return f'<GameConsensus {self.game_id} {self.away_team} {self.away_picks} @ {self.home_team} {self.home_picks}>'
+
+class UserStreak(db.Model):
+    """Running pick streaks per user, in kickoff order, kept by app.services.streaks."""
+    __tablename__ = 'user_streak'
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False, unique=True)
+    current_streak = db.Column(db.Integer, nullable=False, default=0)
+    current_streak_type = db.Column(db.String(4))  # 'win' or 'loss'
+    longest_win_streak = db.Column(db.Integer, nullable=False, default=0)
+    longest_loss_streak = db.Column(db.Integer, nullable=False, default=0)
+    # Kickoff and game id of the last pick applied; picks are applied in this order
+    last_kickoff = db.Column(db.DateTime)
+    last_game_id = db.Column(db.String(64))
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    def reset(self):
+        self.current_streak = 0
+        self.current_streak_type = None
+        self.longest_win_streak = 0
+        self.longest_loss_streak = 0
+        self.last_kickoff = None
+        self.last_game_id = None
+
+    def push(self, is_correct, kickoff, game_id):
+        """Extend the streaks with the next decided pick (in kickoff order)"""
+        result = 'win' if is_correct else 'loss'
+        if result == self.current_streak_type:
+            self.current_streak += 1
+        else:
+            self.current_streak_type = result
+            self.current_streak = 1
+        if is_correct:
+            self.longest_win_streak = max(self.longest_win_streak or 0, self.current_streak)
+        else:
+            self.longest_loss_streak = max(self.longest_loss_streak or 0, self.current_streak)
+        self.last_kickoff = kickoff
+        self.last_game_id = game_id
+
+    def applied(self, kickoff, game_id) -> bool:
+        """Whether a pick on the game at (kickoff, game_id) is already part of these streaks"""
+        if self.last_kickoff is None:
+            return False
+        return (kickoff, game_id) <= (self.last_kickoff, self.last_game_id)
+
+    def to_dict(self):
+        """Same shape as the standings streak info"""
+        return {
+            'longest_win_streak': self.longest_win_streak,
+            'longest_loss_streak': self.longest_loss_streak,
+            'current_streak': self.current_streak,
+            'current_streak_type': self.current_streak_type
+        }
+
+    def __repr__(self):
+        return f'<UserStreak User:{self.user_id} {self.current_streak_type} x{self.current_streak}>'
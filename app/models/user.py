@@ -18,6 +18,8 @@ class User(UserMixin, db.Model):
     # Relationships
     picks = db.relationship('Pick', backref='user', lazy=True, cascade='all, delete-orphan')
     mnf_predictions = db.relationship('MNFPrediction', backref='user', lazy=True, cascade='all, delete-orphan')
+    week_stats = db.relationship('UserWeekStats', backref='user', lazy=True, cascade='all, delete-orphan')
+    streak = db.relationship('UserStreak', backref='user', uselist=False, cascade='all, delete-orphan')
 
     def set_password(self, password):
         if self.is_admin:  # Only set password for admin users
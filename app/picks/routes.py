@@ -5,11 +5,17 @@ from app.picks import bp
 from app.models.game import GameCache
 from app.models.pick import Pick, MNFPrediction
 from app.models.user import User
+from app.services.game_records import GameRecords
+from app.services.consensus import Consensus
 from app.services.game_service import GameService
+from app.services.mnf_scoring import MNFScoring
+from app.services.pick_grader import PickGrader
+from app.services.render_cache import RenderCache
+from app.services.user_stats import UserStats
+from app.utils.log import game_debug
 from app.extensions import db
-from app.data.nfl_teams import NFL_TEAMS
+from app.data.nfl_teams import NFL_TEAMS, same_team
 import logging
-import pytz
 logger = logging.getLogger(__name__)
 
 @bp.route('/picks/<int:week>')
@@ -34,79 +40,49 @@ def picks(week, user_id=None):
     if current_user.is_admin and user_id:
         target_user = User.query.get_or_404(user_id)
 
-    # Get games for the week
-    games = GameService.update_week_games(week=week)
+    # Get games for the week, fetching from ESPN first if the week isn't cached yet
+    games = GameRecords.for_week(week, season_type=2, year=datetime.now().year)
+    if not games:
+        fetched = GameService.update_week_games(week=week)
+        games = list(GameRecords.by_game_ids(game['game_id'] for game in fetched).values())
     
     if not games:
         flash(f'No games found for week {week}', 'warning')
-        games = []
 
-    # Transform game data into the format expected by the template
+    # Transform game records into the format expected by the template
     transformed_games = []
     mnf_games = []
     
     logger.info(f"Processing {len(games)} games for week {week}")
     
     for game in games:
-        try:
-            # Handle both old and new API formats
-            if isinstance(game.get('away_team'), dict):
-                # New format
-                away_abbrev = game['away_team']['abbreviation']
-                home_abbrev = game['home_team']['abbreviation']
-                away_team = game['away_team']['display_name']
-                home_team = game['home_team']['display_name']
-                away_score = game['away_team'].get('score', '0')
-                home_score = game['home_team'].get('score', '0')
-            else:
-                # Old format
-                away_abbrev = game['away_team']
-                home_abbrev = game['home_team']
-                away_team = game['away_team_name']
-                home_team = game['home_team_name']
-                away_score = game['away_score']
-                home_score = game['home_score']
-            
-            # Parse game date - convert from UTC to local timezone
-            game_date = datetime.fromisoformat(game['date'].replace('Z', '+00:00'))
-            local_tz = pytz.timezone('America/Chicago')  # Central Time
-            local_date = game_date.astimezone(local_tz)
-            game_time = local_date.strftime('%a %I:%M %p')  # %a adds the day abbreviation (MON, TUE, etc.)
-            
-            # Use the API's is_mnf flag if available, otherwise detect based on game time
-            is_mnf = game.get('is_mnf', False)
-            if not is_mnf and local_date.weekday() == 0:  # Monday is 0
-                game_hour = local_date.hour
-                is_mnf = game_hour >= 19 or game_hour < 4  # 7 PM to 4 AM CT
-            
-            transformed_game = {
-                'id': game.get('game_id', game.get('id')),
-                'away_team_abbrev': away_abbrev,
-                'home_team_abbrev': home_abbrev,
-                'away_team': away_team,
-                'home_team': home_team,
-                'away_team_score': away_score,
-                'home_team_score': home_score,
-                'game_status': game.get('status', 'scheduled'),
-                'game_time': game_time,
-                'is_mnf': is_mnf
-            }
-            transformed_games.append(transformed_game)
-            
-            # If this is an MNF game, add it to the list
-            if transformed_game['is_mnf']:
-                mnf_games.append(transformed_game)
-                logger.info(f"Found MNF game: {away_team} @ {home_team}")
-                logger.info(f"Game details: status={game.get('status')}, time={game_time}, date={local_date}")
-            
-            # Debug logging for each game
-            logger.info(f"Game {transformed_game['id']}: {away_team} @ {home_team}")
-            logger.info(f"Status: {transformed_game['game_status']}, Time: {game_time}, Is MNF: {transformed_game['is_mnf']}")
-            
-        except (KeyError, TypeError) as e:
-            logger.error(f"Error processing game data: {e}")
-            logger.error(f"Raw game data: {game}")
-            continue
+        # Use the API's is_mnf flag if available, otherwise detect based on game time
+        is_mnf = game.is_mnf
+        if not is_mnf and game.kickoff_local and game.kickoff_local.weekday() == 0:  # Monday is 0
+            game_hour = game.kickoff_local.hour
+            is_mnf = game_hour >= 19 or game_hour < 4  # 7 PM to 4 AM CT
+        
+        transformed_game = {
+            'id': game.game_id,
+            'away_team_abbrev': game.away,
+            'home_team_abbrev': game.home,
+            'away_team': game.away_team,
+            'home_team': game.home_team,
+            'away_team_score': game.away_score,
+            'home_team_score': game.home_score,
+            'game_status': game.status_text or 'scheduled',
+            'game_time': game.game_time,
+            'is_mnf': is_mnf
+        }
+        transformed_games.append(transformed_game)
+        
+        # If this is an MNF game, add it to the list
+        if transformed_game['is_mnf']:
+            mnf_games.append(transformed_game)
+            logger.info(f"Found MNF game: {game.away_team} @ {game.home_team}")
+        
+        game_debug(logger, game.game_id, "Game %s: %s @ %s, status %s, time %s, MNF %s", game.game_id,
+                   game.away_team, game.home_team, game.status.name, game.game_time, is_mnf)
     
     logger.info(f"Found {len(mnf_games)} MNF games for week {week}")
     
@@ -164,6 +140,7 @@ def submit_picks(week):
         return redirect(url_for('main.index'))
 
     # Process each game pick
+    changed_game_ids = []
     for game in games:
         game_id = game['game_id']
         pick_key = f'pick_{game_id}'
@@ -174,7 +151,7 @@ def submit_picks(week):
             # Ensure we store the team abbreviation
             home_team = game['home_team']['abbreviation']
             away_team = game['away_team']['abbreviation']
-            team_picked = home_team if GameService.teams_match(team_picked, game['home_team']['display_name']) else away_team
+            team_picked = home_team if same_team(team_picked, game['home_team']['display_name']) else away_team
             
             # Check if pick already exists
             pick = Pick.query.filter_by(
@@ -184,7 +161,9 @@ def submit_picks(week):
             ).first()
             
             if pick:
-                pick.team_picked = team_picked
+                if pick.team_picked != team_picked:
+                    pick.team_picked = team_picked
+                    changed_game_ids.append(game_id)
             else:
                 pick = Pick(
                     user_id=target_user.id,
@@ -193,6 +172,7 @@ def submit_picks(week):
                     team_picked=team_picked
                 )
                 db.session.add(pick)
+                changed_game_ids.append(game_id)
 
     # Process MNF prediction if provided
     if 'mnf_total_points' in request.form and request.form['mnf_total_points']:
@@ -213,7 +193,13 @@ def submit_picks(week):
                 total_points=total_points
             )
             db.session.add(prediction)
+        MNFScoring.score_if_final(week)
 
+    # Picks changed on games already final won't be graded by a later poll
+    PickGrader.grade_submitted(target_user.id, changed_game_ids)
+    UserStats.refresh([week], [target_user.id])
+    Consensus.refresh(game['game_id'] for game in games)
+    RenderCache.invalidate()
     db.session.commit()
     flash('Picks submitted successfully!', 'success')
     return redirect(url_for('picks.picks', week=week, user_id=user_id))
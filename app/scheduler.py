@@ -1,46 +1,220 @@
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional, Tuple
+import logging
+
 from apscheduler.schedulers.background import BackgroundScheduler
-from apscheduler.triggers.cron import CronTrigger
+from flask import current_app
+from sqlalchemy import func
+
+from app.extensions import db
+from app.models.game import GameCache, GameStatus
+from app.models.ops import PollRun
+from app.services.espn_api import ESPNApiService
 from app.services.game_service import GameService
-import logging
+from app.services.http_session import HttpSession
+from app.services.log_settings import LogSettings
+from app.services.ops_stats import OpsStats
 
 logger = logging.getLogger(__name__)
 
+# A game still not live or over this long after kickoff is no longer
+# treated as pending (stale row, or ESPN never picked it up)
+KICKOFF_GRACE = timedelta(hours=6)
+
+
+class PollPlanner:
+    """
+    Decides when the next ESPN poll should run, from the cached games.
+
+    Polls every SCHEDULER_LIVE_INTERVAL while any game is live or past its
+    kickoff without having started, halves the time to the next kickoff
+    otherwise (so polls close in on it), and waits SCHEDULER_IDLE_INTERVAL
+    when nothing is pending. Planned and actual run times of every poll
+    are stored in poll_run for /admin/poll-schedule.
+    """
+
+    @staticmethod
+    def next_delay(now: Optional[datetime] = None) -> Tuple[float, str]:
+        """(seconds until the next poll, reason) given the games in the cache"""
+        config = current_app.config
+        live_interval = config.get('SCHEDULER_LIVE_INTERVAL', 60)
+        idle_interval = config.get('SCHEDULER_IDLE_INTERVAL', 6 * 3600)
+        min_interval = config.get('SCHEDULER_MIN_INTERVAL', 15)
+        now = now or datetime.utcnow()
+
+        rows = db.session.query(GameCache.start_time, GameCache.state, GameCache.status) \
+            .filter(GameCache.start_time >= now - KICKOFF_GRACE).all()
+        next_kickoff = None
+        for start_time, state, status in rows:
+            game_state = GameStatus(state) if state is not None else GameStatus.from_status(status)
+            if game_state == GameStatus.IN_PROGRESS:
+                return live_interval, 'games live'
+            if game_state != GameStatus.SCHEDULED:
+                continue
+            if start_time <= now:
+                return live_interval, 'kickoff due'
+            if next_kickoff is None or start_time < next_kickoff:
+                next_kickoff = start_time
+
+        if next_kickoff is None:
+            return idle_interval, 'no games pending'
+        until_kickoff = (next_kickoff - now).total_seconds()
+        if until_kickoff <= live_interval:
+            return max(until_kickoff, min_interval), f'kickoff at {next_kickoff.isoformat()}'
+        return min(max(until_kickoff / 2, min_interval), idle_interval), f'kickoff at {next_kickoff.isoformat()}'
+
+    @staticmethod
+    def record(planned: Optional[datetime], started: datetime, finished: datetime,
+               delay: float, reason: str, error: Optional[str] = None, ingest: Optional[Dict] = None) -> None:
+        """
+        Store one poll, the cache update it made (`ingest`, see
+        GameService.last_update_stats) and the plan made for the next one.
+        Committed; polls past retention are dropped.
+        """
+        def naive(moment):
+            return moment.astimezone(timezone.utc).replace(tzinfo=None) if moment else None
+
+        ingest = ingest or {}
+
+        try:
+            db.session.add(PollRun(
+                planned_at=naive(planned),
+                started_at=naive(started),
+                finished_at=naive(finished),
+                lag_seconds=round((started - planned).total_seconds(), 3) if planned else None,
+                next_delay_seconds=round(delay, 1),
+                next_reason=reason[:128],
+                error=error,
+                games_created=ingest.get('created'),
+                games_updated=ingest.get('updated'),
+                games_skipped=ingest.get('skipped'),
+                events=ingest.get('events'),
+                write_lock_ms=ingest.get('write_lock_ms')
+            ))
+            retention = timedelta(days=current_app.config.get('POLL_HISTORY_DAYS', 30))
+            PollRun.query.filter(PollRun.started_at < naive(started) - retention).delete(synchronize_session=False)
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Error recording game poll: {str(e)}")
+
+    @staticmethod
+    def snapshot(limit: int = 50) -> Dict:
+        """Next planned poll and the most recent polls, newest last"""
+        recent = PollRun.query.order_by(PollRun.started_at.desc()).limit(limit).all()[::-1]
+        polls, max_lag = db.session.query(func.count(PollRun.id), func.max(PollRun.lag_seconds)).one()
+        next_poll = None
+        if recent:
+            last = recent[-1]
+            next_poll = {
+                'at': (last.finished_at + timedelta(seconds=last.next_delay_seconds or 0)).isoformat(),
+                'delay_seconds': last.next_delay_seconds,
+                'reason': last.next_reason
+            }
+        return {
+            'next_poll': next_poll,
+            'polls': polls,
+            'max_lag_seconds': max_lag,
+            'recent': [run.to_dict() for run in recent]
+        }
+
+
+    @staticmethod
+    def write_lock_stats(limit: int = 200) -> Dict:
+        """Write-lock hold times over the last `limit` stored polls that wrote to the cache"""
+        held = sorted(value for (value,) in db.session.query(PollRun.write_lock_ms)
+                      .filter(PollRun.write_lock_ms.isnot(None))
+                      .order_by(PollRun.started_at.desc()).limit(limit))
+        return {
+            'polls': len(held),
+            'write_lock_ms_p50': held[len(held) // 2] if held else None,
+            'write_lock_ms_p95': held[int(len(held) * 0.95)] if held else None,
+            'write_lock_ms_max': held[-1] if held else None
+        }
+
+
+def publish_updater_stats():
+    """Share this process's ESPN and ingest diagnostics with every other process (see OpsStats)"""
+    http = HttpSession.stats()
+    http['circuit'] = ESPNApiService.breaker.snapshot()
+    OpsStats.publish('updater', {
+        'http': http,
+        'ingest': GameService.ingest_stats()
+    })
+
+
 def init_scheduler(app):
-    """Initialize the scheduler with the app context"""
-    scheduler = BackgroundScheduler()
-    
-    # Update games every 2 minutes during game time (Thursday, Sunday, Monday nights)
-    def update_games():
+    """
+    Start the adaptive game poller.
+
+    A single date-triggered job runs a poll and then schedules itself again
+    for the time PollPlanner picks, so there are no fixed game windows.
+    Interval jobs apply shared log settings (see LogSettings) and prune
+    stored game payloads every PRUNE_INTERVAL_HOURS.
+    """
+    scheduler = BackgroundScheduler(timezone=timezone.utc)
+
+    def poll_games(planned=None):
+        started = datetime.now(timezone.utc)
+        error = None
+        delay, reason = app.config.get('SCHEDULER_LIVE_INTERVAL', 60), 'retry after error'
         with app.app_context():
             try:
                 GameService.update_week_games(force=True)
                 logger.info("Successfully updated game data")
             except Exception as e:
-                logger.error(f"Error updating game data: {str(e)}")
-
-    # Thursday Night Football updates (8 PM - 12 AM ET)
-    scheduler.add_job(
-        update_games,
-        CronTrigger(day_of_week='thu', hour='20-23', minute='*/2', timezone='US/Eastern')
-    )
-
-    # Sunday updates (1 PM - 12 AM ET)
-    scheduler.add_job(
-        update_games,
-        CronTrigger(day_of_week='sun', hour='13-23', minute='*/2', timezone='US/Eastern')
-    )
-
-    # Monday Night Football updates (8 PM - 12 AM ET)
-    scheduler.add_job(
-        update_games,
-        CronTrigger(day_of_week='mon', hour='20-23', minute='*/2', timezone='US/Eastern')
-    )
-
-    # Daily update at 4 AM ET to get final scores and new odds
-    scheduler.add_job(
-        update_games,
-        CronTrigger(hour=4, timezone='US/Eastern')
-    )
+                error = str(e)
+                logger.error(f"Error updating game data: {error}")
+                db.session.rollback()
+            try:
+                delay, reason = PollPlanner.next_delay()
+            except Exception as e:
+                logger.error(f"Error planning next game poll: {str(e)}")
+            finally:
+                db.session.remove()
+        finished = datetime.now(timezone.utc)
+        with app.app_context():
+            try:
+                ingest = GameService.update_stats_since(started.astimezone(timezone.utc).replace(tzinfo=None))
+                PollPlanner.record(planned, started, finished, delay, reason, error, ingest)
+                publish_updater_stats()
+            except Exception as e:
+                logger.error(f"Error recording game poll stats: {str(e)}")
+            finally:
+                db.session.remove()
+        next_run = finished + timedelta(seconds=delay)
+        logger.info("Next game poll in %ss (%s)", int(delay), reason, extra={'fields': {'delay_s': int(delay), 'reason': reason}})
+        scheduler.add_job(poll_games, 'date', run_date=next_run, kwargs={'planned': next_run},
+                          misfire_grace_time=None)
+
+    def sync_log_settings():
+        # Polls can be hours apart; pick up /admin/log-levels changes on their own timer
+        with app.app_context():
+            try:
+                LogSettings.apply(force=True)
+            finally:
+                db.session.remove()
+
+    sync_log_settings()
+    scheduler.add_job(sync_log_settings, 'interval', seconds=app.config.get('LOG_SETTINGS_TTL', 30))
+
+    def prune_games():
+        # No VACUUM here: it holds the write lock for the whole rewrite (use `flask prune-game-cache`)
+        with app.app_context():
+            try:
+                GameService.prune_game_payloads()
+            except Exception as e:
+                logger.error(f"Error pruning game payloads: {str(e)}")
+                db.session.rollback()
+            finally:
+                db.session.remove()
+
+    prune_hours = app.config.get('PRUNE_INTERVAL_HOURS', 24)
+    if prune_hours > 0:
+        scheduler.add_job(prune_games, 'interval', hours=prune_hours)
 
+    first_run = datetime.now(timezone.utc) + timedelta(seconds=5)
+    scheduler.add_job(poll_games, 'date', run_date=first_run, kwargs={'planned': first_run},
+                      misfire_grace_time=None)
     scheduler.start()
     return scheduler
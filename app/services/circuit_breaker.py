@@ -0,0 +1,103 @@
+from datetime import datetime
+from typing import Callable, Dict, Optional
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker for an unreliable upstream service.
+
+    After `failure_threshold` consecutive failures the breaker opens and
+    allow_request() returns False, so callers answer immediately from their
+    fallback instead of waiting on dead sockets. While open, a single
+    background thread calls `probe` every `probe_interval` seconds; the
+    first successful probe closes the breaker again.
+
+    Thresholds are read through `settings` on every call so they follow the
+    app config.
+    """
+    CLOSED = 'closed'
+    OPEN = 'open'
+
+    def __init__(self, name: str, probe: Callable[[], bool], settings: Callable[[], Dict]):
+        self.name = name
+        self.probe = probe
+        self.settings = settings
+        self._lock = threading.Lock()
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at: Optional[datetime] = None
+        self._last_failure: Optional[str] = None
+        self._prober: Optional[threading.Thread] = None
+        self._short_circuited = 0
+
+    @property
+    def state(self) -> str:
+        return self._state
+
+    def allow_request(self) -> bool:
+        """Return True if callers should try the upstream service."""
+        if self._state == self.CLOSED:
+            return True
+        with self._lock:
+            self._short_circuited += 1
+        return False
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            if self._state != self.CLOSED:
+                logger.info(f"Circuit '{self.name}' closed")
+            self._state = self.CLOSED
+            self._opened_at = None
+
+    def record_failure(self, error: Optional[str] = None):
+        with self._lock:
+            self._failures += 1
+            self._last_failure = error
+            if self._state == self.OPEN or self._failures < self.settings()['failure_threshold']:
+                return
+            self._state = self.OPEN
+            self._opened_at = datetime.utcnow()
+            logger.warning(f"Circuit '{self.name}' opened after {self._failures} failures: {error}")
+            self._start_prober(self.settings()['probe_interval'])
+
+    def _start_prober(self, interval: float):
+        # Called with the lock held
+        if self._prober is not None and self._prober.is_alive():
+            return
+        self._prober = threading.Thread(
+            target=self._probe_loop,
+            args=(interval,),
+            name=f'{self.name}-circuit-probe',
+            daemon=True
+        )
+        self._prober.start()
+
+    def _probe_loop(self, interval: float):
+        while self._state == self.OPEN:
+            time.sleep(interval)
+            try:
+                healthy = self.probe()
+            except Exception as e:
+                logger.info(f"Circuit '{self.name}' probe failed: {str(e)}")
+                healthy = False
+            if healthy:
+                self.record_success()
+                return
+            logger.info(f"Circuit '{self.name}' still open")
+
+    def snapshot(self) -> Dict:
+        """Current breaker state for diagnostics."""
+        return {
+            'name': self.name,
+            'state': self._state,
+            'consecutive_failures': self._failures,
+            'opened_at': self._opened_at.isoformat() if self._opened_at else None,
+            'last_failure': self._last_failure,
+            'short_circuited': self._short_circuited,
+        }
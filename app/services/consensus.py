@@ -0,0 +1,118 @@
+from collections import defaultdict
+from datetime import datetime
+from typing import Iterable, List, Optional
+import logging
+
+from sqlalchemy import func
+
+from app.data.nfl_teams import resolve_team
+from app.extensions import db
+from app.models.game import GameCache, GameStatus
+from app.models.pick import Pick
+from app.models.stats import GameConsensus
+from app.services.game_events import GameEvents
+
+logger = logging.getLogger(__name__)
+
+
+def _side_key(name: Optional[str], abbrev: Optional[str]) -> Optional[str]:
+    """Canonical key for one side of a game, as GameRecord computes it"""
+    return resolve_team(abbrev) or resolve_team(name) or abbrev
+
+
+class Consensus:
+    """
+    Maintains the per-game league pick distribution (game_consensus).
+
+    Pick submission refreshes the rows of the submitted games; the kickoff
+    event refreshes a game one last time and freezes it, so the consensus
+    shown for a game (and the upsets judged against it) is the one at
+    kickoff. Refreshes never touch frozen rows.
+    """
+
+    @staticmethod
+    def refresh(game_ids: Iterable[str], freeze: bool = False) -> int:
+        """Recount picks for unfrozen games (freezing them with `freeze`). Returns rows written (not committed)."""
+        game_ids = set(game_ids)
+        if not game_ids:
+            return 0
+        existing = {row.game_id: row for row in GameConsensus.query.filter(GameConsensus.game_id.in_(game_ids))}
+        games = db.session.query(
+            GameCache.game_id, GameCache.week, GameCache.home_team, GameCache.away_team,
+            GameCache.home_team_abbrev, GameCache.away_team_abbrev
+        ).filter(GameCache.game_id.in_(game_ids)).all()
+        games = [game for game in games
+                 if game.game_id not in existing or existing[game.game_id].frozen_at is None]
+        if not games:
+            return 0
+
+        counts = defaultdict(dict)
+        rows = db.session.query(Pick.game_id, Pick.team_picked, func.count(Pick.id)) \
+            .filter(Pick.game_id.in_([game.game_id for game in games])) \
+            .group_by(Pick.game_id, Pick.team_picked).all()
+        for game_id, team_picked, count in rows:
+            team = resolve_team(team_picked) or team_picked.strip().upper()
+            counts[game_id][team] = counts[game_id].get(team, 0) + count
+
+        now = datetime.utcnow()
+        for game in games:
+            home = _side_key(game.home_team, game.home_team_abbrev)
+            away = _side_key(game.away_team, game.away_team_abbrev)
+            team_counts = counts.get(game.game_id, {})
+            home_picks, away_picks = team_counts.get(home, 0), team_counts.get(away, 0)
+            total = sum(team_counts.values())
+
+            row = existing.get(game.game_id)
+            if row is None:
+                row = GameConsensus(game_id=game.game_id)
+                db.session.add(row)
+            row.week = game.week
+            row.home_team, row.away_team = home, away
+            row.home_picks, row.away_picks, row.total_picks = home_picks, away_picks, total
+            if home_picks == away_picks:
+                row.majority_team, row.majority_pct = None, None
+            else:
+                row.majority_team = home if home_picks > away_picks else away
+                row.majority_pct = max(home_picks, away_picks) / total * 100
+            if freeze:
+                row.frozen_at = now
+        db.session.flush()
+        return len(games)
+
+    @staticmethod
+    def rebuild(missing_only: bool = True, batch_size: int = 500) -> int:
+        """
+        Build consensus rows for every cached game (only games without one
+        by default), freezing games that have already kicked off. Commits
+        per batch. Returns rows written.
+        """
+        query = db.session.query(GameCache.game_id, GameCache.state, GameCache.status)
+        if missing_only:
+            query = query.outerjoin(GameConsensus, GameConsensus.game_id == GameCache.game_id) \
+                .filter(GameConsensus.id.is_(None))
+        else:
+            # A full rebuild recounts frozen games too
+            GameConsensus.query.update({GameConsensus.frozen_at: None}, synchronize_session=False)
+        games = query.all()
+
+        written = 0
+        for start in range(0, len(games), batch_size):
+            batch = games[start:start + batch_size]
+            kicked_off = []
+            pending = []
+            for game_id, state, status in batch:
+                game_state = GameStatus(state) if state is not None else GameStatus.from_status(status)
+                started = game_state in (GameStatus.IN_PROGRESS, GameStatus.FINAL)
+                (kicked_off if started else pending).append(game_id)
+            written += Consensus.refresh(pending) + Consensus.refresh(kicked_off, freeze=True)
+            db.session.commit()
+        return written
+
+    @staticmethod
+    def for_week(week: int) -> List[GameConsensus]:
+        return GameConsensus.query.filter_by(week=week).order_by(GameConsensus.id).all()
+
+
+@GameEvents.subscribe(GameEvents.KICKOFF)
+def _freeze_at_kickoff(game):
+    Consensus.refresh([game.game_id], freeze=True)
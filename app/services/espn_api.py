@@ -1,105 +1,334 @@
+import hashlib
+import json
+import time
 import requests
 from datetime import datetime, timedelta
 from typing import List, Dict, Optional
 import logging
 from dateutil import tz
+from urllib.parse import urlsplit
+from flask import has_app_context
+from app.data.nfl_teams import canonical_abbrev
+from app.extensions import db
+from app.models.game import ApiSnapshot
+from app.services.circuit_breaker import CircuitBreaker
+from app.services.http_session import HttpSession, AllAttemptsFailed, setting as http_setting
+from app.services.scoreboard_archive import ScoreboardArchive
+from app.utils.log import Lazy, game_debug
+
+try:
+    import orjson
+except ImportError:  # optional, falls back to the stdlib decoder
+    orjson = None
 
 logger = logging.getLogger(__name__)
 
+# Resolved once at import instead of per event
+UTC = tz.tzutc()
+CENTRAL_TZ = tz.gettz('America/Chicago')
+
+STATUS_MAP = {
+    'STATUS_SCHEDULED': 'Scheduled',
+    'STATUS_IN_PROGRESS': 'In Progress',
+    'STATUS_HALFTIME': 'Halftime',
+    'STATUS_END_PERIOD': 'End Period',
+    'STATUS_FINAL': 'Final',
+    'STATUS_FINAL_OVERTIME': 'Final OT',
+    'STATUS_POSTPONED': 'Postponed',
+    'STATUS_CANCELED': 'Canceled',
+    'STATUS_SUSPENDED': 'Suspended',
+    'STATUS_DELAYED': 'Delayed'
+}
+FINAL_STATUSES = frozenset(['STATUS_FINAL', 'STATUS_FINAL_OVERTIME'])
+
+
+def loads(body):
+    """Decode a JSON response body, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.loads(body)
+    return json.loads(body)
+
+
 class ESPNApiService:
     BASE_URL = "https://site.api.espn.com/apis/site/v2/sports/football/nfl"
     ALT_URL = "https://site.web.api.espn.com/apis/site/v2/sports/football/nfl"
     
     @staticmethod
-    def get_current_nfl_week() -> Dict:
-        """Get the current NFL week information"""
+    def init_app(app):
+        """Point the client at the configured ESPN hosts (e.g. scripts/espn_standin.py)"""
+        ESPNApiService.BASE_URL = app.config.get('ESPN_BASE_URL') or ESPNApiService.BASE_URL
+        ESPNApiService.ALT_URL = app.config.get('ESPN_ALT_URL') or ESPNApiService.ALT_URL
+
+    @staticmethod
+    def get_season_calendar() -> List[Dict]:
+        """
+        Get the current season calendar (start/end of every week)
+
+        Returns a list of dicts with year, season_type, week, label,
+        start_date and end_date (naive UTC datetimes).
+        """
         try:
-            logger.info("Fetching current NFL week from ESPN API...")
-            params = {
-                'lang': 'en',
-                'region': 'us',
-                'calendartype': 'blacklist',
-                'limit': 100
-            }
-            
-            # Try both URLs with proper error handling
-            urls = [
-                f"{ESPNApiService.ALT_URL}/scoreboard",
-                f"{ESPNApiService.BASE_URL}/scoreboard"
-            ]
-            
-            data = None
-            last_error = None
-            
-            for url in urls:
-                try:
-                    logger.info(f"Trying URL: {url}")
-                    response = requests.get(url, params=params, timeout=5)  # shorter timeout for current week
-                    response.raise_for_status()
-                    data = response.json()
-                    if data:
-                        logger.info(f"Successfully fetched data from {url}")
-                        break
-                except requests.exceptions.Timeout:
-                    last_error = "ESPN API request timed out"
-                    logger.error(f"{last_error} for {url}")
-                    continue
-                except requests.exceptions.RequestException as e:
-                    last_error = f"ESPN API request failed: {str(e)}"
-                    logger.error(f"{last_error} for {url}")
+            logger.info("Fetching season calendar from ESPN API...")
+            params = {'lang': 'en', 'region': 'us', 'limit': 1}
+            data = ESPNApiService.fetch_scoreboard(params, timeout=5, require_events=False)['data']
+            if not data:
+                return []
+
+            league = (data.get('leagues') or [{}])[0]
+            year = league.get('season', {}).get('year') or data.get('season', {}).get('year')
+            if not year:
+                logger.warning("Season calendar response has no season year")
+                return []
+
+            weeks = []
+            for section in league.get('calendar', []):
+                # Day-based calendars are plain date strings - nothing to map
+                if not isinstance(section, dict):
                     continue
-                except ValueError as e:
-                    last_error = f"Failed to parse ESPN API response as JSON: {str(e)}"
-                    logger.error(f"{last_error} for {url}")
+                try:
+                    season_type = int(section.get('value'))
+                except (TypeError, ValueError):
                     continue
-            
-            if not data:
-                logger.error("Failed to fetch data from all URLs, using default week info")
-                return {
-                    'week': 12,  # Current week as of Nov 24, 2023
-                    'season_type': 2,  # Regular season
-                    'year': datetime.now().year
-                }
-            
-            # Check if we're in the offseason
-            calendar = data.get('leagues', [{}])[0].get('calendar', [])
-            current_season_type = data.get('season', {}).get('type', 2)
-            
-            # If we're in the offseason (no current games), default to week 1 of next season
-            if not data.get('events'):
-                logger.info("No current games found - might be offseason")
-                current_year = datetime.now().year
-                next_season_start = datetime(current_year, 9, 1)  # Approximate NFL season start
-                
-                if datetime.now() < next_season_start:
-                    year = current_year - 1  # Use previous year if before September
-                else:
-                    year = current_year
-                
+                for entry in section.get('entries', []):
+                    try:
+                        weeks.append({
+                            'year': int(year),
+                            'season_type': season_type,
+                            'week': int(entry['value']),
+                            'label': entry.get('label'),
+                            'start_date': ESPNApiService.parse_utc(entry['startDate']),
+                            'end_date': ESPNApiService.parse_utc(entry['endDate'])
+                        })
+                    except (KeyError, TypeError, ValueError) as e:
+                        logger.warning(f"Skipping calendar entry {entry}: {e}")
+                        continue
+
+            logger.info(f"Fetched {len(weeks)} calendar weeks for {year}")
+            return weeks
+
+        except Exception as e:
+            logger.error(f"Error fetching season calendar: {str(e)}")
+            return []
+
+    @staticmethod
+    def parse_utc(date_str: str) -> datetime:
+        """Parse an ESPN ISO date string to a naive UTC datetime"""
+        parsed = datetime.fromisoformat(date_str.replace('Z', '+00:00'))
+        if parsed.tzinfo is not None:
+            parsed = parsed.astimezone(tz.tzutc()).replace(tzinfo=None)
+        return parsed
+
+    @staticmethod
+    def save_snapshot(key: str, value) -> None:
+        """
+        Store the last successful result for `key` (served while ESPN is down).
+
+        Written on its own connection so it never commits the caller's
+        pending session changes.
+        """
+        if not has_app_context():
+            return
+        try:
+            table = ApiSnapshot.__table__
+            payload = json.dumps(value)
+            now = datetime.utcnow()
+            with db.engine.begin() as conn:
+                updated = conn.execute(
+                    table.update().where(table.c.key == key).values(payload=payload, fetched_at=now)
+                ).rowcount
+                if not updated:
+                    conn.execute(table.insert().values(key=key, payload=payload, fetched_at=now))
+        except Exception as e:
+            logger.error(f"Error saving ESPN snapshot {key}: {str(e)}")
+
+    @staticmethod
+    def load_snapshot(key: str):
+        """Get the last successful result stored for `key`, or None"""
+        if not has_app_context():
+            return None
+        try:
+            snapshot = ApiSnapshot.query.filter_by(key=key).first()
+            return json.loads(snapshot.payload) if snapshot else None
+        except Exception as e:
+            logger.error(f"Error loading ESPN snapshot {key}: {str(e)}")
+            return None
+
+    @staticmethod
+    def week_params(week: int, season_type: int = 2, year: Optional[int] = None) -> Dict:
+        """Scoreboard query parameters for a specific week"""
+        return {
+            'lang': 'en',
+            'region': 'us',
+            'calendartype': 'blacklist',
+            'limit': 100,
+            'seasontype': season_type,
+            'week': week,
+            'dates': year or datetime.now().year
+        }
+
+    @staticmethod
+    def validator_key(week: int, season_type: int = 2, year: Optional[int] = None) -> str:
+        """Key used to store response validators for a scoreboard query"""
+        return f"scoreboard:{year or datetime.now().year}:{season_type}:{week}"
+
+    @staticmethod
+    def fetch_scoreboard(params: Dict, timeout: float = 10, validators: Optional[Dict] = None,
+                         require_events: bool = True) -> Dict:
+        """
+        Fetch a scoreboard payload from ALT_URL / BASE_URL.
+
+        With ESPN_FETCH_MODE 'hedged' (default) the second host is started
+        ESPN_HEDGE_DELAY seconds after the first if it hasn't answered yet,
+        'race' starts both at once and 'sequential' tries them one after the
+        other. In every mode the whole fetch is bounded by ESPN_FETCH_DEADLINE.
+
+        If `validators` (etag / last_modified) are given the request is sent
+        conditionally. Returns a dict with:
+            data: decoded JSON payload (None on 304 or failure)
+            not_modified: True if the server answered 304
+            validators: etag, last_modified and body_hash of the response
+            host: host that answered (None on failure)
+            latency_ms: time taken by the logical fetch
+
+        In replay mode (SCOREBOARD_REPLAY) the payload comes from the local
+        ScoreboardArchive instead of the network.
+        """
+        if ScoreboardArchive.replay_enabled():
+            return ESPNApiService.replay_scoreboard(params, validators)
+
+        if not ESPNApiService.breaker.allow_request():
+            logger.warning("ESPN circuit open, answering without fetching scoreboard")
+            return {
+                'data': None,
+                'not_modified': False,
+                'validators': None,
+                'host': None,
+                'latency_ms': None,
+                'circuit_open': True
+            }
+
+        headers = {}
+        if validators:
+            if validators.get('etag'):
+                headers['If-None-Match'] = validators['etag']
+            if validators.get('last_modified'):
+                headers['If-Modified-Since'] = validators['last_modified']
+
+        urls = [
+            f"{ESPNApiService.ALT_URL}/scoreboard",
+            f"{ESPNApiService.BASE_URL}/scoreboard"
+        ]
+        # Responses that parsed but had no events; used if nothing better arrives
+        fallback = []
+        # Attempts run on pool threads without an app context, so resolve this here
+        archive_path = ScoreboardArchive.archive_path() if ScoreboardArchive.capture_enabled() else None
+
+        def attempt(url):
+            def run(attempt_timeout):
+                logger.debug("Trying URL: %s", url)
+                response = HttpSession.get(url, params=params, timeout=min(timeout, attempt_timeout),
+                                           headers=headers or None)
+                if response.status_code == 304:
+                    logger.info("Scoreboard not modified at %s", url)
+                    return {'data': None, 'not_modified': True, 'validators': dict(validators)}
+                response.raise_for_status()
+                if archive_path:
+                    ScoreboardArchive.capture(params, response.content, urlsplit(url).netloc, path=archive_path)
+                data = loads(response.content)
+                if not data or (require_events and not data.get('events')):
+                    fallback.append(data)
+                    raise ValueError(f"no events in response from {url}")
                 return {
-                    'week': 1,
-                    'season_type': 2,  # Regular season
-                    'year': year
+                    'data': data,
+                    'not_modified': False,
+                    'validators': {
+                        'etag': response.headers.get('ETag'),
+                        'last_modified': response.headers.get('Last-Modified'),
+                        'body_hash': hashlib.sha1(response.content).hexdigest()
+                    }
                 }
-            
-            week_info = {
-                'week': data.get('week', {}).get('number', 12),  # Default to current week if not found
-                'season_type': current_season_type,
-                'year': data.get('season', {}).get('year', datetime.now().year)
-            }
-            
-            logger.info(f"Current NFL week info: {week_info}")
-            return week_info
-            
-        except Exception as e:
-            logger.error(f"Error fetching current NFL week: {str(e)}")
-            # Default to current week if there's an error
+            return run
+
+        mode = http_setting('ESPN_FETCH_MODE')
+        deadline = http_setting('ESPN_FETCH_DEADLINE')
+        hedge_delay = 0 if mode == 'race' else http_setting('ESPN_HEDGE_DELAY')
+        if mode == 'sequential':
+            hedge_delay = deadline  # next host only starts once the previous one failed
+
+        try:
+            index, result, elapsed = HttpSession.hedged(
+                [attempt(url) for url in urls], hedge_delay=hedge_delay, deadline=deadline
+            )
+        except AllAttemptsFailed as e:
+            for error in e.errors:
+                logger.error(f"ESPN API request failed: {str(error)}")
+            HttpSession.record_fetch(None, None)
+            if fallback:
+                # ESPN answered, there just were no events (e.g. offseason)
+                ESPNApiService.breaker.record_success()
+            else:
+                ESPNApiService.breaker.record_failure(str(e))
+            logger.error("Failed to fetch data from all URLs")
             return {
-                'week': 12,  # Current week as of Nov 24, 2023
-                'season_type': 2,
-                'year': datetime.now().year
+                'data': fallback[-1] if fallback else None,
+                'not_modified': False,
+                'validators': None,
+                'host': None,
+                'latency_ms': None
             }
 
+        host = urlsplit(urls[index]).netloc
+        HttpSession.record_fetch(host, elapsed)
+        ESPNApiService.breaker.record_success()
+        result['host'] = host
+        result['latency_ms'] = round(elapsed * 1000)
+        logger.info("Successfully fetched data from %s in %sms (%s)", host, result['latency_ms'], mode,
+                    extra={'fields': {'host': host, 'latency_ms': result['latency_ms'], 'mode': mode}})
+        return result
+
+    @staticmethod
+    def replay_scoreboard(params: Dict, validators: Optional[Dict] = None) -> Dict:
+        """Serve a scoreboard fetch from the local archive (same shape as fetch_scoreboard)"""
+        start = time.monotonic()
+        result = {
+            'data': None,
+            'not_modified': False,
+            'validators': None,
+            'host': 'archive',
+            'latency_ms': None
+        }
+        body = ScoreboardArchive.replay(params)
+        if body is None:
+            return result
+
+        body_hash = hashlib.sha1(body).hexdigest()
+        result['validators'] = {'etag': None, 'last_modified': None, 'body_hash': body_hash}
+        if validators and validators.get('body_hash') == body_hash:
+            result['not_modified'] = True
+        else:
+            result['data'] = loads(body)
+        result['latency_ms'] = round((time.monotonic() - start) * 1000)
+        return result
+
+    @staticmethod
+    def parse_events(data: Dict) -> List[Dict]:
+        """Parse every event in a scoreboard payload"""
+        games = []
+        events = data.get('events', [])
+        logger.info("Found %s games", len(events))
+
+        now = datetime.now(tz=UTC)
+        for event in events:
+            try:
+                game_data = ESPNApiService.parse_event(event, now)
+                if game_data:  # Only add if we successfully parsed the game
+                    games.append(game_data)
+            except Exception as e:
+                logger.error(f"Error parsing game data for event {event.get('id', 'unknown')}: {str(e)}")
+                continue
+
+        return games
+
     @staticmethod
     def get_week_games(week: int, season_type: int = 2, year: Optional[int] = None) -> List[Dict]:
         """
@@ -114,77 +343,75 @@ class ESPNApiService:
             year = datetime.now().year
             
         try:
-            logger.info(f"Fetching games for week {week}, season_type {season_type}, year {year}")
-            params = {
-                'lang': 'en',
-                'region': 'us',
-                'calendartype': 'blacklist',
-                'limit': 100,
-                'seasontype': season_type,
-                'week': week,
-                'dates': year
-            }
-            
-            # Try both URLs with proper error handling
-            urls = [
-                f"{ESPNApiService.ALT_URL}/scoreboard",
-                f"{ESPNApiService.BASE_URL}/scoreboard"
-            ]
-            
-            data = None
-            last_error = None
-            
-            for url in urls:
-                try:
-                    logger.info(f"Trying URL: {url}")
-                    response = requests.get(url, params=params, timeout=10)
-                    response.raise_for_status()
-                    data = response.json()
-                    if data and data.get('events'):
-                        logger.info(f"Successfully fetched data from {url}")
-                        break
-                except requests.exceptions.Timeout:
-                    last_error = "ESPN API request timed out"
-                    logger.error(f"{last_error} for {url}")
-                    continue
-                except requests.exceptions.RequestException as e:
-                    last_error = f"ESPN API request failed: {str(e)}"
-                    logger.error(f"{last_error} for {url}")
-                    continue
-                except ValueError as e:
-                    last_error = f"Failed to parse ESPN API response as JSON: {str(e)}"
-                    logger.error(f"{last_error} for {url}")
-                    continue
+            logger.info("Fetching games for week %s, season_type %s, year %s", week, season_type, year)
+            params = ESPNApiService.week_params(week, season_type, year)
+            snapshot_key = f"games:{year}:{season_type}:{week}"
+            data = ESPNApiService.fetch_scoreboard(params, timeout=10)['data']
             
             if not data:
-                logger.error("Failed to fetch data from all URLs")
-                if last_error:
-                    logger.error(f"Last error: {last_error}")
+                last_good = ESPNApiService.load_snapshot(snapshot_key)
+                if last_good is not None:
+                    logger.warning(f"ESPN unavailable, using last known games for week {week}")
+                    return last_good
                 return []
             
             # Log the raw response for debugging
-            logger.info(f"Raw response data: {data}")
-            
-            games = []
-            events = data.get('events', [])
-            logger.info(f"Found {len(events)} games")
-            
-            for event in events:
-                try:
-                    game_data = ESPNApiService.parse_game_data(event)
-                    if game_data:  # Only add if we successfully parsed the game
-                        games.append(game_data)
-                        logger.info(f"Successfully parsed game: {game_data.get('game_id')} - {game_data.get('home_team', {}).get('display_name')} vs {game_data.get('away_team', {}).get('display_name')}")
-                except Exception as e:
-                    logger.error(f"Error parsing game data for event {event.get('id', 'unknown')}: {str(e)}")
-                    continue
+            logger.debug("Raw response data: %s", Lazy(json.dumps, data))
             
+            games = ESPNApiService.parse_events(data)
+            if games:
+                ESPNApiService.save_snapshot(snapshot_key, games)
             return games
             
         except Exception as e:
             logger.error(f"Error fetching week {week} games: {str(e)}")
             return []
 
+    @staticmethod
+    def get_week_games_if_changed(week: int, season_type: int = 2, year: Optional[int] = None,
+                                  validators: Optional[Dict] = None) -> Dict:
+        """
+        Conditionally fetch the games for a week.
+
+        Sends If-None-Match / If-Modified-Since from `validators` and compares
+        the body hash as a fallback for servers that ignore them. Parsing is
+        skipped entirely when the scoreboard is unchanged.
+
+        Returns a dict with:
+            changed: False on 304 or an identical body
+            games: parsed games (empty when unchanged or on failure)
+            validators: validators to store for the next request
+        """
+        if not year:
+            year = datetime.now().year
+
+        result = {'changed': True, 'games': [], 'validators': None}
+        try:
+            logger.info("Conditionally fetching games for week %s, season_type %s, year %s", week, season_type, year)
+            params = ESPNApiService.week_params(week, season_type, year)
+            fetch = ESPNApiService.fetch_scoreboard(params, timeout=10, validators=validators)
+            result['validators'] = fetch['validators']
+
+            if fetch['not_modified']:
+                result['changed'] = False
+                return result
+
+            if not fetch['data']:
+                return result
+
+            if validators and fetch['validators'] and \
+                    validators.get('body_hash') == fetch['validators']['body_hash']:
+                logger.info("Scoreboard body unchanged for week %s, skipping parse", week)
+                result['changed'] = False
+                return result
+
+            result['games'] = ESPNApiService.parse_events(fetch['data'])
+            return result
+
+        except Exception as e:
+            logger.error(f"Error fetching week {week} games: {str(e)}")
+            return result
+
     @staticmethod
     def parse_game_status(event):
         """Parse game status from ESPN API event data."""
@@ -192,36 +419,22 @@ class ESPNApiService:
         detail = event.get('status', {}).get('type', {}).get('detail', '')
         
         # Debug logging
-        logger.info(f"Raw game status from ESPN - Status: {status}, Detail: {detail}")
-        logger.info(f"Raw game event data: {event}")
-        
-        # Map ESPN status to our internal status
-        status_map = {
-            'STATUS_SCHEDULED': 'Scheduled',
-            'STATUS_IN_PROGRESS': 'In Progress',
-            'STATUS_HALFTIME': 'Halftime',
-            'STATUS_END_PERIOD': 'End Period',
-            'STATUS_FINAL': 'Final',
-            'STATUS_FINAL_OVERTIME': 'Final OT',
-            'STATUS_POSTPONED': 'Postponed',
-            'STATUS_CANCELED': 'Canceled',
-            'STATUS_SUSPENDED': 'Suspended',
-            'STATUS_DELAYED': 'Delayed'
-        }
+        game_debug(logger, event.get('id'), "Raw game status from ESPN - Status: %s, Detail: %s", status, detail)
+        game_debug(logger, event.get('id'), "Raw game event data: %s", Lazy(json.dumps, event))
         
         # Check if it's a final status from the detail field
         if detail:
             detail_lower = detail.lower()
-            logger.info(f"Checking detail field: {detail_lower}")
+            game_debug(logger, event.get('id'), "Checking detail field: %s", detail_lower)
             if 'final' in detail_lower:
                 if any(x in detail_lower for x in ['ot', 'overtime']):
-                    logger.info("Found overtime final status in detail")
+                    game_debug(logger, event.get('id'), "Found overtime final status in detail")
                     return 'Final OT'
-                logger.info("Found final status in detail")
+                game_debug(logger, event.get('id'), "Found final status in detail")
                 return 'Final'
         
-        mapped_status = status_map.get(status, status)
-        logger.info(f"Final mapped status: {mapped_status}")
+        mapped_status = STATUS_MAP.get(status, status)
+        game_debug(logger, event.get('id'), "Final mapped status: %s", mapped_status)
         return mapped_status
 
     @staticmethod
@@ -273,17 +486,7 @@ class ESPNApiService:
     @staticmethod
     def normalize_team_abbrev(abbrev):
         """Normalize team abbreviations to our standard format."""
-        if not abbrev:
-            return abbrev
-            
-        abbrev = abbrev.upper()
-        # Map ESPN abbreviations to our standard ones
-        abbrev_map = {
-            'WSH': 'WAS',  # Washington
-            'JAC': 'JAX',  # Jacksonville
-            'WAS': 'WAS'   # Ensure WAS maps to itself
-        }
-        return abbrev_map.get(abbrev, abbrev)
+        return canonical_abbrev(abbrev)
 
     @staticmethod
     def parse_game_data(event):
@@ -328,23 +531,23 @@ class ESPNApiService:
             try:
                 # Parse the date string and ensure it's timezone aware
                 date_str = event.get('date', '')
-                logger.info(f"Raw date string from ESPN: {date_str}")
+                game_debug(logger, event.get('id'), "Raw date string from ESPN: %s", date_str)
                 
                 if date_str:
                     # Add UTC timezone if not present
                     if not date_str.endswith('Z') and not '+' in date_str and not '-' in date_str:
                         date_str += 'Z'
                     game_date = datetime.fromisoformat(date_str.replace('Z', '+00:00'))
-                    logger.info(f"Parsed UTC game date: {game_date}")
+                    game_debug(logger, event.get('id'), "Parsed UTC game date: %s", game_date)
                     
                     # Convert to Central Time for MNF detection
                     local_tz = tz.gettz('America/Chicago')
                     local_date = game_date.astimezone(local_tz)
-                    logger.info(f"Local (CT) game date: {local_date}")
+                    game_debug(logger, event.get('id'), "Local (CT) game date: %s", local_date)
                 else:
                     game_date = datetime.now(tz=tz.tzutc())
                     local_date = game_date.astimezone(tz.gettz('America/Chicago'))
-                    logger.info(f"No date string found, using current time: {local_date}")
+                    game_debug(logger, event.get('id'), "No date string found, using current time: %s", local_date)
 
                 # If the game date is more than 6 months in the future, it's probably a next season game
                 # Adjust the year to the current year
@@ -352,12 +555,12 @@ class ESPNApiService:
                     current_year = datetime.now().year
                     game_date = game_date.replace(year=current_year)
                     local_date = local_date.replace(year=current_year)
-                    logger.info(f"Adjusted year to current year: {local_date}")
+                    game_debug(logger, event.get('id'), "Adjusted year to current year: %s", local_date)
             
                 is_monday = local_date.weekday() == 0  # Monday is 0
                 is_evening = local_date.hour >= 18  # After 6 PM CT
                 
-                logger.info(f"Game day checks - Is Monday: {is_monday}, Is Evening: {is_evening}")
+                game_debug(logger, event.get('id'), "Game day checks - Is Monday: %s, Is Evening: %s", is_monday, is_evening)
                 
                 # Enhanced MNF detection
                 is_mnf = False
@@ -384,24 +587,24 @@ class ESPNApiService:
                     ]
                     
                     # Log all indicators
-                    logger.info("MNF Detection Indicators:")
-                    logger.info(f"  Game Name: {event.get('name', '')}")
-                    logger.info(f"  Name Indicators: {name_indicators}")
-                    logger.info(f"  Notes: {event.get('notes', [])}")
-                    logger.info(f"  Note Indicators: {note_indicators}")
-                    logger.info(f"  Broadcasts: {competition.get('broadcasts', [])}")
-                    logger.info(f"  Broadcast Indicators: {broadcast_indicators}")
+                    game_debug(logger, event.get('id'), "MNF Detection Indicators:")
+                    game_debug(logger, event.get('id'), "  Game Name: %s", event.get('name', ''))
+                    game_debug(logger, event.get('id'), "  Name Indicators: %s", name_indicators)
+                    game_debug(logger, event.get('id'), "  Notes: %s", event.get('notes', []))
+                    game_debug(logger, event.get('id'), "  Note Indicators: %s", note_indicators)
+                    game_debug(logger, event.get('id'), "  Broadcasts: %s", competition.get('broadcasts', []))
+                    game_debug(logger, event.get('id'), "  Broadcast Indicators: %s", broadcast_indicators)
                     
                     # If it's Monday evening, it's likely MNF
                     if is_evening:
                         is_mnf = True
-                        logger.info("Setting is_mnf=True because it's a Monday evening game")
+                        game_debug(logger, event.get('id'), "Setting is_mnf=True because it's a Monday evening game")
                     # Or if we have other strong indicators
                     elif any(name_indicators) or any(note_indicators) or any(broadcast_indicators):
                         is_mnf = True
-                        logger.info("Setting is_mnf=True because of name/note/broadcast indicators")
+                        game_debug(logger, event.get('id'), "Setting is_mnf=True because of name/note/broadcast indicators")
                     
-                    logger.info(f"Final MNF Status: {is_mnf}")
+                    game_debug(logger, event.get('id'), "Final MNF Status: %s", is_mnf)
                     
             except (ValueError, TypeError) as e:
                 logger.error(f"Error parsing game date: {e}")
@@ -438,30 +641,171 @@ class ESPNApiService:
                 'game_time': local_date.strftime('%a %I:%M %p').replace(' 0', ' ')  # e.g., "Mon 7:15 PM"
             }
             
-            logger.info(f"Parsed game data: {game_data}")
+            game_debug(logger, event.get('id'), "Parsed game data: %s", game_data)
             return game_data
             
         except Exception as e:
             logger.error(f"Error parsing game data: {str(e)}")
             return {}
 
+    @staticmethod
+    def parse_event(event, now: Optional[datetime] = None) -> Dict:
+        """
+        Fast path for parse_game_data: same output, one walk over the event.
+
+        Competitors, status and dates are each read once, timezones are
+        module constants and nothing is logged per event. The MNF name,
+        note and broadcast checks only run for Monday games before 6 PM CT,
+        the one case where they decide the result. `now` (UTC) can be passed
+        in so a whole payload shares one clock reading.
+        """
+        try:
+            competition = event['competitions'][0]
+            home = away = None
+            for team in competition['competitors']:
+                side = team['homeAway']
+                if side == 'home':
+                    if home is None:
+                        home = team
+                elif side == 'away':
+                    if away is None:
+                        away = team
+            home = home or {}
+            away = away or {}
+            home_team_data = home.get('team', {})
+            away_team_data = away.get('team', {})
+
+            home_abbrev = canonical_abbrev(home_team_data.get('abbreviation', ''))
+            away_abbrev = canonical_abbrev(away_team_data.get('abbreviation', ''))
+
+            try:
+                home_score = int(home.get('score', 0))
+                away_score = int(away.get('score', 0))
+                scores_valid = True
+            except (ValueError, TypeError):
+                home_score = away_score = 0
+                scores_valid = False
+
+            status_type = event.get('status', {}).get('type', {})
+            status_name = status_type.get('name', '')
+            detail_lower = (status_type.get('detail', '') or '').lower()
+            if 'final' in detail_lower:
+                status = 'Final OT' if ('ot' in detail_lower or 'overtime' in detail_lower) else 'Final'
+            else:
+                status = STATUS_MAP.get(status_name, status_name)
+
+            winner = None
+            if (status_name in FINAL_STATUSES or 'final' in detail_lower) and scores_valid \
+                    and len(competition['competitors']) == 2 and home and away:
+                if home.get('winner'):
+                    winner = home_team_data.get('displayName')
+                elif away.get('winner'):
+                    winner = away_team_data.get('displayName')
+                elif home_score > away_score:
+                    winner = home_team_data.get('displayName')
+                elif away_score > home_score:
+                    winner = away_team_data.get('displayName')
+
+            now = now or datetime.now(tz=UTC)
+            try:
+                date_str = event.get('date', '')
+                if date_str:
+                    if not date_str.endswith('Z') and '+' not in date_str and '-' not in date_str:
+                        date_str += 'Z'
+                    game_date = datetime.fromisoformat(date_str.replace('Z', '+00:00'))
+                else:
+                    game_date = now
+                local_date = game_date.astimezone(CENTRAL_TZ)
+
+                # Dates more than 6 months out are most likely next season's
+                if (game_date - now).days > 180:
+                    current_year = datetime.now().year
+                    game_date = game_date.replace(year=current_year)
+                    local_date = local_date.replace(year=current_year)
+
+                is_mnf = False
+                if local_date.weekday() == 0:
+                    if local_date.hour >= 18:
+                        is_mnf = True
+                    else:
+                        name = event.get('name', '').lower()
+                        is_mnf = (
+                            'monday night' in name or 'mnf' in name
+                            or any('monday night' in headline or 'mnf' in headline
+                                   for headline in (note.get('headline', '').lower()
+                                                    for note in event.get('notes', [])))
+                            or any('espn' in broadcast_name or 'monday night' in broadcast_name
+                                   for broadcast_name in (broadcast.get('name', '').lower()
+                                                          for broadcast in competition.get('broadcasts', [])))
+                        )
+            except (ValueError, TypeError) as e:
+                logger.error(f"Error parsing game date: {e}")
+                game_date = datetime.now(tz=UTC)
+                local_date = game_date.astimezone(CENTRAL_TZ)
+                is_mnf = False
+
+            season = event.get('season', {})
+            venue = competition.get('venue', {})
+            address = venue.get('address', {})
+            game_data = {
+                'game_id': str(event['id']),
+                'week': event.get('week', {}).get('number', 0),
+                'season_type': season.get('type', 2),
+                'year': season['year'] if 'year' in season else datetime.now().year,
+                'date': game_date.isoformat(),
+                'status': status,
+                'winning_team': winner,
+                'home_team': {
+                    'id': str(home_team_data.get('id', '')),
+                    'display_name': home_team_data.get('displayName', ''),
+                    'abbreviation': home_abbrev,
+                    'score': home_score
+                },
+                'away_team': {
+                    'id': str(away_team_data.get('id', '')),
+                    'display_name': away_team_data.get('displayName', ''),
+                    'abbreviation': away_abbrev,
+                    'score': away_score
+                },
+                'venue': {
+                    'name': venue.get('fullName', ''),
+                    'city': address.get('city', ''),
+                    'state': address.get('state', '')
+                },
+                'is_mnf': is_mnf,
+                'game_time': local_date.strftime('%a %I:%M %p').replace(' 0', ' ')
+            }
+            game_debug(logger, game_data['game_id'], "Parsed game data: %s", game_data)
+            return game_data
+
+        except Exception as e:
+            logger.error(f"Error parsing game data for event {event.get('id', 'unknown')}: {str(e)}")
+            return {}
+
     @staticmethod
     def get_team_schedule(team_id: str, season_type: int = 2, year: Optional[int] = None) -> List[Dict]:
         """Get the full schedule for a specific team"""
         if not year:
             year = datetime.now().year
             
+        if not ESPNApiService.breaker.allow_request():
+            logger.warning(f"ESPN circuit open, not fetching schedule for team {team_id}")
+            return []
+            
         try:
             try:
-                response = requests.get(f"{ESPNApiService.BASE_URL}/teams/{team_id}/schedule", 
-                                     timeout=10)  # 10 second timeout
+                response = HttpSession.get(f"{ESPNApiService.BASE_URL}/teams/{team_id}/schedule",
+                                           timeout=10)  # 10 second timeout
                 response.raise_for_status()  # Raise an error for bad status codes
                 data = response.json()
+                ESPNApiService.breaker.record_success()
             except requests.exceptions.Timeout:
                 logger.error("ESPN API request timed out")
+                ESPNApiService.breaker.record_failure("ESPN API request timed out")
                 return []
             except requests.exceptions.RequestException as e:
                 logger.error(f"ESPN API request failed: {str(e)}")
+                ESPNApiService.breaker.record_failure(str(e))
                 return []
             except ValueError as e:
                 logger.error(f"Failed to parse ESPN API response as JSON: {str(e)}")
@@ -495,3 +839,19 @@ class ESPNApiService:
                 return game
         
         return None
+
+
+def _probe_espn() -> bool:
+    """Lightweight health check used while the ESPN circuit is open"""
+    response = HttpSession.get(f"{ESPNApiService.BASE_URL}/scoreboard", params={'limit': 1}, timeout=5)
+    return response.ok
+
+
+ESPNApiService.breaker = CircuitBreaker(
+    'espn',
+    probe=_probe_espn,
+    settings=lambda: {
+        'failure_threshold': http_setting('ESPN_BREAKER_THRESHOLD'),
+        'probe_interval': http_setting('ESPN_BREAKER_PROBE_INTERVAL'),
+    }
+)
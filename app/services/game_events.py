@@ -0,0 +1,59 @@
+from collections import defaultdict, deque
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+import logging
+
+from app.models.game import GameStatus
+
+logger = logging.getLogger(__name__)
+
+
+class GameEvents:
+    """
+    In-process events for game state transitions.
+
+    Ingest compares each game's stored state with its new one and emits
+    every transition exactly once, inside the ingest transaction and
+    after the rows are written. Handlers get the GameCache row and must
+    not commit; if one raises, the whole ingest rolls back.
+    """
+    KICKOFF = 'kickoff'
+    FINAL = 'final'
+    POSTPONED = 'postponed'
+    CANCELED = 'canceled'
+    SCORE_CORRECTED = 'score_corrected'
+
+    _handlers: Dict[str, List[Callable]] = defaultdict(list)
+    # Recently emitted events, newest last, for the admin ingest stats
+    recent = deque(maxlen=100)
+
+    @staticmethod
+    def subscribe(*events: str):
+        """Decorator registering a handler for one or more events (registering twice is a no-op)"""
+        def register(handler):
+            for event in events:
+                if handler not in GameEvents._handlers[event]:
+                    GameEvents._handlers[event].append(handler)
+            return handler
+        return register
+
+    @staticmethod
+    def emit(event: str, game) -> None:
+        logger.info(f"Game {game.game_id} {event} ({game.away_team} {game.away_score} @ "
+                    f"{game.home_team} {game.home_score})")
+        GameEvents.recent.append({'at': datetime.utcnow().isoformat(), 'event': event, 'game_id': game.game_id})
+        for handler in GameEvents._handlers[event]:
+            handler(game)
+
+    @staticmethod
+    def transitions(old: Optional[GameStatus], new: GameStatus, scores_changed: bool = False) -> List[str]:
+        """Events for a game moving from state `old` (None for a new game) to `new`"""
+        old = GameStatus.SCHEDULED if old is None else old
+        events = []
+        if old == GameStatus.SCHEDULED and new in (GameStatus.IN_PROGRESS, GameStatus.FINAL):
+            events.append(GameEvents.KICKOFF)
+        if new != old and new.is_over:
+            events.append(new.name.lower())
+        elif new == old == GameStatus.FINAL and scores_changed:
+            events.append(GameEvents.SCORE_CORRECTED)
+        return events
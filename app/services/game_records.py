@@ -0,0 +1,127 @@
+from datetime import datetime
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional
+
+from app.data.nfl_teams import resolve_team
+from app.extensions import db
+from app.models.game import GameCache, GameStatus
+from app.services.espn_api import CENTRAL_TZ, UTC
+
+# Columns a GameRecord is built from; the data payload is never loaded
+RECORD_COLUMNS = (
+    GameCache.game_id, GameCache.week, GameCache.season_type, GameCache.year,
+    GameCache.home_team, GameCache.away_team, GameCache.home_team_abbrev, GameCache.away_team_abbrev,
+    GameCache.home_score, GameCache.away_score, GameCache.status, GameCache.state, GameCache.start_time,
+    GameCache.is_mnf
+)
+
+
+@lru_cache(maxsize=1024)
+def _local_kickoff(start_time: datetime):
+    """(Central kickoff, display time like 'Sun 12:00 PM') for a naive UTC kickoff"""
+    local = start_time.replace(tzinfo=UTC).astimezone(CENTRAL_TZ)
+    return local, local.strftime('%a %I:%M %p').replace(' 0', ' ')
+
+
+class GameRecord:
+    """
+    Read-only view of a cached game for templates and standings.
+
+    `home` and `away` are canonical team keys (see resolve_team), falling
+    back to the stored abbreviation for teams outside the alias index.
+    """
+    __slots__ = (
+        'game_id', 'week', 'season_type', 'year',
+        'home', 'away', 'home_team', 'away_team', 'home_score', 'away_score',
+        'status', 'status_text', 'kickoff', 'kickoff_local', 'game_time', 'is_mnf'
+    )
+
+    def __init__(self, row, now: Optional[datetime] = None):
+        set_field = object.__setattr__
+        set_field(self, 'game_id', row.game_id)
+        set_field(self, 'week', row.week)
+        set_field(self, 'season_type', row.season_type)
+        set_field(self, 'year', row.year)
+        set_field(self, 'home', resolve_team(row.home_team_abbrev) or resolve_team(row.home_team) or row.home_team_abbrev)
+        set_field(self, 'away', resolve_team(row.away_team_abbrev) or resolve_team(row.away_team) or row.away_team_abbrev)
+        set_field(self, 'home_team', row.home_team)
+        set_field(self, 'away_team', row.away_team)
+        set_field(self, 'home_score', row.home_score)
+        set_field(self, 'away_score', row.away_score)
+        if row.state is not None:
+            set_field(self, 'status', GameStatus(row.state))
+        else:
+            # Rows stored before states existed (see GameCache.game_status)
+            set_field(self, 'status', GameStatus.classify(row.status, row.start_time, row.home_score, row.away_score, now))
+        set_field(self, 'status_text', row.status)
+        set_field(self, 'kickoff', row.start_time)
+        local, game_time = _local_kickoff(row.start_time) if row.start_time else (None, None)
+        set_field(self, 'kickoff_local', local)
+        set_field(self, 'game_time', game_time)
+        set_field(self, 'is_mnf', bool(row.is_mnf))
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is read-only")
+
+    __delattr__ = __setattr__
+
+    @property
+    def is_final(self) -> bool:
+        return self.status.is_over
+
+    @property
+    def total_points(self) -> Optional[int]:
+        if self.home_score is None or self.away_score is None:
+            return None
+        return self.home_score + self.away_score
+
+    @property
+    def winner(self) -> Optional[str]:
+        """Canonical key of the winning team, once final (None for ties)"""
+        if not self.is_final or self.home_score is None or self.away_score is None:
+            return None
+        if self.home_score > self.away_score:
+            return self.home
+        if self.away_score > self.home_score:
+            return self.away
+        return None
+
+    def team_key(self, team: Optional[str]) -> Optional[str]:
+        """Which side of this game a pick names: the home or away key, or None"""
+        resolved = resolve_team(team)
+        if resolved is None and team:
+            resolved = team.strip().upper()
+        if resolved in (self.home, self.away):
+            return resolved
+        return None
+
+    def __repr__(self):
+        return f'<GameRecord {self.game_id} Week:{self.week} {self.away}@{self.home} {self.status.name}>'
+
+
+class GameRecords:
+    """Query service for GameRecords, built from column projections only"""
+
+    @staticmethod
+    def _query(*criteria):
+        now = datetime.utcnow()
+        rows = db.session.query(*RECORD_COLUMNS).filter(*criteria) \
+            .order_by(GameCache.start_time, GameCache.id).all()
+        return [GameRecord(row, now) for row in rows]
+
+    @staticmethod
+    def for_week(week: int, season_type: Optional[int] = None, year: Optional[int] = None) -> List[GameRecord]:
+        """Games of a week, in kickoff order (every season on record unless season_type/year are given)"""
+        criteria = [GameCache.week == week]
+        if season_type is not None:
+            criteria.append(GameCache.season_type == season_type)
+        if year is not None:
+            criteria.append(GameCache.year == year)
+        return GameRecords._query(*criteria)
+
+    @staticmethod
+    def by_game_ids(game_ids: Iterable[str]) -> Dict[str, GameRecord]:
+        game_ids = list(set(game_ids))
+        if not game_ids:
+            return {}
+        return {record.game_id: record for record in GameRecords._query(GameCache.game_id.in_(game_ids))}
@@ -1,102 +1,110 @@
+from collections import deque
 from datetime import datetime
 from typing import List, Dict, Optional
-from app.models.game import GameCache
+from sqlalchemy import exists, insert, or_, update
+from app.data.nfl_teams import same_team
+from app.models.game import GameCache, GameStatus, ScoreboardValidator, PAYLOAD_COLUMNS
 from app.models.pick import Pick
 from app.extensions import db
-from app.services.espn_api import ESPNApiService
+from app.services.consensus import Consensus
+from app.services.espn_api import ESPNApiService, CENTRAL_TZ, UTC
+from app.services.game_events import GameEvents
+from app.services.mnf_scoring import MNFScoring
+from app.services.payload_cache import PayloadCache
+from app.services.render_cache import RenderCache
+from app.services.pick_grader import PickGrader
+from app.services.week_resolver import WeekResolver
+from app.utils.log import game_debug
 import logging
 import json
-from datetime import timezone
+import time
+import zlib
 
 logger = logging.getLogger(__name__)
 
 class GameService:
+    # Counts from the most recent cache update (see record_update_stats)
+    last_update_stats: Dict = {}
+    # Write-lock hold time of recent cache updates, in ms
+    write_lock_ms = deque(maxlen=200)
+    # Decoded GameCache.data keyed by (game_id, updated_at)
+    payload_cache = PayloadCache()
+
     @staticmethod
-    def normalize_team_name(team_name):
-        """
-        Normalize team names to handle different formats including abbreviations.
-        E.g., 'PHI', 'Philadelphia', and 'Philadelphia Eagles' should all match.
-        """
-        if not team_name:
-            return ''
-            
-        # Team abbreviation mapping
-        abbrev_map = {
-            'ARI': 'Arizona Cardinals',
-            'ATL': 'Atlanta Falcons',
-            'BAL': 'Baltimore Ravens',
-            'BUF': 'Buffalo Bills',
-            'CAR': 'Carolina Panthers',
-            'CHI': 'Chicago Bears',
-            'CIN': 'Cincinnati Bengals',
-            'CLE': 'Cleveland Browns',
-            'DAL': 'Dallas Cowboys',
-            'DEN': 'Denver Broncos',
-            'DET': 'Detroit Lions',
-            'GB': 'Green Bay Packers',
-            'HOU': 'Houston Texans',
-            'IND': 'Indianapolis Colts',
-            'JAX': 'Jacksonville Jaguars',
-            'KC': 'Kansas City Chiefs',
-            'LAC': 'Los Angeles Chargers',
-            'LAR': 'Los Angeles Rams',
-            'LV': 'Las Vegas Raiders',
-            'MIA': 'Miami Dolphins',
-            'MIN': 'Minnesota Vikings',
-            'NE': 'New England Patriots',
-            'NO': 'New Orleans Saints',
-            'NYG': 'New York Giants',
-            'NYJ': 'New York Jets',
-            'PHI': 'Philadelphia Eagles',
-            'PIT': 'Pittsburgh Steelers',
-            'SEA': 'Seattle Seahawks',
-            'SF': 'San Francisco 49ers',
-            'TB': 'Tampa Bay Buccaneers',
-            'TEN': 'Tennessee Titans',
-            'WAS': 'Washington Commanders',
-            'WSH': 'Washington Commanders'
+    def init_app(app):
+        GameService.payload_cache.resize(app.config.get('GAME_PAYLOAD_CACHE_SIZE', 512))
+
+    @staticmethod
+    def game_fingerprint(game_data: Dict, status: str) -> str:
+        """Fingerprint of a parsed ESPN game, comparable with GameCache.fingerprint"""
+        return GameCache.make_fingerprint(
+            status,
+            game_data['home_team'].get('score', 0),
+            game_data['away_team'].get('score', 0),
+            game_data.get('winning_team'),
+            game_data.get('date'),
+            game_data.get('is_mnf', False)
+        )
+
+    @staticmethod
+    def record_update_stats(week, received, created, updated, skipped, write_lock_ms=None, events=0) -> Dict:
+        GameService.last_update_stats = {
+            'week': week,
+            'received': received,
+            'created': created,
+            'updated': updated,
+            'skipped': skipped,
+            'events': events,
+            'write_lock_ms': round(write_lock_ms, 1) if write_lock_ms is not None else None,
+            'at': datetime.utcnow().isoformat()
+        }
+        if write_lock_ms is not None:
+            GameService.write_lock_ms.append(write_lock_ms)
+        logger.info("Game cache update for week %s: %s created, %s updated, %s unchanged and skipped, %s state events",
+                    week, created, updated, skipped, events,
+                    extra={'fields': {'write_lock_ms': round(write_lock_ms, 1)} if write_lock_ms is not None else {}})
+        return GameService.last_update_stats
+
+    @staticmethod
+    def update_stats_since(since: datetime) -> Dict:
+        """last_update_stats if that update happened at or after `since` (naive UTC), else {}"""
+        stats = GameService.last_update_stats
+        if stats.get('at') and datetime.fromisoformat(stats['at']) >= since:
+            return dict(stats)
+        return {}
+
+    @staticmethod
+    def ingest_stats() -> Dict:
+        """Last update counts plus write-lock percentiles over recent polls"""
+        held = sorted(GameService.write_lock_ms)
+        return {
+            'last_update': GameService.last_update_stats,
+            'polls': len(held),
+            'write_lock_ms_p50': round(held[len(held) // 2], 1) if held else None,
+            'write_lock_ms_p95': round(held[int(len(held) * 0.95)], 1) if held else None,
+            'write_lock_ms_max': round(held[-1], 1) if held else None,
+            'payload_cache': GameService.payload_cache.stats(),
+            'recent_events': list(GameEvents.recent)[-20:]
         }
-        
-        name = team_name.strip().upper()
-        
-        # Check if it's an abbreviation
-        if name in abbrev_map:
-            return abbrev_map[name].lower()
-            
-        # If not an abbreviation, normalize the full name
-        name = team_name.strip()
-        
-        # Handle Washington variations
-        if 'washington' in name.lower() or 'commanders' in name.lower() or name.upper() in ['WAS', 'WSH']:
-            return 'washington commanders'
-            
-        # Remove common words that might differ
-        name = name.replace('Football Team', '').replace('Commanders', '').strip()
-        
-        # Remove city names
-        city_prefixes = [
-            'New York', 'Los Angeles', 'Las Vegas', 'San Francisco', 'Green Bay',
-            'New England', 'Tampa Bay', 'Kansas City'
-        ]
-        for prefix in city_prefixes:
-            if name.startswith(prefix):
-                name = name[len(prefix):].strip()
-                break
-                
-        return name.lower()
 
     @staticmethod
     def teams_match(team1, team2):
-        """Check if two team names refer to the same team."""
-        norm1 = GameService.normalize_team_name(team1)
-        norm2 = GameService.normalize_team_name(team2)
+        """Check if two team names refer to the same team (see app.data.nfl_teams.resolve_team)."""
+        return same_team(team1, team2)
+
+    @staticmethod
+    def resolve_game_status(game_data: Dict) -> str:
+        """
+        Get our internal status for a game dict.
         
-        # Direct match after normalization
-        if norm1 == norm2:
-            return True
-            
-        # Check if one is contained within the other
-        return norm1 in norm2 or norm2 in norm1
+        Parsed games already carry the mapped status string; raw ESPN events
+        carry the nested status object, mapped by ESPNApiService.parse_game_status.
+        """
+        status = game_data.get('status', '')
+        if isinstance(status, str):
+            return status
+        
+        return ESPNApiService.parse_game_status({'status': status})
 
     @staticmethod
     def determine_pick_correctness(pick, game: GameCache):
@@ -112,122 +120,131 @@ class GameService:
             return None
             
         picked_team = pick.team_picked
-        logger.info(f"Checking pick {pick.id}: picked '{picked_team}' vs home '{game.home_team}' or away '{game.away_team}'")
+        game_debug(logger, game.game_id, "Checking pick %s: picked '%s' vs home '%s' or away '%s'", pick.id, picked_team, game.home_team, game.away_team)
         
         # If they picked home team
         if GameService.teams_match(picked_team, game.home_team):
-            logger.info(f"Matched home team {game.home_team}")
+            game_debug(logger, game.game_id, "Matched home team %s", game.home_team)
             return game.home_score > game.away_score
             
         # If they picked away team
         if GameService.teams_match(picked_team, game.away_team):
-            logger.info(f"Matched away team {game.away_team}")
+            game_debug(logger, game.game_id, "Matched away team %s", game.away_team)
             return game.away_score > game.home_score
             
         logger.error(f"Pick {pick.id} has team '{picked_team}' that doesn't match home '{game.home_team}' or away '{game.away_team}'")
         return None
 
     @staticmethod
-    def update_pick_results(game: GameCache):
-        """Update pick results for a game that has finished."""
+    def update_pick_results(game: GameCache, commit: bool = True) -> int:
+        """
+        Update pick results for a game that has finished.
+
+        Grades all picks for the game with one UPDATE (see PickGrader) and
+        returns the number of picks changed. With commit=False the changes
+        are left in the caller's transaction.
+        """
         if not game.is_final():
-            logger.info(f"Skipping pick updates for game {game.game_id} - not final (status: {game.status})")
-            return
-            
-        if game.home_score is None or game.away_score is None:
-            logger.warning(f"Skipping pick updates for game {game.game_id} - missing scores")
-            return
-            
-        # Get all picks for this game
-        picks = Pick.query.filter_by(game_id=game.game_id).all()
-        logger.info(f"Updating {len(picks)} picks for game {game.game_id}")
-        logger.info(f"Final score: {game.home_team} {game.home_score} - {game.away_team} {game.away_score}")
-        
-        updates_made = False
-        for pick in picks:
-            old_value = pick.is_correct
-            pick.is_correct = GameService.determine_pick_correctness(pick, game)
-            
-            if old_value != pick.is_correct:
-                updates_made = True
-                logger.info(f"Updated pick {pick.id} for user {pick.user_id}: picked {pick.team_picked}, " +
-                          f"score: {game.home_team}({game.home_score})-{game.away_team}({game.away_score}), " +
-                          f"correct: {pick.is_correct}")
-        
-        if updates_made:
+            game_debug(logger, game.game_id, "Skipping pick updates for game %s - not final (status: %s)", game.game_id, game.status)
+            return 0
+
+        changed = PickGrader.grade_game(game)
+        if changed and commit:
             try:
                 db.session.commit()
-                logger.info(f"Successfully updated pick results for game {game.game_id}")
             except Exception as e:
                 db.session.rollback()
                 logger.error(f"Error updating pick results: {str(e)}")
                 raise
-        else:
-            logger.info(f"No pick updates needed for game {game.game_id}")
+        elif not changed:
+            game_debug(logger, game.game_id, "No pick updates needed for game %s", game.game_id)
+        return changed
 
     @staticmethod
     def update_all_pick_results():
         """
-        Force update all pick results for finished games
+        Grade picks for every game that became final, whose final score
+        changed, or whose picks were edited since it was last graded. Other
+        games already graded against their current score are skipped (see
+        regrade_all_picks for a full regrade).
         """
         try:
-            # Get all games that might be final
-            all_games = GameCache.query.all()
-            
-            # Debug log all games
-            for game in all_games:
-                logger.info(f"Game {game.game_id}: status={game.status}, " +
-                          f"score={game.home_team}({game.home_score})-{game.away_team}({game.away_score})")
-            
-            finished_games = [game for game in all_games if game.is_final()]
-            logger.info(f"Found {len(finished_games)} finished games to update picks for")
-            
-            updates_made = 0
-            # Process each finished game
-            for game in finished_games:
-                if game.home_score is None or game.away_score is None:
-                    logger.warning(f"Skipping game {game.game_id} - missing scores")
-                    continue
-                    
-                logger.info(f"Processing finished game {game.game_id}")
-                logger.info(f"Final score: {game.home_team} {game.home_score} - {game.away_team} {game.away_score}")
-                
-                # Get all picks for this game
-                picks = Pick.query.filter_by(game_id=game.game_id).all()
-                logger.info(f"Found {len(picks)} picks for game {game.game_id}")
-                
-                for pick in picks:
-                    old_value = pick.is_correct
-                    pick.is_correct = GameService.determine_pick_correctness(pick, game)
-                    
-                    if old_value != pick.is_correct:
-                        updates_made += 1
-                        logger.info(f"Updated pick {pick.id} for user {pick.user_id}: " +
-                                  f"picked {pick.team_picked}, " +
-                                  f"score: {game.home_team}({game.home_score})-{game.away_team}({game.away_score}), " +
-                                  f"correct: {pick.is_correct}")
-            
-            if updates_made > 0:
+            picks_edited = exists().where(Pick.game_id == GameCache.game_id,
+                                          Pick.updated_at > GameCache.graded_at)
+            # Only games that are over; rows never ingested with a state are classified in Python
+            over_states = [int(status) for status in GameStatus if status.is_over]
+            candidates = GameCache.query.filter(
+                or_(GameCache.state.in_(over_states), GameCache.state.is_(None)),
+                or_(
+                    GameCache.graded_at.is_(None),
+                    GameCache.graded_home_score.is_distinct_from(GameCache.home_score),
+                    GameCache.graded_away_score.is_distinct_from(GameCache.away_score),
+                    picks_edited
+                )
+            ).all()
+            to_grade = [game for game in candidates if game.state is not None or game.is_final()]
+            logger.info("Found %s newly final, corrected or edited games to grade", len(to_grade))
+
+            updates_made = PickGrader.grade_games(to_grade)
+
+            if to_grade:
                 db.session.commit()
-                logger.info(f"Successfully updated {updates_made} pick results")
+            if updates_made > 0:
+                logger.info("Successfully updated %s pick results", updates_made)
             else:
                 logger.info("No pick updates needed")
-                
+
             return updates_made
-            
+
         except Exception as e:
             db.session.rollback()
             logger.error(f"Error updating pick results: {str(e)}")
             raise
 
     @staticmethod
-    def update_week_games(week: Optional[int] = None, force: bool = False) -> List[Dict]:
+    def regrade_all_picks(batch_size: int = 100, progress=None) -> int:
+        """
+        Regrade picks for every final game, ignoring the graded watermark.
+
+        Games are walked in id order `batch_size` at a time and each batch is
+        committed on its own, so the write lock is only held briefly.
+        `progress(games_done, games_total, picks_changed)` is called after
+        each batch. Returns the total number of picks changed.
+        """
+        total = GameCache.query.count()
+        done = changed = 0
+        last_id = 0
+        while True:
+            batch = GameCache.query.filter(GameCache.id > last_id) \
+                .order_by(GameCache.id).limit(batch_size).all()
+            if not batch:
+                break
+            try:
+                changed += PickGrader.grade_games(game for game in batch if game.is_final())
+                db.session.commit()
+            except Exception as e:
+                db.session.rollback()
+                logger.error(f"Error regrading picks: {str(e)}")
+                raise
+            last_id = batch[-1].id
+            done += len(batch)
+            if progress:
+                progress(done, total, changed)
+
+        logger.info(f"Full regrade of {done} games changed {changed} pick results")
+        return changed
+
+    @staticmethod
+    def update_week_games(week: Optional[int] = None, force: bool = False,
+                          season_type: Optional[int] = None, year: Optional[int] = None) -> List[Dict]:
         """
         Update the game cache for a specific week or current week
         
         Args:
             week: Week number to update. If None, uses current week
             force: If True, forces update even if cache exists
+            season_type: Season type for an explicit week (defaults to regular season)
+            year: Season year for an explicit week (defaults to the current year)
         """
         try:
             # Validate week number
@@ -237,155 +254,61 @@ class GameService:
 
             # Get current NFL week if not specified
             if week is None:
-                current = ESPNApiService.get_current_nfl_week()
+                current = WeekResolver.current()
                 week = current['week']
                 season_type = current['season_type']
                 year = current['year']
-                logger.info(f"Current NFL week: {week}, season_type: {season_type}, year: {year}")
+                logger.info("Current NFL week: %s, season_type: %s, year: %s", week, season_type, year)
             else:
-                season_type = 2  # Regular season
-                year = datetime.now().year
+                season_type = season_type or 2  # Regular season
+                year = year or datetime.now().year
             
             # Check cache first
             if not force:
-                cached_games = GameCache.query.filter_by(
-                    week=week,
-                    season_type=season_type,
-                    year=year
-                ).all()
-                
-                if cached_games:
-                    logger.info(f"Found {len(cached_games)} cached games for week {week}")
-                    # Convert to dictionary format
-                    games = []
-                    for game in cached_games:
-                        try:
-                            game_data = json.loads(game.data)
-                            # Add game time if not present
-                            if 'date' in game_data:
-                                game_date = datetime.fromisoformat(game_data['date'].replace('Z', '+00:00'))
-                                game_data['game_time'] = game_date.strftime('%I:%M %p')
-                            games.append(game_data)
-                        except json.JSONDecodeError as e:
-                            logger.error(f"Error decoding game data: {e}")
-                            continue
+                games = GameService.get_cached_week_games(week, season_type, year)
+                if games:
                     return games
             
-            # Fetch fresh data from ESPN
-            logger.info(f"Fetching fresh game data from ESPN for week {week}")
-            games = ESPNApiService.get_week_games(week, season_type, year)
+            # Fetch fresh data from ESPN, conditionally if we have validators
+            logger.info("Fetching fresh game data from ESPN for week %s", week)
+            validator_key = ESPNApiService.validator_key(week, season_type, year)
+            validator = ScoreboardValidator.query.filter_by(query_key=validator_key).first()
+            fetch = ESPNApiService.get_week_games_if_changed(
+                week, season_type, year,
+                validators=validator.to_dict() if validator else None
+            )
+            
+            if not fetch['changed']:
+                games = GameService.get_cached_week_games(week, season_type, year)
+                if games:
+                    logger.info("Scoreboard unchanged for week %s, skipping cache update", week)
+                    GameService.record_update_stats(week, len(games), 0, 0, len(games))
+                    return games
+                # Validators without cached rows (e.g. cache was cleared) - refetch in full
+                fetch = ESPNApiService.get_week_games_if_changed(week, season_type, year)
             
+            games = fetch['games']
             if not games:
+                # ESPN down (or circuit open) - serve the last known good data from the cache
+                cached = GameService.get_cached_week_games(week, season_type, year)
+                if cached:
+                    logger.warning(f"No fresh games for week {week}, serving {len(cached)} cached games")
+                    return cached
                 logger.warning(f"No games found for week {week}. This might be the offseason.")
                 return []
             
-            # Update cache
-            try:
-                # Update game cache
-                for game_data in games:
-                    try:
-                        # Try to find existing game
-                        existing_game = GameCache.query.filter_by(game_id=game_data['game_id']).first()
-                        
-                        # Get winner if game is final
-                        winning_team = game_data.get('winning_team')
-                        
-                        # Extract status from nested structure
-                        raw_status = game_data.get('status', {}).get('type', {}).get('name', '')
-                        raw_detail = game_data.get('status', {}).get('type', {}).get('detail', '')
-                        
-                        # Map ESPN status to our internal status
-                        status_map = {
-                            'STATUS_SCHEDULED': 'Scheduled',
-                            'STATUS_IN_PROGRESS': 'In Progress',
-                            'STATUS_HALFTIME': 'Halftime',
-                            'STATUS_END_PERIOD': 'End Period',
-                            'STATUS_FINAL': 'Final',
-                            'STATUS_FINAL_OVERTIME': 'Final OT',
-                            'STATUS_POSTPONED': 'Postponed',
-                            'STATUS_CANCELED': 'Canceled',
-                            'STATUS_SUSPENDED': 'Suspended',
-                            'STATUS_DELAYED': 'Delayed'
-                        }
-                        
-                        # First check if it's final from the detail field
-                        if raw_detail:
-                            detail_lower = raw_detail.lower()
-                            if 'final' in detail_lower:
-                                if any(x in detail_lower for x in ['ot', 'overtime']):
-                                    game_status = 'Final OT'
-                                else:
-                                    game_status = 'Final'
-                            else:
-                                game_status = status_map.get(raw_status, raw_status)
-                        else:
-                            game_status = status_map.get(raw_status, raw_status)
-                        
-                        logger.info(f"Processing game {game_data['game_id']}: {game_data['away_team']['display_name']} @ {game_data['home_team']['display_name']}")
-                        logger.info(f"Raw status: {raw_status}, Raw detail: {raw_detail}")
-                        logger.info(f"Mapped status: {game_status}, Winner: {winning_team}")
-                        
-                        if existing_game:
-                            # Log current state
-                            logger.info(f"Existing game found - Current state: status={existing_game.status}, winner={existing_game.winning_team}")
-                            
-                            # Update existing game
-                            existing_game.data = json.dumps(game_data)
-                            existing_game.status = game_status
-                            existing_game.winning_team = winning_team
-                            existing_game.home_team = game_data['home_team']['display_name']
-                            existing_game.away_team = game_data['away_team']['display_name']
-                            existing_game.home_team_abbrev = game_data['home_team']['abbreviation']
-                            existing_game.away_team_abbrev = game_data['away_team']['abbreviation']
-                            existing_game.home_score = game_data['home_team']['score']
-                            existing_game.away_score = game_data['away_team']['score']
-                            existing_game.last_updated = datetime.now(timezone.utc)
-                            
-                            # Update picks if game just finished
-                            if existing_game.is_final():
-                                logger.info(f"Updating picks for finished game {game_data['game_id']}")
-                                GameService.update_pick_results(existing_game)
-                        else:
-                            logger.info(f"Creating new game record for {game_data['game_id']}")
-                            # Create new game
-                            new_game = GameCache(
-                                week=game_data['week'],
-                                season_type=game_data['season_type'],
-                                year=game_data['year'],
-                                game_id=game_data['game_id'],
-                                data=json.dumps(game_data),
-                                status=game_status,
-                                winning_team=winning_team,
-                                home_team=game_data['home_team']['display_name'],
-                                away_team=game_data['away_team']['display_name'],
-                                home_team_abbrev=game_data['home_team']['abbreviation'],
-                                away_team_abbrev=game_data['away_team']['abbreviation'],
-                                home_score=game_data['home_team']['score'],
-                                away_score=game_data['away_team']['score'],
-                                start_time=datetime.fromisoformat(game_data['date']),
-                                is_mnf=game_data.get('is_mnf', False),
-                                venue_name=game_data['venue']['name'],
-                                venue_city=game_data['venue']['city'],
-                                venue_state=game_data['venue']['state']
-                            )
-                            db.session.add(new_game)
-                            
-                            # Update picks if game is final
-                            if new_game.is_final():
-                                logger.info(f"Updating picks for new finished game {game_data['game_id']}")
-                                db.session.flush()  # Ensure new_game has an ID
-                                GameService.update_pick_results(new_game)
-                    except Exception as e:
-                        logger.error(f"Error processing game {game_data.get('game_id', 'unknown')}: {str(e)}")
-                        continue
-                
-                db.session.commit()
-                logger.info(f"Successfully updated game cache for week {week}")
-                
-            except Exception as e:
-                db.session.rollback()
-                logger.error(f"Error updating game cache: {str(e)}")
-                raise
+            def store_validators():
+                # Stored in the same transaction as the cache rows they describe
+                nonlocal validator
+                if fetch['validators']:
+                    if not validator:
+                        validator = ScoreboardValidator(query_key=validator_key)
+                        db.session.add(validator)
+                    validator.etag = fetch['validators'].get('etag')
+                    validator.last_modified = fetch['validators'].get('last_modified')
+                    validator.body_hash = fetch['validators'].get('body_hash')
+
+            GameService._ingest_games(games, week, before_commit=store_validators)
                 
             return games
             
@@ -393,6 +316,68 @@ class GameService:
             logger.error(f"Error in update_week_games: {str(e)}")
             return []
 
+    @staticmethod
+    def get_cached_week_games(week: int, season_type: int, year: int) -> List[Dict]:
+        """
+        Get the cached games for a week in dictionary format.
+
+        Payloads are decoded once per (game_id, updated_at) and kept in
+        payload_cache, so reading an unchanged week only queries the keys.
+        Returned dicts are shallow copies; treat nested values as read-only.
+        """
+        keys = db.session.query(GameCache.game_id, GameCache.updated_at).filter_by(
+            week=week,
+            season_type=season_type,
+            year=year
+        ).all()
+        
+        if not keys:
+            return []
+        
+        logger.debug("Found %s cached games for week %s", len(keys), week)
+        payloads = {}
+        missing = []
+        for game_id, updated_at in keys:
+            payload = GameService.payload_cache.get((game_id, updated_at))
+            if payload is None:
+                missing.append(game_id)
+            else:
+                payloads[game_id] = payload
+        if missing:
+            for game in GameCache.query.filter(GameCache.game_id.in_(missing)).all():
+                payload = GameService._decode_payload(game)
+                if payload is not None:
+                    payloads[game.game_id] = payload
+        return [dict(payloads[game_id]) for game_id, _ in keys if game_id in payloads]
+
+    @staticmethod
+    def game_payload(game: GameCache) -> Optional[Dict]:
+        """Decoded data of a GameCache row (cached like get_cached_week_games)"""
+        payload = GameService.payload_cache.get((game.game_id, game.updated_at))
+        return payload if payload is not None else GameService._decode_payload(game)
+
+    @staticmethod
+    def _decode_payload(game: GameCache) -> Optional[Dict]:
+        try:
+            payload = game.payload
+        except (TypeError, ValueError, zlib.error) as e:
+            logger.error(f"Error decoding game data: {e}")
+            return None
+        if 'kickoff_weekday' not in payload and game.start_time:
+            # Stored before kickoff fields were derived at ingest
+            GameService.add_kickoff_fields(payload, game.start_time)
+        GameService.payload_cache.put((game.game_id, game.updated_at), payload)
+        return payload
+
+    @staticmethod
+    def add_kickoff_fields(game_data: Dict, kickoff_utc: datetime) -> Dict:
+        """Add local (Central) kickoff fields so readers don't parse dates"""
+        local = kickoff_utc.replace(tzinfo=UTC).astimezone(CENTRAL_TZ)
+        game_data.setdefault('game_time', local.strftime('%a %I:%M %p').replace(' 0', ' '))
+        game_data['kickoff_weekday'] = local.weekday()  # Monday is 0
+        game_data['kickoff_hour'] = local.hour
+        return game_data
+
     @staticmethod
     def get_week_games(week: Optional[int] = None, force_update: bool = False) -> List[Dict]:
         """
@@ -406,8 +391,8 @@ class GameService:
 
     @staticmethod
     def get_current_nfl_week() -> Dict:
-        """Get the current NFL week information"""
-        return ESPNApiService.get_current_nfl_week()
+        """Get the current NFL week information (resolved locally, no network call)"""
+        return WeekResolver.current()
 
     @staticmethod
     def get_mnf_game(week: Optional[int] = None) -> Optional[Dict]:
@@ -418,125 +403,178 @@ class GameService:
                 return game
         return None
 
+    @staticmethod
+    def prune_game_payloads() -> Dict:
+        """
+        Shrink stored game payloads.
+
+        Weeks where every game is final have their payloads dropped: the
+        columns hold everything the app still reads about them (see
+        GameCache.payload). Rows elsewhere still holding legacy JSON are
+        repacked into the compressed format. Returns the counts (committed).
+        """
+        games = GameCache.query.filter(or_(GameCache.data != '', GameCache.data_z.isnot(None))).all()
+        weeks = {}
+        for game in games:
+            weeks.setdefault((game.year, game.season_type, game.week), []).append(game)
+
+        stripped = repacked = final_weeks = 0
+        for week_games in weeks.values():
+            # ESPN has to report every game as over, not just kicked off long ago
+            if all(game.is_final() and game.status.lower() not in ('scheduled', 'delayed', 'suspended')
+                   for game in week_games):
+                final_weeks += 1
+                for game in week_games:
+                    game.data, game.data_z = '', None
+                    stripped += 1
+                continue
+            for game in week_games:
+                if game.data_z is not None:
+                    continue
+                try:
+                    payload = json.loads(game.data)
+                except (TypeError, json.JSONDecodeError):
+                    continue
+                if not isinstance(payload.get('home_team'), dict):
+                    continue  # not a parsed game (sample or raw ESPN data), left as is
+                columns = {name: getattr(game, name) for name in PAYLOAD_COLUMNS}
+                game.data, game.data_z = '', GameCache.pack_payload(payload, columns)
+                repacked += 1
+
+        try:
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Error pruning game payloads: {str(e)}")
+            raise
+        logger.info(f"Pruned game payloads: {stripped} stripped in {final_weeks} final weeks, {repacked} repacked")
+        return {'final_weeks': final_weeks, 'stripped': stripped, 'repacked': repacked}
+
     @staticmethod
     def update_game_cache(games):
         """Update game cache with new game data."""
+        logger.info("Updating %s games in cache", len(games))
+        GameService._ingest_games(games)
+
+    @staticmethod
+    def _game_row(game_data: Dict, status: str, fingerprint: str, now: datetime) -> Dict:
+        """GameCache column values for a parsed ESPN game"""
+        start_time = ESPNApiService.parse_utc(game_data['date'])
+        GameService.add_kickoff_fields(game_data, start_time)
+        row = {
+            'week': game_data['week'],
+            'season_type': game_data['season_type'],
+            'year': game_data['year'],
+            'game_id': game_data['game_id'],
+            'data': '',
+            'status': status,
+            'winning_team': game_data.get('winning_team'),
+            'home_team': game_data['home_team']['display_name'],
+            'away_team': game_data['away_team']['display_name'],
+            'home_team_abbrev': game_data['home_team']['abbreviation'],
+            'away_team_abbrev': game_data['away_team']['abbreviation'],
+            'home_score': game_data['home_team'].get('score', 0),
+            'away_score': game_data['away_team'].get('score', 0),
+            # Stored as naive UTC like every other DateTime column
+            'start_time': start_time,
+            'is_mnf': game_data.get('is_mnf', False),
+            'venue_name': game_data['venue'].get('name'),
+            'venue_city': game_data['venue'].get('city'),
+            'venue_state': game_data['venue'].get('state'),
+            'fingerprint': fingerprint,
+            'last_updated': now,
+            'updated_at': now
+        }
+        # Only what the columns don't already hold, compressed (see GameCache.payload)
+        row['data_z'] = GameCache.pack_payload(game_data, row)
+        return row
+
+    @staticmethod
+    def _ingest_games(games: List[Dict], week: Optional[int] = None, before_commit=None) -> Dict:
+        """
+        Write a batch of parsed ESPN games to the cache in one transaction.
+
+        Existing rows are prefetched with a single IN query (ids,
+        fingerprints, states and scores only), changed games are written
+        with one executemany INSERT and one executemany UPDATE, state
+        transitions are emitted as GameEvents (which grade picks and score
+        MNF predictions), and everything is committed once. `before_commit`
+        can add more changes to the same transaction.
+
+        The time from the first write to the end of the commit - how long
+        SQLite's write lock is held - is recorded as write_lock_ms.
+        """
+        now = datetime.utcnow()
+        rows = {}
+        for game_data in games:
+            try:
+                status = GameService.resolve_game_status(game_data)
+                fingerprint = GameService.game_fingerprint(game_data, status)
+                rows[game_data['game_id']] = GameService._game_row(game_data, status, fingerprint, now)
+            except (KeyError, TypeError, ValueError, AttributeError) as e:
+                logger.error(f"Error processing game {game_data.get('game_id', 'unknown')}: {str(e)}")
+
+        existing = {
+            row.game_id: row
+            for row in db.session.query(
+                GameCache.id, GameCache.game_id, GameCache.fingerprint, GameCache.state, GameCache.status,
+                GameCache.home_score, GameCache.away_score
+            ).filter(GameCache.game_id.in_(list(rows))).all()
+        } if rows else {}
+
+        inserts, updates, transitions = [], [], []
+        for game_id, row in rows.items():
+            old = existing.get(game_id)
+            old_state = None
+            if old is not None:
+                # Rows stored before states existed: infer from the status text alone
+                old_state = GameStatus(old.state) if old.state is not None else GameStatus.from_status(old.status)
+            state = GameStatus.from_status(row['status'], previous=old_state)
+            row['state'] = int(state)
+
+            if old is None:
+                inserts.append(row)
+            elif old.fingerprint != row['fingerprint'] or old.state != row['state']:
+                updates.append(dict(row, id=old.id))
+            else:
+                continue
+            scores_changed = old is not None and (old.home_score, old.away_score) != (row['home_score'], row['away_score'])
+            transitions.extend((game_id, event) for event in GameEvents.transitions(old_state, state, scores_changed))
+        skipped = len(rows) - len(inserts) - len(updates)
+
+        lock_started = time.perf_counter()
         try:
-            logger.info(f"Updating {len(games)} games in cache")
-            for game_data in games:
-                try:
-                    # Try to find existing game
-                    existing_game = GameCache.query.filter_by(game_id=game_data['game_id']).first()
-                    
-                    # Parse datetime properly
-                    try:
-                        start_time = datetime.fromisoformat(game_data['date'].replace('Z', '+00:00'))
-                    except (ValueError, KeyError) as e:
-                        logger.error(f"Error parsing date for game {game_data['game_id']}: {e}")
-                        continue
-                    
-                    # Get winner if game is final
-                    winning_team = game_data.get('winning_team')
-                    
-                    # Extract status from nested structure
-                    raw_status = game_data.get('status', {}).get('type', {}).get('name', '')
-                    raw_detail = game_data.get('status', {}).get('type', {}).get('detail', '')
-                    
-                    logger.info(f"Processing game {game_data['game_id']}: {game_data['away_team']['display_name']} @ {game_data['home_team']['display_name']}")
-                    logger.info(f"Status: {raw_status}, Detail: {raw_detail}")
-                    
-                    # Map ESPN status to our internal status
-                    status_map = {
-                        'STATUS_SCHEDULED': 'Scheduled',
-                        'STATUS_IN_PROGRESS': 'In Progress',
-                        'STATUS_HALFTIME': 'Halftime',
-                        'STATUS_END_PERIOD': 'End Period',
-                        'STATUS_FINAL': 'Final',
-                        'STATUS_FINAL_OVERTIME': 'Final OT',
-                        'STATUS_POSTPONED': 'Postponed',
-                        'STATUS_CANCELED': 'Canceled',
-                        'STATUS_SUSPENDED': 'Suspended',
-                        'STATUS_DELAYED': 'Delayed'
-                    }
-                    
-                    # First check if it's final from the detail field
-                    if raw_detail:
-                        detail_lower = raw_detail.lower()
-                        if 'final' in detail_lower:
-                            if any(x in detail_lower for x in ['ot', 'overtime']):
-                                game_status = 'Final OT'
-                            else:
-                                game_status = 'Final'
-                        else:
-                            game_status = status_map.get(raw_status, raw_status)
-                    else:
-                        game_status = status_map.get(raw_status, raw_status)
-                    
-                    if existing_game:
-                        # Log current state
-                        logger.info(f"Existing game found - Current state: status={existing_game.status}, winner={existing_game.winning_team}")
-                        
-                        # Update existing game
-                        existing_game.data = json.dumps(game_data)
-                        existing_game.status = game_status
-                        existing_game.winning_team = winning_team
-                        existing_game.home_team = game_data['home_team']['display_name']
-                        existing_game.away_team = game_data['away_team']['display_name']
-                        existing_game.home_team_abbrev = game_data['home_team']['abbreviation']
-                        existing_game.away_team_abbrev = game_data['away_team']['abbreviation']
-                        existing_game.home_score = game_data['home_team'].get('score', 0)
-                        existing_game.away_score = game_data['away_team'].get('score', 0)
-                        existing_game.start_time = start_time
-                        existing_game.is_mnf = game_data.get('is_mnf', False)
-                        existing_game.venue_name = game_data['venue'].get('name')
-                        existing_game.venue_city = game_data['venue'].get('city')
-                        existing_game.venue_state = game_data['venue'].get('state')
-                        existing_game.last_updated = datetime.now(timezone.utc)
-                        
-                        # Update picks if game just finished
-                        if existing_game.is_final():
-                            logger.info(f"Updating picks for finished game {game_data['game_id']}")
-                            GameService.update_pick_results(existing_game)
-                    else:
-                        logger.info(f"Creating new game record for {game_data['game_id']}")
-                        # Create new game
-                        new_game = GameCache(
-                            week=game_data['week'],
-                            season_type=game_data['season_type'],
-                            year=game_data['year'],
-                            game_id=game_data['game_id'],
-                            data=json.dumps(game_data),
-                            status=game_status,
-                            winning_team=winning_team,
-                            home_team=game_data['home_team']['display_name'],
-                            away_team=game_data['away_team']['display_name'],
-                            home_team_abbrev=game_data['home_team']['abbreviation'],
-                            away_team_abbrev=game_data['away_team']['abbreviation'],
-                            home_score=game_data['home_team'].get('score', 0),
-                            away_score=game_data['away_team'].get('score', 0),
-                            start_time=start_time,
-                            is_mnf=game_data.get('is_mnf', False),
-                            venue_name=game_data['venue'].get('name'),
-                            venue_city=game_data['venue'].get('city'),
-                            venue_state=game_data['venue'].get('state'),
-                            last_updated=datetime.now(timezone.utc)
-                        )
-                        db.session.add(new_game)
-                        
-                        # Update picks if game is final
-                        if new_game.is_final():
-                            logger.info(f"Updating picks for new finished game {game_data['game_id']}")
-                            db.session.flush()  # Ensure new_game has an ID
-                            GameService.update_pick_results(new_game)
-                            
-                except Exception as e:
-                    logger.error(f"Error processing game {game_data.get('game_id', 'unknown')}: {str(e)}")
-                    continue
-            
+            if inserts:
+                db.session.execute(insert(GameCache), inserts)
+            if updates:
+                db.session.execute(update(GameCache), updates)
+            if inserts or updates:
+                RenderCache.invalidate()
+
+            if transitions:
+                changed = {
+                    game.game_id: game
+                    for game in GameCache.query.filter(GameCache.game_id.in_({game_id for game_id, _ in transitions}))
+                    .execution_options(populate_existing=True).all()
+                }
+                for game_id, event in transitions:
+                    GameEvents.emit(event, changed[game_id])
+
+            if before_commit:
+                before_commit()
             db.session.commit()
-            logger.info("Successfully updated game cache")
-            
         except Exception as e:
             db.session.rollback()
             logger.error(f"Error updating game cache: {str(e)}")
             raise
+        write_lock_ms = (time.perf_counter() - lock_started) * 1000
+
+        return GameService.record_update_stats(week, len(games), len(inserts), len(updates), skipped,
+                                               write_lock_ms=write_lock_ms, events=len(transitions))
+
+
+@GameEvents.subscribe(GameEvents.KICKOFF, GameEvents.FINAL, GameEvents.POSTPONED,
+                      GameEvents.CANCELED, GameEvents.SCORE_CORRECTED)
+def _drop_cached_payloads(game):
+    """A transitioned game's old payloads can't be read again (new updated_at); free them now"""
+    GameService.payload_cache.discard_game(game.game_id)
@@ -0,0 +1,269 @@
+import threading
+import time
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import logging
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from flask import current_app, has_app_context
+
+logger = logging.getLogger(__name__)
+
+# Defaults used when no app config is available (scripts, background threads
+# started before the app is configured, etc.)
+DEFAULTS = {
+    'ESPN_POOL_CONNECTIONS': 4,
+    'ESPN_POOL_MAXSIZE': 8,
+    'ESPN_POOL_BLOCK': False,
+    'ESPN_MAX_RETRIES': 2,
+    'ESPN_BACKOFF_FACTOR': 0.3,
+    'ESPN_BACKOFF_JITTER': 0.2,
+    'ESPN_FETCH_MODE': 'hedged',
+    'ESPN_HEDGE_DELAY': 0.75,
+    'ESPN_FETCH_DEADLINE': 8.0,
+    'ESPN_BREAKER_THRESHOLD': 3,
+    'ESPN_BREAKER_PROBE_INTERVAL': 30,
+}
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+class AllAttemptsFailed(Exception):
+    """Raised when every attempt of a hedged call failed or the deadline passed."""
+
+    def __init__(self, errors):
+        self.errors = errors
+        message = '; '.join(str(e) for e in errors) or 'deadline exceeded'
+        super().__init__(message)
+
+
+def setting(name):
+    """Read an HTTP setting from the app config, falling back to defaults."""
+    if has_app_context():
+        return current_app.config.get(name, DEFAULTS[name])
+    return DEFAULTS[name]
+
+
+class _CountingAdapter(HTTPAdapter):
+    """HTTPAdapter that keeps per-host pool limits and tracks requests sent."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._lock = threading.Lock()
+        self.requests_sent = 0
+
+    def send(self, request, **kwargs):
+        with self._lock:
+            self.requests_sent += 1
+        return super().send(request, **kwargs)
+
+
+class HttpSession:
+    """
+    Process-wide pooled HTTP session used for all ESPN access.
+
+    A single requests.Session is shared by every thread in the process so
+    connections (and their TLS sessions) are kept alive and reused between
+    polls. Retries use exponential backoff with jitter so several workers
+    retrying the same outage don't hit ESPN in lockstep.
+    """
+    _session: Optional[requests.Session] = None
+    _adapter: Optional[_CountingAdapter] = None
+    _executor: Optional[ThreadPoolExecutor] = None
+    _lock = threading.Lock()
+    _fetch_lock = threading.Lock()
+    _fetch_stats = {
+        'fetches': 0,
+        'hedges_launched': 0,
+        'failures': 0,
+        'wins': Counter(),
+        'latency_ms': deque(maxlen=200),
+    }
+
+    @classmethod
+    def _build(cls):
+        retry = Retry(
+            total=setting('ESPN_MAX_RETRIES'),
+            connect=setting('ESPN_MAX_RETRIES'),
+            read=setting('ESPN_MAX_RETRIES'),
+            status=setting('ESPN_MAX_RETRIES'),
+            backoff_factor=setting('ESPN_BACKOFF_FACTOR'),
+            backoff_jitter=setting('ESPN_BACKOFF_JITTER'),
+            status_forcelist=RETRY_STATUSES,
+            allowed_methods=frozenset(['GET', 'HEAD']),
+            raise_on_status=False,
+            respect_retry_after_header=True,
+        )
+        adapter = _CountingAdapter(
+            pool_connections=setting('ESPN_POOL_CONNECTIONS'),
+            pool_maxsize=setting('ESPN_POOL_MAXSIZE'),
+            pool_block=setting('ESPN_POOL_BLOCK'),
+            max_retries=retry,
+        )
+        session = requests.Session()
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        session.headers.update({
+            'Accept': 'application/json',
+            'Accept-Encoding': 'gzip, deflate',
+            'Connection': 'keep-alive',
+        })
+        return session, adapter
+
+    @classmethod
+    def session(cls) -> requests.Session:
+        """Return the shared session, creating it on first use."""
+        if cls._session is None:
+            with cls._lock:
+                if cls._session is None:
+                    cls._session, cls._adapter = cls._build()
+                    logger.info("Created pooled HTTP session for ESPN API")
+        return cls._session
+
+    @classmethod
+    def get(cls, url: str, params: Optional[Dict] = None, timeout: float = 10,
+            headers: Optional[Dict] = None) -> requests.Response:
+        """GET a URL through the shared session."""
+        return cls.session().get(url, params=params, timeout=timeout, headers=headers)
+
+    @classmethod
+    def executor(cls) -> ThreadPoolExecutor:
+        """Thread pool used to run hedged requests."""
+        if cls._executor is None:
+            with cls._lock:
+                if cls._executor is None:
+                    cls._executor = ThreadPoolExecutor(
+                        max_workers=setting('ESPN_POOL_MAXSIZE'),
+                        thread_name_prefix='espn-fetch'
+                    )
+        return cls._executor
+
+    @classmethod
+    def hedged(cls, attempts: List[Callable[[float], Any]], hedge_delay: float,
+               deadline: float) -> Tuple[int, Any, float]:
+        """
+        Run `attempts` staggered by `hedge_delay` seconds and return the first success.
+
+        Each attempt is a callable taking the timeout it may use. Attempt N is
+        started N * hedge_delay seconds after the first one (or straight away
+        once every running attempt has failed). A hedge_delay of 0 races all
+        attempts at once. As soon as one succeeds the others are cancelled
+        (or, if already running, left to finish and discarded).
+
+        Returns (index of the winning attempt, its result, elapsed seconds).
+        Raises AllAttemptsFailed if none succeed within `deadline` seconds.
+        """
+        start = time.monotonic()
+        executor = cls.executor()
+        cls.session()  # build with this thread's app config before handing off to the pool
+        pending = {}
+        errors = []
+        next_index = 0
+
+        def launch():
+            nonlocal next_index
+            remaining = deadline - (time.monotonic() - start)
+            future = executor.submit(attempts[next_index], max(remaining, 0.1))
+            pending[future] = next_index
+            if next_index > 0:
+                with cls._fetch_lock:
+                    cls._fetch_stats['hedges_launched'] += 1
+            next_index += 1
+
+        launch()
+        try:
+            while pending or next_index < len(attempts):
+                elapsed = time.monotonic() - start
+                remaining = deadline - elapsed
+                if remaining <= 0:
+                    break
+
+                if next_index < len(attempts) and (not pending or elapsed >= hedge_delay * next_index):
+                    launch()
+                    continue
+
+                wait_for = remaining
+                if next_index < len(attempts):
+                    wait_for = min(wait_for, max(hedge_delay * next_index - elapsed, 0))
+
+                done, _ = wait(list(pending), timeout=wait_for, return_when=FIRST_COMPLETED)
+                for future in done:
+                    index = pending.pop(future)
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        errors.append(e)
+                        continue
+                    return index, result, time.monotonic() - start
+        finally:
+            for future in pending:
+                future.cancel()
+
+        raise AllAttemptsFailed(errors)
+
+    @classmethod
+    def record_fetch(cls, host: Optional[str], latency: Optional[float]):
+        """Record which host answered a logical fetch and how long it took."""
+        with cls._fetch_lock:
+            cls._fetch_stats['fetches'] += 1
+            if host is None:
+                cls._fetch_stats['failures'] += 1
+                return
+            cls._fetch_stats['wins'][host] += 1
+            cls._fetch_stats['latency_ms'].append(round(latency * 1000))
+
+    @classmethod
+    def reset(cls):
+        """Close all pooled connections and the hedging pool (e.g. after fork or in tests)."""
+        with cls._lock:
+            if cls._session is not None:
+                cls._session.close()
+            cls._session = None
+            cls._adapter = None
+            if cls._executor is not None:
+                # After a fork its worker threads don't exist in this process
+                cls._executor.shutdown(wait=False, cancel_futures=True)
+            cls._executor = None
+
+    @classmethod
+    def stats(cls) -> Dict:
+        """
+        Connection reuse counters per host.
+
+        `connections` is how many sockets were opened, `requests` how many
+        requests went over them; everything beyond the first request on a
+        connection was a keep-alive reuse.
+        """
+        with cls._fetch_lock:
+            latencies = sorted(cls._fetch_stats['latency_ms'])
+            fetches = {
+                'fetches': cls._fetch_stats['fetches'],
+                'hedges_launched': cls._fetch_stats['hedges_launched'],
+                'failures': cls._fetch_stats['failures'],
+                'wins_by_host': dict(cls._fetch_stats['wins']),
+                'latency_ms_p50': latencies[len(latencies) // 2] if latencies else None,
+                'latency_ms_p95': latencies[int(len(latencies) * 0.95)] if latencies else None,
+            }
+
+        adapter = cls._adapter
+        if adapter is None:
+            return {'requests_sent': 0, 'hosts': {}, 'fetches': fetches}
+
+        hosts = {}
+        for key in list(adapter.poolmanager.pools.keys()):
+            pool = adapter.poolmanager.pools.get(key)
+            if pool is None:
+                continue
+            connections = pool.num_connections
+            requests_made = pool.num_requests
+            hosts[f"{key.key_scheme}://{key.key_host}:{key.key_port}"] = {
+                'connections': connections,
+                'requests': requests_made,
+                'reused': max(requests_made - connections, 0),
+                'idle': sum(1 for conn in list(pool.pool.queue) if conn is not None) if pool.pool is not None else 0,
+            }
+        return {'requests_sent': adapter.requests_sent, 'hosts': hosts, 'fetches': fetches}
+
@@ -0,0 +1,111 @@
+from collections import defaultdict
+from typing import Dict
+import logging
+
+from sqlalchemy import case, func
+
+from app.data.nfl_teams import resolve_team
+from app.extensions import db
+from app.models.pick import Pick
+from app.models.stats import GameConsensus
+
+logger = logging.getLogger(__name__)
+
+
+def _team_key(team_picked: str) -> str:
+    return resolve_team(team_picked) or team_picked.strip().upper()
+
+
+class LeagueStats:
+    """
+    League-wide pick aggregates for standings, a fixed handful of queries
+    however many users there are.
+
+    Each method returns a dict keyed by user id; users without any
+    qualifying picks are simply absent. Weekly and season records live in
+    the materialized user_week_stats table (see UserStats), streaks in
+    user_streak (see Streaks).
+    """
+
+    @staticmethod
+    def team_success_rates(min_picks: int = 3) -> Dict[int, Dict[str, Dict]]:
+        """Per user, success rate for each team picked at least `min_picks` times in decided games"""
+        rows = db.session.query(
+            Pick.user_id, Pick.team_picked,
+            func.sum(case((Pick.is_correct.is_(True), 1), else_=0)),
+            func.count(Pick.id)
+        ).filter(Pick.is_correct.isnot(None)).group_by(Pick.user_id, Pick.team_picked).all()
+
+        # Picks name teams several ways; fold the groups onto canonical keys
+        team_stats = defaultdict(lambda: defaultdict(lambda: {'correct': 0, 'total': 0}))
+        for user_id, team_picked, correct, total in rows:
+            stats = team_stats[user_id][_team_key(team_picked)]
+            stats['correct'] += correct
+            stats['total'] += total
+
+        return {
+            user_id: {
+                team: {
+                    'success_rate': stats['correct'] / stats['total'] * 100,
+                    'correct': stats['correct'],
+                    'total': stats['total']
+                }
+                for team, stats in teams.items() if stats['total'] >= min_picks
+            }
+            for user_id, teams in team_stats.items()
+        }
+
+    @staticmethod
+    def empty_streak() -> Dict:
+        return {'longest_win_streak': 0, 'longest_loss_streak': 0, 'current_streak': 0, 'current_streak_type': None}
+
+    @staticmethod
+    def upsets(min_majority_pct: float = 65, top: int = 3) -> Dict[int, Dict]:
+        """
+        Per user, correct picks against a kickoff consensus of at least
+        `min_majority_pct` (see game_consensus): the total, and the `top`
+        most lopsided ones.
+        """
+        rows = db.session.query(
+            Pick.user_id, Pick.week, Pick.team_picked,
+            GameConsensus.home_team, GameConsensus.away_team,
+            GameConsensus.majority_team, GameConsensus.majority_pct
+        ).join(GameConsensus, GameConsensus.game_id == Pick.game_id) \
+            .filter(Pick.is_correct.is_(True), GameConsensus.majority_pct >= min_majority_pct) \
+            .order_by(Pick.user_id, Pick.id).all()
+
+        upsets = defaultdict(list)
+        for user_id, week, team_picked, home, away, majority_team, majority_pct in rows:
+            picked = _team_key(team_picked)
+            if picked == majority_team:
+                continue
+            opponent = resolve_team(away if picked == home else home)
+            picked = resolve_team(picked)
+            upsets[user_id].append({
+                'week': week,
+                'team': picked,
+                'team_logo': f"/static/img/teams/{picked.lower()}.png" if picked else None,
+                'opponent': opponent,
+                'opponent_logo': f"/static/img/teams/{opponent.lower()}.png" if opponent else None,
+                'majority_pct': majority_pct
+            })
+
+        result = {}
+        for user_id, picks in upsets.items():
+            # Biggest upsets (most heavily favored opponent) first
+            listed = sorted((pick for pick in picks if pick['team'] and pick['opponent']),
+                            key=lambda pick: pick['majority_pct'], reverse=True)
+            result[user_id] = {'total_upsets': len(picks), 'upset_picks': listed[:top]}
+        return result
+
+    @staticmethod
+    def empty_upsets() -> Dict:
+        return {'total_upsets': 0, 'upset_picks': []}
+
+    @staticmethod
+    def week_picks(week: int) -> Dict[int, Dict[str, Pick]]:
+        """Per user, that week's picks by game id"""
+        picks = defaultdict(dict)
+        for pick in Pick.query.filter_by(week=week):
+            picks[pick.user_id][pick.game_id] = pick
+        return picks
@@ -0,0 +1,77 @@
+from typing import Dict, Optional
+import logging
+import threading
+import time
+
+from flask import current_app
+
+from app.extensions import db
+from app.models.ops import LogSetting
+from app.utils import log as app_log
+
+logger = logging.getLogger(__name__)
+
+SAMPLE_RATE = 'game_sample_rate'
+
+
+class LogSettings:
+    """
+    Runtime log settings shared by every process.
+
+    /admin/log-levels stores overrides in log_setting; each process (web
+    workers on their next request, the updater on a timer) applies them
+    at most every LOG_SETTINGS_TTL seconds, on top of LOG_LEVEL/LOG_LEVELS.
+    """
+    _checked_at = 0.0
+    _lock = threading.Lock()
+
+    @staticmethod
+    def save(levels: Dict[str, str], game_sample_rate: Optional[float] = None) -> Dict[str, str]:
+        """
+        Apply settings here and store them for every other process (committed).
+
+        Raises ValueError (or TypeError for a bad sample rate) before
+        anything is applied or stored. Returns the level names applied.
+        """
+        values = {subsystem: app_log.check_level(subsystem, level) for subsystem, level in levels.items()}
+        if game_sample_rate is not None:
+            values[SAMPLE_RATE] = str(min(max(float(game_sample_rate), 0.0), 1.0))
+
+        applied = {subsystem: app_log.set_level(subsystem, level) for subsystem, level in levels.items()}
+        if game_sample_rate is not None:
+            app_log.set_game_sample_rate(values[SAMPLE_RATE])
+
+        existing = {row.name: row for row in LogSetting.query.filter(LogSetting.name.in_(list(values)))}
+        for name, value in values.items():
+            row = existing.get(name)
+            if row is None:
+                db.session.add(LogSetting(name=name, value=value))
+            else:
+                row.value = value
+        db.session.commit()
+        return applied
+
+    @staticmethod
+    def apply(force: bool = False) -> bool:
+        """Apply the stored settings if they weren't checked in the last LOG_SETTINGS_TTL seconds. Returns whether they were read."""
+        now = time.monotonic()
+        with LogSettings._lock:
+            if not force and now - LogSettings._checked_at < current_app.config.get('LOG_SETTINGS_TTL', 30):
+                return False
+            LogSettings._checked_at = now
+
+        try:
+            rows = db.session.query(LogSetting.name, LogSetting.value).all()
+        except Exception as e:
+            db.session.rollback()
+            logger.warning(f"Could not read shared log settings: {str(e)}")
+            return False
+        for name, value in rows:
+            try:
+                if name == SAMPLE_RATE:
+                    app_log.set_game_sample_rate(value)
+                else:
+                    app_log.set_level(name, value)
+            except (TypeError, ValueError) as e:
+                logger.warning(f"Ignoring stored log setting {name}={value}: {str(e)}")
+        return True
@@ -0,0 +1,56 @@
+from typing import Optional
+import logging
+
+from app.extensions import db
+from app.models.game import GameCache
+from app.models.pick import MNFPrediction
+from app.services.game_events import GameEvents
+from app.services.render_cache import RenderCache
+from app.services.user_stats import UserStats
+
+logger = logging.getLogger(__name__)
+
+
+class MNFScoring:
+    """Scores Monday Night Football total-points predictions against the final score."""
+
+    @staticmethod
+    def week_mnf_game(game: GameCache) -> Optional[GameCache]:
+        """The game MNF predictions for `game`'s week are scored against (the first MNF game)"""
+        return GameCache.query.filter_by(
+            week=game.week, season_type=game.season_type, year=game.year, is_mnf=True
+        ).order_by(GameCache.id).first()
+
+    @staticmethod
+    def score_predictions(game: GameCache) -> int:
+        """Set actual totals for every prediction of the game's week. Returns the count (not committed)."""
+        actual_total = game.get_total_points()
+        if actual_total is None:
+            logger.warning(f"MNF game {game.game_id} is final but missing scores")
+            return 0
+
+        predictions = MNFPrediction.query.filter_by(week=game.week).all()
+        for pred in predictions:
+            if pred.total_points is not None:
+                pred.calculate_difference(actual_total)
+        UserStats.refresh([game.week])
+        RenderCache.invalidate()
+        logger.info(f"Scored {len(predictions)} MNF predictions for week {game.week} against {actual_total} points")
+        return len(predictions)
+
+    @staticmethod
+    def score_if_final(week: int) -> int:
+        """Score a week's predictions if its MNF game is already final (predictions saved after the FINAL event)."""
+        game = GameCache.query.filter_by(week=week, is_mnf=True).order_by(GameCache.id).first()
+        if game is None or not game.is_final():
+            return 0
+        return MNFScoring.score_predictions(game)
+
+
+@GameEvents.subscribe(GameEvents.FINAL, GameEvents.SCORE_CORRECTED)
+def _score_on_final(game):
+    if not game.is_mnf:
+        return
+    mnf_game = MNFScoring.week_mnf_game(game)
+    if mnf_game is not None and mnf_game.game_id == game.game_id:
+        MNFScoring.score_predictions(game)
@@ -0,0 +1,46 @@
+from datetime import datetime
+from typing import Dict, Optional
+import json
+import logging
+import os
+
+from app.extensions import db
+from app.models.ops import ProcessSnapshot
+
+logger = logging.getLogger(__name__)
+
+
+class OpsStats:
+    """
+    Diagnostics shared between processes.
+
+    ESPN fetch counters, the circuit breaker and ingest timings live in the
+    memory of whichever process polls ESPN - normally the updater, never a
+    web worker. The updater publishes them here after every poll so the
+    admin endpoints can show them from any process.
+    """
+
+    @staticmethod
+    def publish(source: str, sections: Dict[str, Dict]) -> None:
+        """Replace `source`'s published sections (committed; errors are logged, not raised)"""
+        try:
+            existing = {row.name: row for row in ProcessSnapshot.query.filter_by(source=source)}
+            now = datetime.utcnow()
+            for name, stats in sections.items():
+                row = existing.get(name)
+                if row is None:
+                    row = ProcessSnapshot(source=source, name=name)
+                    db.session.add(row)
+                row.pid = os.getpid()
+                row.payload = json.dumps(stats, default=str)
+                row.published_at = now
+            db.session.commit()
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Error publishing {source} stats: {str(e)}")
+
+    @staticmethod
+    def read(source: str, name: str) -> Optional[Dict]:
+        """A published section with its pid and publish time, or None if never published"""
+        row = ProcessSnapshot.query.filter_by(source=source, name=name).first()
+        return row.to_dict() if row else None
@@ -0,0 +1,64 @@
+from collections import OrderedDict
+from typing import Dict, Hashable, Optional
+import threading
+
+
+class PayloadCache:
+    """
+    Bounded LRU cache of decoded GameCache payloads.
+
+    Entries are keyed by (game_id, updated_at): every write to a cached game
+    bumps updated_at, so a changed game simply misses and the stale entry
+    ages out. Nothing ever needs to be invalidated explicitly.
+    """
+
+    def __init__(self, maxsize: int = 512):
+        self.maxsize = maxsize
+        self._lock = threading.Lock()
+        self._entries: OrderedDict = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, key: Hashable) -> Optional[Dict]:
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return value
+
+    def put(self, key: Hashable, value: Dict):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def discard_game(self, game_id: str):
+        """Drop every entry for a game (keys are (game_id, updated_at))"""
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == game_id]:
+                del self._entries[key]
+
+    def resize(self, maxsize: int):
+        with self._lock:
+            self.maxsize = maxsize
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+                'hits': self._hits,
+                'misses': self._misses,
+                'hit_rate': round(self._hits / lookups, 3) if lookups else None
+            }
@@ -0,0 +1,115 @@
+from datetime import datetime
+from typing import FrozenSet, Iterable
+import logging
+
+from sqlalchemy import case, func, update
+
+from app.data.nfl_teams import TEAM_ALIASES, resolve_team
+from app.extensions import db
+from app.models.game import GameCache
+from app.models.pick import Pick
+from app.services.game_events import GameEvents
+from app.services.render_cache import RenderCache
+from app.services.streaks import Streaks, kickoff_order
+from app.services.user_stats import UserStats
+
+logger = logging.getLogger(__name__)
+
+
+class PickGrader:
+    """
+    Set-based pick grading.
+
+    Each final game is graded with a single UPDATE over all of its picks:
+    a pick is correct when the (trimmed, uppercased) team it names is one
+    of the aliases of the team that scored more, wrong when it names the
+    other team, and left ungraded (NULL) when it names neither. Only rows
+    whose value actually changes are written, and the number of changed
+    rows is returned.
+
+    Grading also sets the game's graded watermark (GameCache.mark_graded),
+    so callers can skip games already graded against their current score.
+    When any pick changed, the pickers' streaks and the week's user stats
+    are brought up to date.
+    """
+
+    @staticmethod
+    def team_aliases(name: str, abbrev: str) -> FrozenSet[str]:
+        """Every uppercase string a pick may use for this team"""
+        aliases = frozenset(value.strip().upper() for value in (name, abbrev) if value)
+        canonical = resolve_team(abbrev) or resolve_team(name)
+        return aliases | TEAM_ALIASES[canonical] if canonical else aliases
+
+    @staticmethod
+    def grade_game(game: GameCache, refresh_stats: bool = True) -> int:
+        """Grade every pick for a final game and mark it graded. Returns the number of picks changed (not committed)."""
+        if not game.is_final():
+            return 0
+        if game.home_score is None or game.away_score is None:
+            logger.warning(f"Skipping pick grading for game {game.game_id} - missing scores")
+            return 0
+
+        home_aliases = PickGrader.team_aliases(game.home_team, game.home_team_abbrev)
+        away_aliases = PickGrader.team_aliases(game.away_team, game.away_team_abbrev) - home_aliases
+        picked = func.upper(func.trim(Pick.team_picked))
+        outcome = case(
+            (picked.in_(home_aliases), game.home_score > game.away_score),
+            (picked.in_(away_aliases), game.away_score > game.home_score),
+            else_=None
+        )
+
+        now = datetime.utcnow()
+        result = db.session.execute(
+            update(Pick)
+            .where(Pick.game_id == game.game_id, Pick.is_correct.is_distinct_from(outcome))
+            .values(is_correct=outcome, updated_at=now)
+            .execution_options(synchronize_session=False)
+        )
+        game.mark_graded(now)
+        if result.rowcount:
+            logger.info(f"Graded game {game.game_id} ({game.away_team} {game.away_score} @ "
+                        f"{game.home_team} {game.home_score}): {result.rowcount} picks changed")
+            Streaks.apply_game(game)
+            RenderCache.invalidate()
+            if refresh_stats:
+                UserStats.refresh([game.week])
+        return result.rowcount
+
+    @staticmethod
+    def grade_games(games: Iterable[GameCache]) -> int:
+        """Grade several games in kickoff order; one UPDATE each, then one stats refresh. Returns total picks changed (not committed)."""
+        changed = 0
+        changed_weeks = set()
+        for game in sorted(games, key=kickoff_order):
+            game_changed = PickGrader.grade_game(game, refresh_stats=False)
+            if game_changed:
+                changed += game_changed
+                changed_weeks.add(game.week)
+        UserStats.refresh(changed_weeks)
+        return changed
+
+    @staticmethod
+    def grade_submitted(user_id: int, game_ids: Iterable[str]) -> int:
+        """
+        Grade picks a user just submitted for games that are already final.
+
+        Admins can still edit picks once a game is graded, and those games
+        won't come up for grading again by score. Also replays the user's
+        streak, since a submission can remove decided picks too. Returns
+        picks changed (not committed).
+        """
+        game_ids = set(game_ids)
+        if not game_ids:
+            return 0
+        games = [game for game in GameCache.query.filter(GameCache.game_id.in_(game_ids)) if game.is_final()]
+        if not games:
+            return 0
+        db.session.flush()
+        changed = PickGrader.grade_games(games)
+        Streaks.rebuild([user_id])
+        return changed
+
+
+@GameEvents.subscribe(GameEvents.FINAL, GameEvents.SCORE_CORRECTED)
+def _grade_on_final(game):
+    PickGrader.grade_game(game)
@@ -0,0 +1,212 @@
+from functools import wraps
+from typing import Dict, Optional
+import logging
+import os
+import sqlite3
+import threading
+import time
+import zlib
+
+from flask import current_app, has_app_context, request, session
+from flask_login import current_user
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.extensions import db
+from app.services.week_resolver import WeekResolver
+from config import instance_path
+
+logger = logging.getLogger(__name__)
+
+DEFAULTS = {
+    'RENDER_CACHE_ENABLED': True,
+    'RENDER_CACHE_PATH': os.path.join(instance_path, 'render_cache.db'),
+    'RENDER_CACHE_MAX_ENTRIES': 500,
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS pages (
+    key TEXT PRIMARY KEY,
+    body BLOB NOT NULL,
+    created_at REAL NOT NULL,
+    last_hit REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_pages_last_hit ON pages (last_hit);
+CREATE TABLE IF NOT EXISTS data_version (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    version INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO data_version (id, version) VALUES (1, 0);
+"""
+
+
+def _setting(name):
+    if has_app_context():
+        return current_app.config.get(name, DEFAULTS[name])
+    return DEFAULTS[name]
+
+
+class RenderCache:
+    """
+    Rendered pages shared by every worker process, in a local SQLite file.
+
+    Pages are keyed by route, view arguments, query string, viewer, current
+    NFL week and the data version. Game ingest, pick grading, MNF scoring,
+    pick submission and user changes bump the version once their
+    transaction commits (see invalidate), so a cached page is never served
+    across a data change;
+    old entries just stop being hit and are evicted, least recently hit
+    first, once there are more than RENDER_CACHE_MAX_ENTRIES.
+    """
+    _lock = threading.Lock()
+    _initialized_paths = set()
+
+    @classmethod
+    def _connect(cls) -> sqlite3.Connection:
+        path = _setting('RENDER_CACHE_PATH')
+        conn = sqlite3.connect(path, timeout=5)
+        if path not in cls._initialized_paths:
+            with cls._lock:
+                conn.execute('PRAGMA journal_mode=WAL')
+                conn.executescript(SCHEMA)
+                cls._initialized_paths.add(path)
+        conn.execute('PRAGMA synchronous=NORMAL')
+        return conn
+
+    @staticmethod
+    def enabled() -> bool:
+        return bool(_setting('RENDER_CACHE_ENABLED'))
+
+    @classmethod
+    def data_version(cls) -> int:
+        conn = cls._connect()
+        try:
+            return conn.execute("SELECT version FROM data_version WHERE id = 1").fetchone()[0]
+        finally:
+            conn.close()
+
+    @classmethod
+    def bump(cls) -> None:
+        """Move to a new data version now (every cached page becomes stale)"""
+        try:
+            conn = cls._connect()
+            try:
+                with conn:
+                    conn.execute("UPDATE data_version SET version = version + 1 WHERE id = 1")
+            finally:
+                conn.close()
+        except Exception as e:
+            logger.error(f"Error bumping render cache version: {str(e)}")
+
+    @staticmethod
+    def invalidate() -> None:
+        """
+        Bump the data version when the current session next commits.
+
+        Bumping before the commit would let a page rendered from the old
+        data be cached under the new version.
+        """
+        db.session.info['render_cache_dirty'] = True
+
+    @classmethod
+    def get(cls, key: str) -> Optional[str]:
+        conn = cls._connect()
+        try:
+            row = conn.execute("SELECT body FROM pages WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            with conn:
+                conn.execute("UPDATE pages SET last_hit = ? WHERE key = ?", (time.time(), key))
+            return zlib.decompress(row[0]).decode('utf-8')
+        finally:
+            conn.close()
+
+    @classmethod
+    def put(cls, key: str, body: str) -> None:
+        now = time.time()
+        conn = cls._connect()
+        try:
+            with conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO pages (key, body, created_at, last_hit) VALUES (?, ?, ?, ?)",
+                    (key, zlib.compress(body.encode('utf-8'), 6), now, now)
+                )
+                conn.execute(
+                    "DELETE FROM pages WHERE key IN "
+                    "(SELECT key FROM pages ORDER BY last_hit DESC LIMIT -1 OFFSET ?)",
+                    (int(_setting('RENDER_CACHE_MAX_ENTRIES')),)
+                )
+        finally:
+            conn.close()
+
+    @classmethod
+    def clear(cls) -> None:
+        conn = cls._connect()
+        try:
+            with conn:
+                conn.execute("DELETE FROM pages")
+                conn.execute("UPDATE data_version SET version = version + 1 WHERE id = 1")
+        finally:
+            conn.close()
+
+    @classmethod
+    def stats(cls) -> Dict:
+        conn = cls._connect()
+        try:
+            entries, size = conn.execute("SELECT COUNT(*), COALESCE(SUM(LENGTH(body)), 0) FROM pages").fetchone()
+            version = conn.execute("SELECT version FROM data_version WHERE id = 1").fetchone()[0]
+        finally:
+            conn.close()
+        return {
+            'enabled': RenderCache.enabled(),
+            'entries': entries,
+            'max_entries': int(_setting('RENDER_CACHE_MAX_ENTRIES')),
+            'bytes': size,
+            'data_version': version
+        }
+
+
+def cached_page(view):
+    """
+    Serve a GET view from the render cache.
+
+    Only plain rendered pages are cached: requests with pending flash
+    messages and non-string responses (redirects, errors) always run the
+    view.
+    """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        if not RenderCache.enabled() or request.method != 'GET' or '_flashes' in session:
+            return view(*args, **kwargs)
+        try:
+            viewer = current_user.get_id() if current_user.is_authenticated else 'anon'
+            params = '&'.join(f'{k}={v}' for k, v in sorted(request.args.items(multi=True)))
+            view_args = ','.join(f'{k}={v}' for k, v in sorted(kwargs.items()))
+            current_week = WeekResolver.current()['week']
+            key = f"{request.endpoint}|{view_args}|{params}|{viewer}|w{current_week}|v{RenderCache.data_version()}"
+            body = RenderCache.get(key)
+        except Exception as e:
+            logger.error(f"Render cache lookup failed: {str(e)}")
+            return view(*args, **kwargs)
+        if body is not None:
+            return body
+
+        response = view(*args, **kwargs)
+        if isinstance(response, str):
+            try:
+                RenderCache.put(key, response)
+            except Exception as e:
+                logger.error(f"Render cache store failed: {str(e)}")
+        return response
+    return wrapper
+
+
+@event.listens_for(Session, 'after_commit')
+def _bump_after_commit(db_session):
+    if db_session.info.pop('render_cache_dirty', False):
+        RenderCache.bump()
+
+
+@event.listens_for(Session, 'after_rollback')
+def _forget_on_rollback(db_session):
+    db_session.info.pop('render_cache_dirty', None)
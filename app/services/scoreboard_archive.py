@@ -0,0 +1,216 @@
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional
+from urllib.parse import urlencode
+import logging
+import os
+import sqlite3
+import threading
+import time
+import zlib
+
+from flask import current_app, has_app_context
+from config import instance_path
+
+logger = logging.getLogger(__name__)
+
+DEFAULTS = {
+    'SCOREBOARD_ARCHIVE_PATH': os.path.join(instance_path, 'scoreboard_archive.db'),
+    'SCOREBOARD_CAPTURE': False,
+    'SCOREBOARD_REPLAY': False,
+    'SCOREBOARD_REPLAY_SPEED': 1.0,
+    'SCOREBOARD_REPLAY_FROM': None,
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS captures (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    params_key TEXT NOT NULL,
+    fetched_at REAL NOT NULL,
+    host TEXT,
+    body BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_captures_key_time ON captures (params_key, fetched_at);
+"""
+
+
+def _setting(name):
+    if has_app_context():
+        return current_app.config.get(name, DEFAULTS[name])
+    return DEFAULTS[name]
+
+
+class ScoreboardArchive:
+    """
+    Local archive of raw ESPN scoreboard responses.
+
+    With SCOREBOARD_CAPTURE enabled every scoreboard body fetched by
+    ESPNApiService is stored zlib-compressed in a separate SQLite file,
+    keyed by its query parameters and fetch time.
+
+    With SCOREBOARD_REPLAY enabled ESPNApiService serves captures instead
+    of going to the network. Replay runs on a virtual clock starting at
+    SCOREBOARD_REPLAY_FROM (or the first capture) and advancing at
+    SCOREBOARD_REPLAY_SPEED times real time; each request gets the latest
+    capture for its parameters at that virtual time. A speed of 0 steps
+    through the captures of each query one per request instead.
+    """
+    _lock = threading.Lock()
+    _initialized_paths = set()
+    _replay_started: Optional[float] = None
+    _replay_origin: Optional[float] = None
+    _replay_cursor: Dict[str, float] = {}
+
+    @staticmethod
+    def params_key(params: Dict) -> str:
+        """Canonical key for a set of query parameters"""
+        return urlencode(sorted((k, str(v)) for k, v in params.items()))
+
+    @classmethod
+    def _connect(cls, path: Optional[str] = None) -> sqlite3.Connection:
+        path = path or _setting('SCOREBOARD_ARCHIVE_PATH')
+        conn = sqlite3.connect(path, timeout=10)
+        if path not in cls._initialized_paths:
+            with cls._lock:
+                conn.executescript(SCHEMA)
+                cls._initialized_paths.add(path)
+        return conn
+
+    @staticmethod
+    def capture_enabled() -> bool:
+        return bool(_setting('SCOREBOARD_CAPTURE'))
+
+    @staticmethod
+    def replay_enabled() -> bool:
+        return bool(_setting('SCOREBOARD_REPLAY'))
+
+    @staticmethod
+    def archive_path() -> str:
+        return _setting('SCOREBOARD_ARCHIVE_PATH')
+
+    @classmethod
+    def capture(cls, params: Dict, body: bytes, host: Optional[str] = None,
+                fetched_at: Optional[float] = None, path: Optional[str] = None) -> None:
+        """
+        Store a raw response body.
+
+        Callers check capture_enabled() first; `path` lets fetch threads
+        without an app context write to the configured archive.
+        """
+        try:
+            conn = cls._connect(path)
+            try:
+                with conn:
+                    conn.execute(
+                        "INSERT INTO captures (params_key, fetched_at, host, body) VALUES (?, ?, ?, ?)",
+                        (cls.params_key(params), fetched_at or time.time(), host, zlib.compress(body, 6))
+                    )
+            finally:
+                conn.close()
+        except Exception as e:
+            logger.error(f"Error capturing scoreboard response: {str(e)}")
+
+    @classmethod
+    def reset_replay(cls):
+        """Restart the replay clock (and step cursors) from the beginning"""
+        with cls._lock:
+            cls._replay_started = None
+            cls._replay_origin = None
+            cls._replay_cursor = {}
+
+    @classmethod
+    def _replay_now(cls, conn: sqlite3.Connection) -> float:
+        with cls._lock:
+            if cls._replay_started is None:
+                origin = _setting('SCOREBOARD_REPLAY_FROM')
+                if origin:
+                    cls._replay_origin = datetime.fromisoformat(origin).timestamp()
+                else:
+                    first = conn.execute("SELECT MIN(fetched_at) FROM captures").fetchone()[0]
+                    cls._replay_origin = first or time.time()
+                cls._replay_started = time.monotonic()
+            elapsed = time.monotonic() - cls._replay_started
+            return cls._replay_origin + elapsed * float(_setting('SCOREBOARD_REPLAY_SPEED'))
+
+    @classmethod
+    def replay(cls, params: Dict) -> Optional[bytes]:
+        """Get the archived body to serve for `params` at the current replay time"""
+        key = cls.params_key(params)
+        conn = cls._connect()
+        try:
+            if float(_setting('SCOREBOARD_REPLAY_SPEED')) <= 0:
+                # Step mode: next capture for this query on every request
+                with cls._lock:
+                    after = cls._replay_cursor.get(key, float('-inf'))
+                row = conn.execute(
+                    "SELECT fetched_at, body FROM captures WHERE params_key = ? AND fetched_at > ? "
+                    "ORDER BY fetched_at ASC LIMIT 1", (key, after)
+                ).fetchone()
+                if row is None:
+                    # Exhausted - keep serving the last capture
+                    row = conn.execute(
+                        "SELECT fetched_at, body FROM captures WHERE params_key = ? "
+                        "ORDER BY fetched_at DESC LIMIT 1", (key,)
+                    ).fetchone()
+                if row is not None:
+                    with cls._lock:
+                        cls._replay_cursor[key] = row[0]
+            else:
+                now = cls._replay_now(conn)
+                row = conn.execute(
+                    "SELECT fetched_at, body FROM captures WHERE params_key = ? AND fetched_at <= ? "
+                    "ORDER BY fetched_at DESC LIMIT 1", (key, now)
+                ).fetchone()
+                if row is None:
+                    row = conn.execute(
+                        "SELECT fetched_at, body FROM captures WHERE params_key = ? "
+                        "ORDER BY fetched_at ASC LIMIT 1", (key,)
+                    ).fetchone()
+        finally:
+            conn.close()
+
+        if row is None:
+            logger.warning(f"No archived scoreboard for {key}")
+            return None
+        return zlib.decompress(row[1])
+
+    @classmethod
+    def iter_captures(cls, params_key: Optional[str] = None, path: Optional[str] = None) -> Iterator[Dict]:
+        """Iterate over captures in fetch order, decompressed"""
+        conn = cls._connect(path)
+        try:
+            query = "SELECT params_key, fetched_at, host, body FROM captures"
+            args = ()
+            if params_key:
+                query += " WHERE params_key = ?"
+                args = (params_key,)
+            for key, fetched_at, host, body in conn.execute(query + " ORDER BY fetched_at ASC", args):
+                yield {
+                    'params_key': key,
+                    'fetched_at': fetched_at,
+                    'host': host,
+                    'body': zlib.decompress(body)
+                }
+        finally:
+            conn.close()
+
+    @classmethod
+    def summary(cls, path: Optional[str] = None) -> List[Dict]:
+        """Captures per query: count, time range and compressed size"""
+        conn = cls._connect(path)
+        try:
+            rows = conn.execute(
+                "SELECT params_key, COUNT(*), MIN(fetched_at), MAX(fetched_at), SUM(LENGTH(body)) "
+                "FROM captures GROUP BY params_key ORDER BY params_key"
+            ).fetchall()
+        finally:
+            conn.close()
+        return [
+            {
+                'params_key': key,
+                'captures': count,
+                'first': datetime.fromtimestamp(first).isoformat(),
+                'last': datetime.fromtimestamp(last).isoformat(),
+                'compressed_bytes': size
+            }
+            for key, count, first, last, size in rows
+        ]
@@ -0,0 +1,95 @@
+from datetime import datetime
+from typing import Dict, Iterable, Optional
+import logging
+
+from app.extensions import db
+from app.models.game import GameCache
+from app.models.pick import Pick
+from app.models.stats import UserStreak
+
+logger = logging.getLogger(__name__)
+
+
+class Streaks:
+    """
+    Maintains per-user pick streaks (user_streak) in kickoff order.
+
+    Each row remembers the last game applied to it. When a game is graded
+    after that one, its picks extend the streaks in O(1) per user; a game
+    graded out of order, or a regraded game already applied (a score
+    correction), replays those users' decided picks from scratch instead.
+    """
+
+    @staticmethod
+    def apply_game(game: GameCache) -> int:
+        """Fold a graded game's picks into its pickers' streaks. Returns users updated (not committed)."""
+        if game.start_time is None:
+            return 0
+        picks = db.session.query(Pick.user_id, Pick.is_correct).filter(Pick.game_id == game.game_id).all()
+        if not picks:
+            return 0
+        rows = {row.user_id: row for row in
+                UserStreak.query.filter(UserStreak.user_id.in_({user_id for user_id, _ in picks}))}
+
+        replay = set()
+        for user_id, is_correct in picks:
+            row = rows.get(user_id)
+            if row is not None and row.applied(game.start_time, game.game_id):
+                replay.add(user_id)
+                continue
+            if is_correct is None:
+                continue
+            if row is None:
+                row = rows[user_id] = UserStreak(user_id=user_id)
+                row.reset()
+                db.session.add(row)
+            row.push(is_correct, game.start_time, game.game_id)
+
+        if replay:
+            logger.info(f"Game {game.game_id} graded out of kickoff order; replaying streaks of {len(replay)} users")
+            Streaks.rebuild(replay)
+        db.session.flush()
+        return len(picks)
+
+    @staticmethod
+    def rebuild(user_ids: Optional[Iterable[int]] = None) -> int:
+        """Replay decided picks in kickoff order for the given users (all users by default). Returns rows written (not committed)."""
+        criteria = [Pick.is_correct.isnot(None)]
+        stale = UserStreak.query
+        if user_ids is not None:
+            user_ids = set(user_ids)
+            criteria.append(Pick.user_id.in_(user_ids))
+            stale = stale.filter(UserStreak.user_id.in_(user_ids))
+        rows = {row.user_id: row for row in stale}
+
+        picks = db.session.query(Pick.user_id, Pick.is_correct, GameCache.start_time, GameCache.game_id) \
+            .join(GameCache, GameCache.game_id == Pick.game_id) \
+            .filter(*criteria, GameCache.start_time.isnot(None)) \
+            .order_by(Pick.user_id, GameCache.start_time, GameCache.game_id).all()
+
+        replayed = set()
+        for user_id, is_correct, kickoff, game_id in picks:
+            row = rows.get(user_id)
+            if row is None:
+                row = rows[user_id] = UserStreak(user_id=user_id)
+                db.session.add(row)
+            if user_id not in replayed:
+                row.reset()
+                replayed.add(user_id)
+            row.push(is_correct, kickoff, game_id)
+
+        for user_id, row in rows.items():
+            if user_id not in replayed:
+                db.session.delete(row)
+        db.session.flush()
+        return len(replayed)
+
+    @staticmethod
+    def for_users() -> Dict[int, Dict]:
+        """Streak info per user id"""
+        return {row.user_id: row.to_dict() for row in UserStreak.query}
+
+
+def kickoff_order(game: GameCache):
+    """Sort key putting games in the order Streaks applies them"""
+    return (game.start_time or datetime.min, game.game_id)
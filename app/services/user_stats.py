@@ -0,0 +1,110 @@
+from typing import Dict, Iterable, List, Optional
+import logging
+
+from sqlalchemy import case, func
+
+from app.extensions import db
+from app.models.pick import MNFPrediction, Pick
+from app.models.stats import UserWeekStats
+
+logger = logging.getLogger(__name__)
+
+
+class UserStats:
+    """
+    Maintains and reads the materialized user_week_stats table.
+
+    Whatever changes picks or MNF predictions (grading, MNF scoring, pick
+    submission) calls refresh() for the weeks it touched, which recomputes
+    just those rows with one GROUP BY over picks. Standings then read
+    records from the table instead of walking every user's picks.
+    """
+
+    @staticmethod
+    def refresh(weeks: Iterable[int], user_ids: Optional[Iterable[int]] = None) -> int:
+        """Recompute stats rows for the given weeks (and users). Returns rows written (not committed)."""
+        weeks = set(weeks)
+        if not weeks:
+            return 0
+        pick_criteria = [Pick.week.in_(weeks)]
+        mnf_criteria = [MNFPrediction.week.in_(weeks)]
+        stats_criteria = [UserWeekStats.week.in_(weeks)]
+        if user_ids is not None:
+            user_ids = set(user_ids)
+            pick_criteria.append(Pick.user_id.in_(user_ids))
+            mnf_criteria.append(MNFPrediction.user_id.in_(user_ids))
+            stats_criteria.append(UserWeekStats.user_id.in_(user_ids))
+
+        counts = db.session.query(
+            Pick.user_id, Pick.week,
+            func.sum(case((Pick.is_correct.is_(True), 1), else_=0)),
+            func.sum(case((Pick.is_correct.is_(False), 1), else_=0)),
+            func.count(Pick.is_correct),
+            func.count(Pick.id)
+        ).filter(*pick_criteria).group_by(Pick.user_id, Pick.week).all()
+        predictions = db.session.query(
+            MNFPrediction.user_id, MNFPrediction.week, MNFPrediction.total_points,
+            MNFPrediction.points_off, MNFPrediction.is_over
+        ).filter(*mnf_criteria).order_by(MNFPrediction.id).all()
+
+        fresh = {}
+        for user_id, week, wins, losses, decided, possible in counts:
+            fresh[(user_id, week)] = {'wins': wins, 'losses': losses, 'decided': decided, 'possible': possible}
+        for user_id, week, prediction, points_off, is_over in predictions:
+            # Latest prediction wins if a user somehow has several for a week
+            fresh.setdefault((user_id, week), {'wins': 0, 'losses': 0, 'decided': 0, 'possible': 0}).update(
+                mnf_prediction=prediction, mnf_points_off=points_off, mnf_is_over=is_over)
+
+        existing = {(row.user_id, row.week): row for row in UserWeekStats.query.filter(*stats_criteria)}
+        for key, values in fresh.items():
+            row = existing.pop(key, None)
+            if row is None:
+                row = UserWeekStats(user_id=key[0], week=key[1])
+                db.session.add(row)
+            values.setdefault('mnf_prediction', None)
+            values.setdefault('mnf_points_off', None)
+            values.setdefault('mnf_is_over', None)
+            for field, value in values.items():
+                if getattr(row, field) != value:
+                    setattr(row, field, value)
+        for row in existing.values():
+            db.session.delete(row)
+        db.session.flush()
+        logger.debug("Refreshed %s user week stats for weeks %s", len(fresh), sorted(weeks))
+        return len(fresh)
+
+    @staticmethod
+    def rebuild() -> int:
+        """Recompute every stats row from scratch. Returns rows written (not committed)."""
+        weeks = {week for (week,) in db.session.query(Pick.week).distinct()}
+        weeks |= {week for (week,) in db.session.query(MNFPrediction.week).distinct()}
+        weeks |= {week for (week,) in db.session.query(UserWeekStats.week).distinct()}
+        return UserStats.refresh(weeks)
+
+    @staticmethod
+    def week_records(week: int) -> Dict[int, UserWeekStats]:
+        """Stats row per user id for one week"""
+        return {row.user_id: row for row in UserWeekStats.query.filter_by(week=week)}
+
+    @staticmethod
+    def season_records() -> Dict[int, Dict]:
+        """Season record per user id, in the shape of User.get_season_record"""
+        rows = db.session.query(
+            UserWeekStats.user_id,
+            func.sum(UserWeekStats.wins), func.sum(UserWeekStats.losses),
+            func.sum(UserWeekStats.decided), func.sum(UserWeekStats.possible)
+        ).group_by(UserWeekStats.user_id).all()
+        return {
+            user_id: {'wins': wins, 'losses': losses, 'total': decided, 'total_possible': possible}
+            for user_id, wins, losses, decided, possible in rows
+        }
+
+    @staticmethod
+    def weekly_wins(through_week: int) -> Dict[int, List[int]]:
+        """Wins per week (weeks 1..through_week, zero-filled) per user id"""
+        trends = {}
+        rows = db.session.query(UserWeekStats.user_id, UserWeekStats.week, UserWeekStats.wins) \
+            .filter(UserWeekStats.week.between(1, through_week)).all()
+        for user_id, week, wins in rows:
+            trends.setdefault(user_id, [0] * through_week)[week - 1] = wins
+        return trends
@@ -0,0 +1,206 @@
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+import logging
+import threading
+import time
+
+from flask import current_app, has_app_context
+from sqlalchemy import func
+
+from app.extensions import db
+from app.models.game import GameCache, SeasonWeek
+from app.services.espn_api import ESPNApiService
+
+logger = logging.getLogger(__name__)
+
+
+class WeekResolver:
+    """
+    Resolve the current NFL week from locally stored data.
+
+    The week is worked out from the stored season calendar (SeasonWeek) and,
+    failing that, from GameCache kickoff times, so it never touches the
+    network while a page is rendering. Results are cached in-process for
+    CURRENT_WEEK_TTL seconds. When the stored calendar is missing or older
+    than SEASON_CALENDAR_MAX_AGE seconds a background thread refreshes it
+    from ESPN; callers keep getting the last resolved value meanwhile.
+    """
+    _cached: Optional[Dict] = None
+    _expires_at = 0.0
+    _lock = threading.Lock()
+    _refreshing = False
+
+    @classmethod
+    def current(cls) -> Dict:
+        """Get the current week info: {'week', 'season_type', 'year'}"""
+        now = time.monotonic()
+        cached = cls._cached
+        if cached is not None and now < cls._expires_at:
+            return dict(cached)
+
+        with cls._lock:
+            if cls._cached is not None and time.monotonic() < cls._expires_at:
+                return dict(cls._cached)
+            try:
+                week_info = cls.resolve()
+            except Exception as e:
+                logger.error(f"Error resolving current week: {str(e)}")
+                if cls._cached is not None:
+                    return dict(cls._cached)
+                week_info = cls.default_week_info()
+            cls._cached = week_info
+            cls._expires_at = time.monotonic() + cls._setting('CURRENT_WEEK_TTL', 300)
+
+        cls.refresh_in_background_if_stale()
+        return dict(week_info)
+
+    @classmethod
+    def invalidate(cls):
+        """Drop the cached value so the next call resolves again"""
+        with cls._lock:
+            cls._expires_at = 0.0
+
+    @classmethod
+    def resolve(cls, when: Optional[datetime] = None) -> Dict:
+        """Resolve the week for a UTC time (defaults to now) from the database"""
+        when = when or datetime.utcnow()
+        return (
+            cls._from_calendar(when)
+            or cls._from_kickoffs(when)
+            or cls.default_week_info(when)
+        )
+
+    @staticmethod
+    def _from_calendar(when: datetime) -> Optional[Dict]:
+        entry = SeasonWeek.query.filter(
+            SeasonWeek.start_date <= when,
+            SeasonWeek.end_date > when
+        ).order_by(SeasonWeek.season_type.desc()).first()
+        if entry:
+            return entry.to_week_info()
+
+        # Between seasons: before the next season starts show its week 1,
+        # after the last stored week keep showing that week.
+        upcoming = SeasonWeek.query.filter(
+            SeasonWeek.start_date > when,
+            SeasonWeek.season_type == 2
+        ).order_by(SeasonWeek.start_date.asc()).first()
+        if upcoming and upcoming.week == 1:
+            return upcoming.to_week_info()
+
+        latest = SeasonWeek.query.filter(
+            SeasonWeek.end_date <= when
+        ).order_by(SeasonWeek.end_date.desc()).first()
+        if latest:
+            return latest.to_week_info()
+
+        return upcoming.to_week_info() if upcoming else None
+
+    @staticmethod
+    def _from_kickoffs(when: datetime) -> Optional[Dict]:
+        # The week of the next game still to be played (or just kicked off),
+        # otherwise the week of the most recent game.
+        game = GameCache.query.filter(
+            GameCache.start_time >= when - timedelta(hours=12)
+        ).order_by(GameCache.start_time.asc()).first()
+        if not game:
+            game = GameCache.query.order_by(GameCache.start_time.desc()).first()
+        if not game:
+            return None
+        return {
+            'week': game.week,
+            'season_type': game.season_type or 2,
+            'year': game.year
+        }
+
+    @staticmethod
+    def default_week_info(when: Optional[datetime] = None) -> Dict:
+        """Week 1 of the season in progress (seasons start in September)"""
+        when = when or datetime.utcnow()
+        year = when.year if when.month >= 9 else when.year - 1
+        return {
+            'week': 1,
+            'season_type': 2,
+            'year': year
+        }
+
+    @classmethod
+    def calendar_is_stale(cls) -> bool:
+        last_fetch = db.session.query(func.max(SeasonWeek.fetched_at)).scalar()
+        if last_fetch is None:
+            return True
+        max_age = cls._setting('SEASON_CALENDAR_MAX_AGE', 6 * 3600)
+        return datetime.utcnow() - last_fetch > timedelta(seconds=max_age)
+
+    @classmethod
+    def refresh_in_background_if_stale(cls):
+        """Start a calendar refresh thread if the stored calendar is stale"""
+        if cls._refreshing or not has_app_context():
+            return
+        if not cls._setting('SEASON_CALENDAR_AUTO_REFRESH', True):
+            return
+        try:
+            if not cls.calendar_is_stale():
+                return
+        except Exception as e:
+            logger.error(f"Error checking season calendar age: {str(e)}")
+            return
+
+        with cls._lock:
+            if cls._refreshing:
+                return
+            cls._refreshing = True
+
+        app = current_app._get_current_object()
+
+        def run():
+            try:
+                with app.app_context():
+                    cls.refresh_calendar()
+            finally:
+                cls._refreshing = False
+
+        threading.Thread(target=run, name='season-calendar-refresh', daemon=True).start()
+
+    @classmethod
+    def refresh_calendar(cls) -> int:
+        """Fetch the season calendar from ESPN and store it. Returns weeks stored."""
+        weeks = ESPNApiService.get_season_calendar()
+        if not weeks:
+            logger.warning("No season calendar received, keeping stored calendar")
+            return 0
+
+        try:
+            fetched_at = datetime.utcnow()
+            existing = {
+                (row.year, row.season_type, row.week): row
+                for row in SeasonWeek.query.filter_by(year=weeks[0]['year']).all()
+            }
+            for entry in weeks:
+                row = existing.get((entry['year'], entry['season_type'], entry['week']))
+                if not row:
+                    row = SeasonWeek(
+                        year=entry['year'],
+                        season_type=entry['season_type'],
+                        week=entry['week']
+                    )
+                    db.session.add(row)
+                row.label = entry['label']
+                row.start_date = entry['start_date']
+                row.end_date = entry['end_date']
+                row.fetched_at = fetched_at
+            db.session.commit()
+            logger.info(f"Stored {len(weeks)} season calendar weeks")
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Error storing season calendar: {str(e)}")
+            return 0
+
+        cls.invalidate()
+        return len(weeks)
+
+    @staticmethod
+    def _setting(name, default):
+        if has_app_context():
+            return current_app.config.get(name, default)
+        return default
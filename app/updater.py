@@ -0,0 +1,81 @@
+"""
+Standalone game updater.
+
+Web workers only read the game cache; this process is the one writer that
+polls ESPN. A lock file (UPDATER_LOCK_PATH) makes sure only one updater
+runs per host, however many are started.
+
+    python -m app.updater           # poll on the adaptive schedule until stopped
+    python -m app.updater --once    # poll the current week once and exit
+    python -m app.updater --wait    # wait for the lock instead of exiting
+"""
+import argparse
+import logging
+import signal
+import sys
+import threading
+
+from app import create_app
+from app.extensions import db
+from app.scheduler import init_scheduler, publish_updater_stats
+from app.services.game_service import GameService
+from app.utils.process_lock import ProcessLock
+
+# Named explicitly: under `python -m` this module's __name__ is '__main__'
+logger = logging.getLogger('app.updater')
+
+
+def start_in_process(app):
+    """
+    Run the updater on background threads of this app process (IN_PROCESS_UPDATER).
+
+    Only the first process to take the updater lock starts it, so several
+    workers sharing the flag still poll ESPN once.
+    """
+    lock = ProcessLock(app.config['UPDATER_LOCK_PATH'])
+    if not lock.acquire():
+        logger.info(f"Updater already running in pid {lock.holder()}; not starting one here")
+        return None
+    app.extensions['updater_lock'] = lock
+    return init_scheduler(app)
+
+
+def run(app, once: bool = False, wait: bool = False) -> int:
+    lock = ProcessLock(app.config['UPDATER_LOCK_PATH'])
+    if not lock.acquire(blocking=wait):
+        logger.error(f"Another updater is running (pid {lock.holder()}); exiting")
+        return 1
+
+    try:
+        if once:
+            with app.app_context():
+                games = GameService.update_week_games(force=True)
+                publish_updater_stats()
+                db.session.remove()
+            logger.info(f"Updated {len(games)} games")
+            return 0
+
+        stopping = threading.Event()
+        for signum in (signal.SIGTERM, signal.SIGINT):
+            signal.signal(signum, lambda *_: stopping.set())
+
+        scheduler = init_scheduler(app)
+        logger.info("Game updater started")
+        stopping.wait()
+        logger.info("Game updater stopping")
+        scheduler.shutdown(wait=True)
+        return 0
+    finally:
+        lock.release()
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m app.updater', description='Poll ESPN and update the game cache.')
+    parser.add_argument('--once', action='store_true', help='poll the current week once and exit')
+    parser.add_argument('--wait', action='store_true', help='wait for the updater lock instead of exiting')
+    args = parser.parse_args(argv)
+    return run(create_app(), once=args.once, wait=args.wait)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -3,13 +3,13 @@ import json
 from datetime import datetime
 from app.models.game import GameCache
 from app.extensions import db
-
-ESPN_NFL_API = 'https://site.api.espn.com/apis/site/v2/sports/football/nfl/scoreboard'
+from app.services.http_session import HttpSession
+from app.services.espn_api import ESPNApiService
 
 def fetch_games():
     """Fetch game data from ESPN API."""
     try:
-        response = requests.get(ESPN_NFL_API)
+        response = HttpSession.get(f"{ESPNApiService.BASE_URL}/scoreboard", timeout=10)
         response.raise_for_status()
         return response.json()
     except requests.RequestException as e:
@@ -85,10 +85,3 @@ def get_week_games(week):
 def get_mnf_games(week):
     """Get Monday Night Football games for a specific week."""
     return GameCache.query.filter_by(week=week, is_mnf=True).all()
-
-def get_current_week():
-    """Get the current NFL week."""
-    data = fetch_games()
-    if data and 'week' in data:
-        return data['week']['number']
-    return None
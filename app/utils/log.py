@@ -0,0 +1,175 @@
+import atexit
+import json
+import logging
+import queue
+import zlib
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Optional
+
+# Subsystem name -> logger it controls. Setting a subsystem's level applies
+# to that logger and everything below it.
+SUBSYSTEMS = {
+    'app': 'app',
+    'espn': 'app.services.espn_api',
+    'http': 'app.services.http_session',
+    'ingest': 'app.services.game_service',
+    'scheduler': 'app.scheduler',
+    'updater': 'app.updater',
+    'web': 'app.main',
+    'admin': 'app.admin',
+    'picks': 'app.picks',
+}
+
+_listener: Optional[QueueListener] = None
+_game_sample_rate = 1.0
+
+
+class Lazy:
+    """
+    Defer building a log argument until a handler actually formats it.
+
+    logger.debug("Payload: %s", Lazy(json.dumps, payload)) never calls
+    json.dumps while DEBUG is off for that logger.
+    """
+    __slots__ = ('func', 'args')
+
+    def __init__(self, func, *args):
+        self.func = func
+        self.args = args
+
+    def __str__(self):
+        return str(self.func(*self.args))
+
+    __repr__ = __str__
+
+
+class StructuredFormatter(logging.Formatter):
+    """
+    One line per record: plain text followed by key=value fields, or a JSON
+    object when `as_json` is set. Fields come from `extra={'fields': {...}}`.
+    """
+
+    def __init__(self, as_json: bool = False):
+        super().__init__()
+        self.as_json = as_json
+
+    def format(self, record):
+        fields = getattr(record, 'fields', None) or {}
+        timestamp = datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(timespec='milliseconds')
+        message = record.getMessage()
+        if self.as_json:
+            entry = {
+                'ts': timestamp,
+                'level': record.levelname,
+                'logger': record.name,
+                'msg': message,
+            }
+            entry.update(fields)
+            if record.exc_info:
+                entry['exc'] = self.formatException(record.exc_info)
+            return json.dumps(entry, default=str)
+
+        line = f"{timestamp} {record.levelname} {record.name}: {message}"
+        if fields:
+            line += ' ' + ' '.join(f"{key}={value}" for key, value in fields.items())
+        if record.exc_info:
+            line += '\n' + self.formatException(record.exc_info)
+        return line
+
+
+def parse_levels(spec: Optional[str]) -> Dict[str, str]:
+    """Parse 'espn=DEBUG,ingest=WARNING' into {'espn': 'DEBUG', 'ingest': 'WARNING'}"""
+    levels = {}
+    for item in (spec or '').split(','):
+        if '=' not in item:
+            continue
+        name, level = item.split('=', 1)
+        levels[name.strip()] = level.strip().upper()
+    return levels
+
+
+def check_level(subsystem: str, level: str) -> str:
+    """Validate a subsystem and level name. Returns the level name (uppercase)."""
+    if subsystem not in SUBSYSTEMS:
+        raise ValueError(f"Unknown log subsystem: {subsystem}")
+    level = str(level).upper()
+    if not isinstance(logging.getLevelName(level), int):
+        raise ValueError(f"Unknown log level: {level}")
+    return level
+
+
+def set_level(subsystem: str, level: str) -> str:
+    """Set a subsystem's log level in this process. Returns the level name applied."""
+    level = check_level(subsystem, level)
+    logging.getLogger(SUBSYSTEMS[subsystem]).setLevel(level)
+    return level
+
+
+def levels() -> Dict[str, str]:
+    """Effective level of every subsystem"""
+    return {
+        name: logging.getLevelName(logging.getLogger(logger_name).getEffectiveLevel())
+        for name, logger_name in SUBSYSTEMS.items()
+    }
+
+
+def game_sample_rate() -> float:
+    return _game_sample_rate
+
+
+def set_game_sample_rate(rate: float):
+    global _game_sample_rate
+    _game_sample_rate = min(max(float(rate), 0.0), 1.0)
+
+
+def game_sampled(game_id) -> bool:
+    """
+    Whether per-game debug lines for this game should be written.
+
+    Sampling is by game id rather than random, so a sampled game is traced
+    on every poll instead of showing up in scattered fragments.
+    """
+    if _game_sample_rate >= 1.0:
+        return True
+    return zlib.crc32(str(game_id).encode()) % 10000 < _game_sample_rate * 10000
+
+
+def game_debug(logger: logging.Logger, game_id, msg: str, *args):
+    """Log a per-game DEBUG line if DEBUG is on and the game is sampled"""
+    if logger.isEnabledFor(logging.DEBUG) and game_sampled(game_id):
+        logger.debug(msg, *args)
+
+
+def configure_logging(app):
+    """
+    Route the app's logs through a queue to a single writer thread.
+
+    Request and poller threads put records on an in-memory queue; the
+    listener thread applies the formatter and writes them, so slow stderr
+    or log shipping never blocks a request. The message itself (including
+    Lazy arguments) is still merged on the calling thread, by
+    QueueHandler.prepare, but only for records that pass the level check.
+    Levels come from LOG_LEVEL and LOG_LEVELS and can be changed later with
+    set_level() (in every process, through app.services.log_settings).
+    """
+    global _listener
+
+    root = logging.getLogger(SUBSYSTEMS['app'])
+    if _listener is None:
+        handler = logging.StreamHandler()
+        handler.setFormatter(StructuredFormatter(as_json=app.config.get('LOG_FORMAT') == 'json'))
+        log_queue = queue.SimpleQueue()
+        _listener = QueueListener(log_queue, handler, respect_handler_level=True)
+        _listener.start()
+        atexit.register(_listener.stop)
+        root.handlers = [QueueHandler(log_queue)]
+        root.propagate = False
+
+    root.setLevel(app.config.get('LOG_LEVEL', 'INFO'))
+    for name, level in parse_levels(app.config.get('LOG_LEVELS')).items():
+        try:
+            set_level(name, level)
+        except ValueError as e:
+            root.warning(f"Ignoring log level setting: {str(e)}")
+    set_game_sample_rate(app.config.get('LOG_GAME_SAMPLE_RATE', 1.0))
@@ -0,0 +1,59 @@
+import fcntl
+import os
+from typing import Optional
+
+
+class ProcessLock:
+    """
+    Exclusive advisory lock on a file, held for the life of a process.
+
+    Only one process on the host can hold a given lock path; the kernel
+    drops it when the holder exits, so a crashed updater never leaves a
+    stale lock behind. The holder's pid is written into the file.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._fd: Optional[int] = None
+
+    @property
+    def held(self) -> bool:
+        return self._fd is not None
+
+    def acquire(self, blocking: bool = False) -> bool:
+        """Take the lock; without `blocking`, return False at once if another process holds it"""
+        if self._fd is not None:
+            return True
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            os.close(fd)
+            return False
+        os.ftruncate(fd, 0)
+        os.write(fd, str(os.getpid()).encode())
+        self._fd = fd
+        return True
+
+    def release(self) -> None:
+        if self._fd is None:
+            return
+        fcntl.flock(self._fd, fcntl.LOCK_UN)
+        os.close(self._fd)
+        self._fd = None
+
+    def holder(self) -> Optional[int]:
+        """Pid written by the current holder, if any"""
+        try:
+            with open(self.path) as f:
+                return int(f.read().strip() or 0) or None
+        except (OSError, ValueError):
+            return None
+
+    def __enter__(self):
+        if not self.acquire():
+            raise RuntimeError(f"Lock {self.path} is held by pid {self.holder()}")
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
@@ -0,0 +1,66 @@
+"""
+Per-request SQL statement budgets.
+
+    @bp.route('/standings')
+    @query_budget(25)
+    def standings(): ...
+
+counts every statement the view executes on its thread. Going over the
+budget logs a warning, or raises QueryBudgetExceeded when
+QUERY_BUDGET_STRICT is set or the app is testing, so a page that starts
+issuing a query per user fails loudly instead of slowly.
+"""
+import logging
+import threading
+from functools import wraps
+
+from flask import current_app
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+_local = threading.local()
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+@event.listens_for(Engine, 'before_cursor_execute')
+def _count_statement(conn, cursor, statement, parameters, context, executemany):
+    for counter in getattr(_local, 'counters', ()):
+        counter.count += 1
+
+
+class QueryCounter:
+    """Context manager counting SQL statements executed on this thread while active"""
+
+    def __init__(self):
+        self.count = 0
+
+    def __enter__(self):
+        if not hasattr(_local, 'counters'):
+            _local.counters = []
+        _local.counters.append(self)
+        return self
+
+    def __exit__(self, *exc):
+        _local.counters.remove(self)
+
+
+def query_budget(limit: int):
+    """Decorator flagging a view that runs more than `limit` SQL statements"""
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            with QueryCounter() as counter:
+                response = view(*args, **kwargs)
+            if counter.count > limit:
+                message = f"{view.__name__} ran {counter.count} SQL statements (budget {limit})"
+                if current_app.config.get('QUERY_BUDGET_STRICT') or current_app.testing:
+                    raise QueryBudgetExceeded(message)
+                logger.warning(message)
+            return response
+        return wrapper
+    return decorator
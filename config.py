@@ -18,3 +18,62 @@ class Config:
     UPLOAD_FOLDER = os.path.join(basedir, 'app/static/uploads')
     MAX_CONTENT_LENGTH = 16 * 1024 * 1024  # 16MB max file size
     ALLOWED_EXTENSIONS = {'png', 'jpg', 'jpeg', 'gif'}
+
+    # ESPN API hosts (override to use a local stand-in, see scripts/espn_standin.py)
+    ESPN_BASE_URL = os.environ.get('ESPN_BASE_URL')
+    ESPN_ALT_URL = os.environ.get('ESPN_ALT_URL')
+
+    # ESPN API HTTP session (connection pooling / retries)
+    ESPN_POOL_CONNECTIONS = int(os.environ.get('ESPN_POOL_CONNECTIONS', 4))  # hosts kept in the pool
+    ESPN_POOL_MAXSIZE = int(os.environ.get('ESPN_POOL_MAXSIZE', 8))  # keep-alive connections per host
+    ESPN_POOL_BLOCK = os.environ.get('ESPN_POOL_BLOCK', 'false').lower() == 'true'
+    ESPN_MAX_RETRIES = int(os.environ.get('ESPN_MAX_RETRIES', 2))
+    ESPN_BACKOFF_FACTOR = float(os.environ.get('ESPN_BACKOFF_FACTOR', 0.3))
+    ESPN_BACKOFF_JITTER = float(os.environ.get('ESPN_BACKOFF_JITTER', 0.2))
+    ESPN_FETCH_MODE = os.environ.get('ESPN_FETCH_MODE', 'hedged')  # hedged, race or sequential
+    ESPN_HEDGE_DELAY = float(os.environ.get('ESPN_HEDGE_DELAY', 0.75))  # seconds before trying the second host
+    ESPN_FETCH_DEADLINE = float(os.environ.get('ESPN_FETCH_DEADLINE', 8))  # seconds per logical fetch
+    ESPN_BREAKER_THRESHOLD = int(os.environ.get('ESPN_BREAKER_THRESHOLD', 3))  # consecutive failures before opening
+    ESPN_BREAKER_PROBE_INTERVAL = int(os.environ.get('ESPN_BREAKER_PROBE_INTERVAL', 30))  # seconds between probes
+
+    # Current week resolution (from the stored season calendar)
+    CURRENT_WEEK_TTL = int(os.environ.get('CURRENT_WEEK_TTL', 300))  # seconds
+    SEASON_CALENDAR_MAX_AGE = int(os.environ.get('SEASON_CALENDAR_MAX_AGE', 6 * 3600))  # seconds
+    SEASON_CALENDAR_AUTO_REFRESH = os.environ.get('SEASON_CALENDAR_AUTO_REFRESH', 'true').lower() == 'true'
+
+    # Game updates run in one process: `python -m app.updater` (or, with
+    # IN_PROCESS_UPDATER, whichever app process takes the lock first)
+    UPDATER_LOCK_PATH = os.environ.get('UPDATER_LOCK_PATH') or os.path.join(instance_path, 'updater.lock')
+    IN_PROCESS_UPDATER = os.environ.get('IN_PROCESS_UPDATER', 'false').lower() == 'true'
+
+    # Adaptive game polling (see app.scheduler.PollPlanner)
+    SCHEDULER_LIVE_INTERVAL = int(os.environ.get('SCHEDULER_LIVE_INTERVAL', 60))  # seconds between polls while games are live
+    SCHEDULER_IDLE_INTERVAL = int(os.environ.get('SCHEDULER_IDLE_INTERVAL', 6 * 3600))  # seconds between polls with no games pending
+    SCHEDULER_MIN_INTERVAL = int(os.environ.get('SCHEDULER_MIN_INTERVAL', 15))  # floor for any planned poll
+    POLL_HISTORY_DAYS = int(os.environ.get('POLL_HISTORY_DAYS', 30))  # days of polls kept for /admin/poll-schedule
+
+    # Decoded game payloads kept in memory for the cached read path
+    GAME_PAYLOAD_CACHE_SIZE = int(os.environ.get('GAME_PAYLOAD_CACHE_SIZE', 512))  # games
+    PRUNE_INTERVAL_HOURS = int(os.environ.get('PRUNE_INTERVAL_HOURS', 24))  # updater drops payloads of final weeks; 0 disables
+
+    # Scoreboard archive: record raw ESPN responses and/or replay them instead of the network
+    SCOREBOARD_ARCHIVE_PATH = os.environ.get('SCOREBOARD_ARCHIVE_PATH') or os.path.join(instance_path, 'scoreboard_archive.db')
+    SCOREBOARD_CAPTURE = os.environ.get('SCOREBOARD_CAPTURE', 'false').lower() == 'true'
+    SCOREBOARD_REPLAY = os.environ.get('SCOREBOARD_REPLAY', 'false').lower() == 'true'
+    SCOREBOARD_REPLAY_SPEED = float(os.environ.get('SCOREBOARD_REPLAY_SPEED', 1.0))  # 0 = step through captures
+    SCOREBOARD_REPLAY_FROM = os.environ.get('SCOREBOARD_REPLAY_FROM')  # ISO time to start replay at
+
+    # Rendered standings/head-to-head pages shared by all workers (see app.services.render_cache)
+    RENDER_CACHE_ENABLED = os.environ.get('RENDER_CACHE_ENABLED', 'true').lower() == 'true'
+    RENDER_CACHE_PATH = os.environ.get('RENDER_CACHE_PATH') or os.path.join(instance_path, 'render_cache.db')
+    RENDER_CACHE_MAX_ENTRIES = int(os.environ.get('RENDER_CACHE_MAX_ENTRIES', 500))  # pages
+
+    # Fail (instead of warn) when a page goes over its SQL statement budget
+    QUERY_BUDGET_STRICT = os.environ.get('QUERY_BUDGET_STRICT', 'false').lower() == 'true'
+
+    # Logging (levels can also be changed at runtime from /admin/log-levels)
+    LOG_LEVEL = os.environ.get('LOG_LEVEL', 'INFO')
+    LOG_LEVELS = os.environ.get('LOG_LEVELS', '')  # per subsystem, e.g. "espn=DEBUG,web=WARNING"
+    LOG_FORMAT = os.environ.get('LOG_FORMAT', 'text')  # text or json
+    LOG_GAME_SAMPLE_RATE = float(os.environ.get('LOG_GAME_SAMPLE_RATE', 0.1))  # share of games with per-game debug lines
+    LOG_SETTINGS_TTL = int(os.environ.get('LOG_SETTINGS_TTL', 30))  # seconds before a process picks up /admin/log-levels changes
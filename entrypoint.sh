@@ -33,6 +33,11 @@ init_database() {
         echo "Initializing database with admin user..."
         flask init-db || echo "Database initialization failed"
     fi
+
+    # Materialized standings data (cheap; catches up after upgrades and restores)
+    flask rebuild-user-stats || echo "User stats rebuild failed"
+    flask rebuild-consensus || echo "Consensus rebuild failed"
+    flask rebuild-streaks || echo "Streaks rebuild failed"
 }
 
 # Main execution
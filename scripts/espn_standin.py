@@ -0,0 +1,418 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the ESPN NFL API, for load and integration testing.
+
+Serves the two endpoints the app uses:
+
+    .../scoreboard                 (week, seasontype, dates, limit)
+    .../teams/<id>/schedule
+
+for a generated 18-week regular season whose games kick off, score and go
+final on a virtual clock. Any path prefix is accepted, so point the app at
+it with:
+
+    ESPN_BASE_URL=http://127.0.0.1:8765/apis/site/v2/sports/football/nfl
+    ESPN_ALT_URL=http://127.0.0.1:8766/apis/site/v2/sports/football/nfl
+
+Each port is a separate "host" with its own fault profile (latency,
+5xx rate, timeout rate, malformed JSON rate), so hedged fetches and the
+circuit breaker can be exercised. Everything can be changed while running:
+
+    curl localhost:8765/_control
+    curl -X POST localhost:8765/_control -d '{"clock": "2024-09-08T18:30:00Z", "speed": 60}'
+    curl -X POST localhost:8765/_control -d '{"faults": {"alt": {"error_rate": 1}}}'
+
+Usage:
+    python scripts/espn_standin.py --season 2024 --clock 2024-09-08T16:00:00Z --speed 30
+"""
+import argparse
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+# (ESPN team id, abbreviation, location, name)
+TEAMS = [
+    (22, 'ARI', 'Arizona', 'Cardinals'), (1, 'ATL', 'Atlanta', 'Falcons'),
+    (33, 'BAL', 'Baltimore', 'Ravens'), (2, 'BUF', 'Buffalo', 'Bills'),
+    (29, 'CAR', 'Carolina', 'Panthers'), (3, 'CHI', 'Chicago', 'Bears'),
+    (4, 'CIN', 'Cincinnati', 'Bengals'), (5, 'CLE', 'Cleveland', 'Browns'),
+    (6, 'DAL', 'Dallas', 'Cowboys'), (7, 'DEN', 'Denver', 'Broncos'),
+    (8, 'DET', 'Detroit', 'Lions'), (9, 'GB', 'Green Bay', 'Packers'),
+    (34, 'HOU', 'Houston', 'Texans'), (11, 'IND', 'Indianapolis', 'Colts'),
+    (30, 'JAX', 'Jacksonville', 'Jaguars'), (12, 'KC', 'Kansas City', 'Chiefs'),
+    (13, 'LV', 'Las Vegas', 'Raiders'), (24, 'LAC', 'Los Angeles', 'Chargers'),
+    (14, 'LAR', 'Los Angeles', 'Rams'), (15, 'MIA', 'Miami', 'Dolphins'),
+    (16, 'MIN', 'Minnesota', 'Vikings'), (17, 'NE', 'New England', 'Patriots'),
+    (18, 'NO', 'New Orleans', 'Saints'), (19, 'NYG', 'New York', 'Giants'),
+    (20, 'NYJ', 'New York', 'Jets'), (21, 'PHI', 'Philadelphia', 'Eagles'),
+    (23, 'PIT', 'Pittsburgh', 'Steelers'), (25, 'SF', 'San Francisco', '49ers'),
+    (26, 'SEA', 'Seattle', 'Seahawks'), (27, 'TB', 'Tampa Bay', 'Buccaneers'),
+    (10, 'TEN', 'Tennessee', 'Titans'), (28, 'WSH', 'Washington', 'Commanders'),
+]
+WEEKS = 18
+GAME_LENGTH = timedelta(hours=3, minutes=10)
+QUARTER_SCORES = (0, 3, 6, 7, 10, 13, 14)
+DATE_FORMAT = '%Y-%m-%dT%H:%MZ'
+
+FAULT_DEFAULTS = {
+    'latency_ms': 0,        # added to every response
+    'jitter_ms': 0,         # random extra latency, 0..jitter_ms
+    'error_rate': 0.0,      # share of requests answered with a 5xx
+    'timeout_rate': 0.0,    # share of requests that hang for hang_seconds
+    'hang_seconds': 30,
+    'malformed_rate': 0.0,  # share of requests answered with truncated JSON
+}
+
+
+def season_start(year):
+    """Thursday after Labor Day (first Monday in September), 00:20 UTC Friday"""
+    first = datetime(year, 9, 1, tzinfo=timezone.utc)
+    labor_day = first + timedelta(days=(7 - first.weekday()) % 7)
+    return labor_day + timedelta(days=4, minutes=20)
+
+
+def week_bounds(year, week):
+    """Tuesday 07:00 UTC to the next Tuesday, as on ESPN's calendar"""
+    start = season_start(year).replace(hour=7, minute=0) - timedelta(days=3)
+    start += timedelta(weeks=week - 1)
+    return start, start + timedelta(weeks=1)
+
+
+def build_season(year, seed):
+    """Every game of the season: round-robin pairings, fixed kickoff slots, seeded final scores"""
+    rng = random.Random(seed)
+    teams = list(TEAMS)
+    rng.shuffle(teams)
+    games = []
+    for week in range(1, WEEKS + 1):
+        # Circle method: team 0 fixed, the rest rotate one place per week
+        shift = (week - 1) % (len(teams) - 1)
+        rotated = [teams[0]] + teams[1 + shift:] + teams[1:1 + shift]
+        pairs = [(rotated[i], rotated[-1 - i]) for i in range(len(rotated) // 2)]
+        if week % 2 == 0:
+            pairs = [(away, home) for home, away in pairs]
+        week_start, _ = week_bounds(year, week)
+        thursday = week_start + timedelta(days=2)
+        sunday = week_start + timedelta(days=5)
+        slots = (
+            [thursday.replace(hour=0, minute=15) + timedelta(days=1)]          # TNF
+            + [sunday.replace(hour=17, minute=0)] * 9
+            + [sunday.replace(hour=20, minute=25)] * 4
+            + [sunday.replace(hour=0, minute=20) + timedelta(days=1)]          # SNF
+            + [sunday.replace(hour=0, minute=15) + timedelta(days=2)]          # MNF
+        )
+        for index, ((home, away), kickoff) in enumerate(zip(pairs, slots)):
+            home_final = [rng.choice(QUARTER_SCORES) for _ in range(4)]
+            away_final = [rng.choice(QUARTER_SCORES) for _ in range(4)]
+            overtime = sum(home_final) == sum(away_final)
+            if overtime:
+                (home_final if rng.random() < 0.5 else away_final).append(3)
+            games.append({
+                'id': f"4016{year % 100:02d}{week:02d}{index:02d}",
+                'week': week,
+                'kickoff': kickoff,
+                'home': home,
+                'away': away,
+                'home_quarters': home_final,
+                'away_quarters': away_final,
+                'overtime': overtime,
+                'mnf': index == len(slots) - 1,
+            })
+    return games
+
+
+class Clock:
+    """Virtual clock: starts at `origin` and runs at `speed` times real time"""
+
+    def __init__(self, origin, speed):
+        self.lock = threading.Lock()
+        self.set(origin, speed)
+
+    def set(self, origin=None, speed=None):
+        with self.lock:
+            if origin is None:
+                origin = self.now()
+            if speed is not None:
+                self.speed = float(speed)
+            self.origin = origin
+            self.started = time.monotonic()
+
+    def now(self):
+        return self.origin + timedelta(seconds=(time.monotonic() - self.started) * self.speed)
+
+
+class StandIn:
+    """Season state, virtual clock and per-host fault profiles shared by all listeners"""
+
+    def __init__(self, year, clock, seed):
+        self.year = year
+        self.clock = clock
+        self.games = build_season(year, seed)
+        self.faults = {}
+        self.counters = {}
+        self.lock = threading.Lock()
+
+    def current_week(self, now):
+        for week in range(1, WEEKS + 1):
+            if now < week_bounds(self.year, week)[1]:
+                return week
+        return WEEKS
+
+    def game_state(self, game, now):
+        """Status and scores of a game at virtual time `now`"""
+        elapsed = now - game['kickoff']
+        if elapsed < timedelta(0):
+            return 'STATUS_SCHEDULED', game['kickoff'].strftime('%a, %B %d at %H:%M UTC'), 0, 0, 0
+        if elapsed >= GAME_LENGTH:
+            detail = 'Final/OT' if game['overtime'] else 'Final'
+            name = 'STATUS_FINAL_OVERTIME' if game['overtime'] else 'STATUS_FINAL'
+            return name, detail, sum(game['home_quarters']), sum(game['away_quarters']), 4
+        period = min(int(elapsed / GAME_LENGTH * 4) + 1, 4)
+        home = sum(game['home_quarters'][:period - 1])
+        away = sum(game['away_quarters'][:period - 1])
+        if period == 3 and elapsed < GAME_LENGTH / 2 + timedelta(minutes=15):
+            return 'STATUS_HALFTIME', 'Halftime', home, away, 2
+        return 'STATUS_IN_PROGRESS', f"{period}Q", home, away, period
+
+    def event(self, game, now):
+        status, detail, home_score, away_score, period = self.game_state(game, now)
+        final = status.startswith('STATUS_FINAL')
+
+        def competitor(team, side, score):
+            espn_id, abbrev, location, name = team
+            entry = {
+                'id': str(espn_id),
+                'homeAway': side,
+                'score': str(score),
+                'team': {
+                    'id': str(espn_id),
+                    'abbreviation': abbrev,
+                    'location': location,
+                    'name': name,
+                    'displayName': f"{location} {name}",
+                },
+            }
+            if final:
+                entry['winner'] = score > (away_score if side == 'home' else home_score)
+            return entry
+
+        home_team, away_team = game['home'], game['away']
+        return {
+            'id': game['id'],
+            'date': game['kickoff'].strftime(DATE_FORMAT),
+            'name': f"{away_team[2]} {away_team[3]} at {home_team[2]} {home_team[3]}",
+            'shortName': f"{away_team[1]} @ {home_team[1]}",
+            'season': {'year': self.year, 'type': 2},
+            'week': {'number': game['week']},
+            'competitions': [{
+                'id': game['id'],
+                'date': game['kickoff'].strftime(DATE_FORMAT),
+                'venue': {
+                    'fullName': f"{home_team[2]} Stadium",
+                    'address': {'city': home_team[2], 'state': ''},
+                },
+                'competitors': [
+                    competitor(home_team, 'home', home_score),
+                    competitor(away_team, 'away', away_score),
+                ],
+                'broadcasts': [{'market': 'national', 'names': ['ESPN']}] if game['mnf'] else [],
+            }],
+            'notes': [{'headline': 'Monday Night Football'}] if game['mnf'] else [],
+            'status': {
+                'period': period,
+                'type': {'name': status, 'detail': detail, 'completed': final},
+            },
+        }
+
+    def calendar(self):
+        entries = []
+        for week in range(1, WEEKS + 1):
+            start, end = week_bounds(self.year, week)
+            entries.append({
+                'label': f"Week {week}",
+                'value': str(week),
+                'startDate': start.strftime(DATE_FORMAT),
+                'endDate': (end - timedelta(minutes=1)).strftime(DATE_FORMAT),
+            })
+        return [{'label': 'Regular Season', 'value': '2', 'entries': entries}]
+
+    def scoreboard(self, query):
+        now = self.clock.now()
+        week = int(query.get('week', self.current_week(now)))
+        limit = int(query.get('limit', 100))
+        events = [self.event(game, now) for game in self.games if game['week'] == week][:limit]
+        return {
+            'leagues': [{
+                'abbreviation': 'NFL',
+                'season': {'year': self.year, 'type': 2},
+                'calendar': self.calendar(),
+            }],
+            'season': {'year': self.year, 'type': 2},
+            'week': {'number': week},
+            'events': events,
+        }
+
+    def schedule(self, team_id):
+        now = self.clock.now()
+        events = [self.event(game, now) for game in self.games
+                  if team_id in (str(game['home'][0]), str(game['away'][0]))]
+        return {'events': events}
+
+    def fault(self, host, name):
+        profile = dict(FAULT_DEFAULTS)
+        profile.update(self.faults.get('all', {}))
+        profile.update(self.faults.get(host, {}))
+        return profile[name]
+
+    def count(self, host, outcome):
+        with self.lock:
+            per_host = self.counters.setdefault(host, {})
+            per_host[outcome] = per_host.get(outcome, 0) + 1
+
+    def control_state(self):
+        return {
+            'clock': self.clock.now().isoformat(),
+            'speed': self.clock.speed,
+            'season': self.year,
+            'current_week': self.current_week(self.clock.now()),
+            'faults': self.faults,
+            'counters': self.counters,
+        }
+
+    def apply_control(self, body):
+        if 'clock' in body or 'speed' in body:
+            origin = None
+            if body.get('clock'):
+                origin = datetime.fromisoformat(body['clock'].replace('Z', '+00:00'))
+            self.clock.set(origin, body.get('speed'))
+        if 'week' in body:
+            # Jump to just before the first kickoff of a week
+            first = min(game['kickoff'] for game in self.games if game['week'] == int(body['week']))
+            self.clock.set(first - timedelta(minutes=5))
+        for host, profile in body.get('faults', {}).items():
+            unknown = set(profile) - set(FAULT_DEFAULTS)
+            if unknown:
+                raise ValueError(f"unknown fault settings: {sorted(unknown)}")
+            self.faults.setdefault(host, {}).update(profile)
+        if body.get('reset_faults'):
+            self.faults = {}
+
+
+def make_handler(standin, host):
+    schedule_path = re.compile(r'/teams/(\d+)/schedule$')
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def log_message(self, format, *args):
+            pass
+
+        def send_body(self, status, body, headers=None):
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            for key, value in (headers or {}).items():
+                self.send_header(key, value)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            url = urlsplit(self.path)
+            if url.path == '/_control':
+                return self.send_body(200, json.dumps(standin.control_state()).encode())
+
+            time.sleep((standin.fault(host, 'latency_ms')
+                        + random.uniform(0, standin.fault(host, 'jitter_ms'))) / 1000)
+            roll = random.random()
+            if roll < standin.fault(host, 'timeout_rate'):
+                standin.count(host, 'timeout')
+                time.sleep(standin.fault(host, 'hang_seconds'))
+                return
+            roll -= standin.fault(host, 'timeout_rate')
+            if roll < standin.fault(host, 'error_rate'):
+                standin.count(host, '5xx')
+                return self.send_body(random.choice((500, 502, 503)), b'{"error": "injected"}')
+
+            query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+            match = schedule_path.search(url.path)
+            if url.path.endswith('/scoreboard'):
+                payload = standin.scoreboard(query)
+            elif match:
+                payload = standin.schedule(match.group(1))
+            else:
+                standin.count(host, '404')
+                return self.send_body(404, b'{"error": "not found"}')
+
+            body = json.dumps(payload, separators=(',', ':')).encode()
+            roll -= standin.fault(host, 'error_rate')
+            if roll < standin.fault(host, 'malformed_rate'):
+                standin.count(host, 'malformed')
+                return self.send_body(200, body[:len(body) // 2])
+
+            etag = '"' + hashlib.sha1(body).hexdigest()[:16] + '"'
+            if self.headers.get('If-None-Match') == etag:
+                standin.count(host, '304')
+                return self.send_body(304, b'', {'ETag': etag})
+            standin.count(host, '200')
+            self.send_body(200, body, {'ETag': etag})
+
+        def do_POST(self):
+            if urlsplit(self.path).path != '/_control':
+                return self.send_body(404, b'{"error": "not found"}')
+            length = int(self.headers.get('Content-Length') or 0)
+            try:
+                standin.apply_control(json.loads(self.rfile.read(length) or b'{}'))
+            except (ValueError, TypeError, KeyError) as e:
+                return self.send_body(400, json.dumps({'error': str(e)}).encode())
+            self.send_body(200, json.dumps(standin.control_state()).encode())
+
+    return Handler
+
+
+def serve(standin, port, host_name, bind='127.0.0.1'):
+    server = ThreadingHTTPServer((bind, port), make_handler(standin, host_name))
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, name=f'espn-standin-{host_name}', daemon=True)
+    thread.start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--bind', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765, help='port for the BASE_URL host')
+    parser.add_argument('--alt-port', type=int, default=8766, help='port for the ALT_URL host (0 to disable)')
+    parser.add_argument('--season', type=int, default=datetime.now().year)
+    parser.add_argument('--clock', help='virtual start time (ISO, UTC); defaults to week 1 kickoff')
+    parser.add_argument('--speed', type=float, default=1.0, help='virtual seconds per real second')
+    parser.add_argument('--seed', type=int, default=1, help='seed for pairings and scores')
+    parser.add_argument('--faults', default='{}', help='initial fault profiles as JSON, e.g. \'{"all": {"error_rate": 0.1}}\'')
+    args = parser.parse_args()
+
+    origin = (datetime.fromisoformat(args.clock.replace('Z', '+00:00')) if args.clock
+              else season_start(args.season) - timedelta(hours=1))
+    standin = StandIn(args.season, Clock(origin, args.speed), args.seed)
+    standin.apply_control({'faults': json.loads(args.faults)})
+
+    serve(standin, args.port, 'base', args.bind)
+    print(f"ESPN stand-in (base) on http://{args.bind}:{args.port}/apis/site/v2/sports/football/nfl")
+    if args.alt_port:
+        serve(standin, args.alt_port, 'alt', args.bind)
+        print(f"ESPN stand-in (alt) on http://{args.bind}:{args.alt_port}/apis/site/v2/sports/football/nfl")
+    print(f"Season {args.season}, clock {standin.clock.now().isoformat()} at {args.speed}x")
+
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
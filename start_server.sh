@@ -7,6 +7,8 @@ source venv/bin/activate
 export FLASK_APP=app
 export FLASK_ENV=development
 export FLASK_DEBUG=1
+# Poll ESPN from this process too (no separate updater in development)
+export IN_PROCESS_UPDATER=true
 
 # Start the Flask server
 flask run